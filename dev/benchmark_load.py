@@ -0,0 +1,66 @@
+import os
+import tempfile
+import time
+
+from argparse import ArgumentParser
+from pathlib import Path
+
+from storage.cli.printer import Printer
+from storage.data_manager import JSONDataManager
+
+from benchmark_memory import build_inventory
+
+
+def create_save_directory(path: Path, container_count: int, rows: int, columns: int, compartments: int):
+    data_manager = JSONDataManager(path, path.joinpath('containers'))
+
+    for container in build_inventory(container_count, rows, columns, compartments):
+        data_manager.save_data_to_file(container)
+
+
+def measure(path: Path, workers: int, use_processes: bool) -> float:
+    """Return time it took to load and decode every container file in seconds"""
+    data_manager = JSONDataManager(path, path.joinpath('containers'))
+
+    start = time.perf_counter()
+    data_manager.load_all_container_data_from_save_directory(workers, use_processes)
+    return time.perf_counter() - start
+
+
+def parse_console_args(args: list[str]) -> dict:
+    arg_parser = ArgumentParser(prog="Benchmark load",
+                                description="Save an inventory to a temporary directory and report how long it takes "
+                                            "to load it with a growing number of workers.")
+    arg_parser.add_argument('--containers', type=int, default=2000)
+    arg_parser.add_argument('--rows', type=int, default=4)
+    arg_parser.add_argument('--columns', type=int, default=4)
+    arg_parser.add_argument('--compartments', type=int, default=3)
+    arg_parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    arg_parser.add_argument('--threads', action='store_true', help="Use a thread pool instead of a process pool.")
+
+    return arg_parser.parse_args(args).__dict__
+
+
+def main(args: list[str] | None = None) -> int:
+    parsed_args = parse_console_args(args)
+    Printer.silent = True
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir)
+        create_save_directory(path, parsed_args['containers'], parsed_args['rows'], parsed_args['columns'],
+                              parsed_args['compartments'])
+
+        serial = measure(path, 0, not parsed_args['threads'])
+        print(f"BENCHMARK_LOAD: {parsed_args['containers']} files, serial: {serial:.2f}s")
+
+        workers = 2
+        while workers <= parsed_args['max_workers']:
+            elapsed = measure(path, workers, not parsed_args['threads'])
+            print(f"BENCHMARK_LOAD: {workers} workers: {elapsed:.2f}s ({serial / elapsed:.2f}x)")
+            workers *= 2
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+import time
+import tracemalloc
+
+from argparse import ArgumentParser
+
+from storage.cli.printer import Printer
+from storage.items.container import Container
+
+
+def build_inventory(container_count: int, rows: int, columns: int, compartments: int) -> list[Container]:
+    containers: list[Container] = []
+
+    for container_n in range(container_count):
+        container = Container(f"container{container_n}", rows, columns, compartments_per_drawer=compartments)
+
+        for drawer_n in range(rows * columns):
+            drawer = container.add_drawer(f"drawer{drawer_n}")
+
+            for component_n in range(compartments):
+                drawer.add_component(f"component{component_n}", 'other', {}, count=component_n)
+
+        containers.append(container)
+
+    return containers
+
+
+def measure(container_count: int, rows: int, columns: int, compartments: int) -> tuple[int, float]:
+    """Return memory allocated by the inventory in bytes and time it took to build it in seconds"""
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    inventory = build_inventory(container_count, rows, columns, compartments)
+
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del inventory
+    return allocated, elapsed
+
+
+def parse_console_args(args: list[str]) -> dict:
+    arg_parser = ArgumentParser(prog="Benchmark memory",
+                                description="Build an in-memory inventory and report memory used per component.")
+    arg_parser.add_argument('--containers', type=int, default=20)
+    arg_parser.add_argument('--rows', type=int, default=10)
+    arg_parser.add_argument('--columns', type=int, default=10)
+    arg_parser.add_argument('--compartments', type=int, default=12)
+
+    return arg_parser.parse_args(args).__dict__
+
+
+def main(args: list[str] | None = None) -> int:
+    parsed_args = parse_console_args(args)
+    Printer.silent = True
+
+    allocated, elapsed = measure(parsed_args['containers'], parsed_args['rows'], parsed_args['columns'],
+                                 parsed_args['compartments'])
+    component_count = parsed_args['containers'] * parsed_args['rows'] * parsed_args['columns'] * \
+        parsed_args['compartments']
+
+    print(f"BENCHMARK_MEMORY: {component_count} components")
+    print(f"BENCHMARK_MEMORY: {allocated / 1024 ** 2:.1f} MiB allocated, "
+          f"{allocated / component_count:.0f} bytes per component")
+    print(f"BENCHMARK_MEMORY: built in {elapsed:.2f}s")
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
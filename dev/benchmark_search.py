@@ -0,0 +1,76 @@
+import time
+
+from argparse import ArgumentParser
+
+from storage.cli.printer import Printer
+from storage.items.container import Container
+from storage.session import Session
+
+
+def build_session(container_count: int, rows: int, columns: int, compartments: int) -> Session:
+    session = Session()
+    containers: list[Container] = []
+
+    for container_n in range(container_count):
+        container = Container(f"container{container_n}", rows, columns, compartments_per_drawer=compartments)
+
+        for drawer_n in range(rows * columns):
+            drawer = container.add_drawer(f"drawer{drawer_n}")
+
+            for component_n in range(compartments):
+                tags = {'size': (drawer_n * compartments + component_n) % 1000, 'package': 'smd'}
+                drawer.add_component(f"component{component_n}", 'other', tags, count=component_n)
+
+        containers.append(container)
+
+    session.containers = containers
+    return session
+
+
+def measure(session: Session, engine: str, comparisons: list[str], repeat: int) -> tuple[float, float, int]:
+    """Return time of the first and the average of following searches in seconds, along with number of results"""
+    timings: list[float] = []
+    result_count = 0
+    query = {'tags_positional': [], 'tags': {}, 'tags_comparison': comparisons, 'mode': 'all'}
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result_count = len(session.search_items('component', **query, engine=engine))
+        timings.append(time.perf_counter() - start)
+
+    return timings[0], sum(timings[1:]) / max(len(timings) - 1, 1), result_count
+
+
+def parse_console_args(args: list[str]) -> dict:
+    arg_parser = ArgumentParser(prog="Benchmark search",
+                                description="Search an in-memory inventory by comparison tags with both engines.")
+    arg_parser.add_argument('--containers', type=int, default=100)
+    arg_parser.add_argument('--rows', type=int, default=10)
+    arg_parser.add_argument('--columns', type=int, default=10)
+    arg_parser.add_argument('--compartments', type=int, default=10)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--comparisons', nargs='+', default=['count>=6', 'size=100-800'])
+
+    return arg_parser.parse_args(args).__dict__
+
+
+def main(args: list[str] | None = None) -> int:
+    parsed_args = parse_console_args(args)
+    Printer.silent = True
+
+    session = build_session(parsed_args['containers'], parsed_args['rows'], parsed_args['columns'],
+                            parsed_args['compartments'])
+    component_count = parsed_args['containers'] * parsed_args['rows'] * parsed_args['columns'] * \
+        parsed_args['compartments']
+    print(f"BENCHMARK_SEARCH: {component_count} components, query {' '.join(parsed_args['comparisons'])}")
+
+    for engine in ('python', 'numpy'):
+        first, following, result_count = measure(session, engine, parsed_args['comparisons'], parsed_args['repeat'])
+        print(f"BENCHMARK_SEARCH: {engine}: first {first:.3f}s, following {following:.3f}s, "
+              f"{result_count} results")
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,13 +1,19 @@
 """Main entry point of the software."""
 
+import shlex
+import sys
+
 from sys import argv
+from typing import Iterable
 
 from storage.session import Session
+from storage.const import LOAD_WORKERS, USE_OPERATION_LOG
 from storage.cli.parser import ArgParser
 from storage.cli.subparser import CreateSubparser, GetSubparser, FindSubparser, DeleteSubparser, ClearSubparser, \
-    UpdateSubparser, was_subparser_specified
+    UpdateSubparser, ImportSubparser, BatchSubparser, ServeSubparser, was_subparser_specified
+from storage.cli.exceptions import StorageBaseException
 from storage.cli.argexecutor import ArgExecutor, CreateArgExecutor, GetArgExecutor, FindArgExecutor, DeleteArgExecutor, \
-    ClearArgExecutor, UpdateArgExecutor
+    ClearArgExecutor, UpdateArgExecutor, ImportArgExecutor
 
 
 def get_arg_executor_from_argv(session, item_type: str, parsed_args: dict, args: list[str]) -> ArgExecutor:
@@ -29,6 +35,9 @@ def get_arg_executor_from_argv(session, item_type: str, parsed_args: dict, args:
     if 'update' in args:
         return UpdateArgExecutor(session, item_type, parsed_args)
 
+    if 'import' in args:
+        return ImportArgExecutor(session, item_type, parsed_args)
+
     raise ValueError("Cannot initialize a valid subparser!")
 
 
@@ -39,13 +48,100 @@ def setup_subparsers(parser: ArgParser):
     parser.add_subparser(DeleteSubparser(parser))
     parser.add_subparser(ClearSubparser(parser))
     parser.add_subparser(UpdateSubparser(parser))
+    parser.add_subparser(ImportSubparser(parser))
+    parser.add_subparser(BatchSubparser(parser))
+    parser.add_subparser(ServeSubparser(parser))
+
+
+def read_batch_lines(path: str) -> Iterable[str]:
+    if path == '-':
+        yield from sys.stdin
+        return
+
+    with open(path, 'r') as file:
+        yield from file
+
+
+def run_batch(session: Session, parser: ArgParser, lines: Iterable[str]) -> int:
+    """Run commands against a single session, with all changes saved at once after the last command.
+    A failing command is reported along with its line number and does not stop the batch. If saving fails,
+    every change of the batch is dropped and the containers get loaded from their files again.
+    Returns number of failed commands, the failed save counting as one."""
+    failed = 0
+
+    try:
+        with session.deferred_saves():
+            for line_number, line in enumerate(lines, start=1):
+                args = shlex.split(line, comments=True)
+
+                # lines may be copied straight from shell scripts
+                if args and args[0] == parser.parser.prog:
+                    args = args[1::]
+
+                if not args:
+                    continue
+
+                try:
+                    parsed_args: dict = parser.parse_args(args)
+
+                    if len(args) < 2:
+                        raise ValueError(f"'{args[0]}' is missing an item: {{container, drawer, component}}")
+
+                    arg_executor = get_arg_executor_from_argv(session, args[1], parsed_args, args[:1])
+                    arg_executor.parse_args()
+                except SystemExit:
+                    # argparse has already printed what's wrong with the command
+                    failed += 1
+                    print(f"{parser.parser.prog}: line {line_number}: invalid command", file=sys.stderr)
+                except (StorageBaseException, ValueError, KeyError, TypeError) as error:
+                    failed += 1
+                    print(f"{parser.parser.prog}: line {line_number}: {error}", file=sys.stderr)
+    except StorageBaseException as error:
+        # commands failing on their own are caught above, only the final save gets here
+        failed += 1
+        print(f"{parser.parser.prog}: {error}", file=sys.stderr)
+        session.discard_pending_changes()
+
+    return failed
+
+
+def serve(session: Session, parser: ArgParser, socket_path=None) -> int:
+    """Load the whole inventory and its tag indexes once, then keep answering commands until stopped."""
+    # Unix sockets are not available on every platform, only import the server when it's actually needed
+    from storage.server import StorageServer
+    from storage.client import SOCKET_PATH
+    from storage.validator import Prompter
+
+    # nobody answers prompts on the daemon's console
+    Prompter.interactive = False
+
+    session.containers
+    for item_type in ('container', 'drawer', 'component'):
+        session.get_tag_index(item_type)
+
+    def run_request(lines: Iterable[str]) -> int:
+        # other processes may have changed save files since the last request
+        session.reload_changed_containers()
+        return run_batch(session, parser, lines)
+
+    server = StorageServer(run_request, socket_path or SOCKET_PATH)
+    print(f"{parser.parser.prog}: serving on '{server.socket_path}'")
+    server.serve_until_stopped()
+
+    return 0
 
 
 def main(args: list[str] | None = None) -> int:
-    session = Session()
+    session = Session(use_operation_log=USE_OPERATION_LOG)
     parser = ArgParser()
 
-    session.load_container_data_from_file()
+    if LOAD_WORKERS > 1:
+        session.load_container_data_from_file(LOAD_WORKERS)
+    else:
+        session.load_container_manifest()
+
+    session.replay_operation_log()
+
     parser.setup_args()
     setup_subparsers(parser)
 
@@ -54,6 +150,15 @@ def main(args: list[str] | None = None) -> int:
     if parsed_args.get('printargs'):
         print(parsed_args)
 
+    if parsed_args.get('serve'):
+        return serve(session, parser, parsed_args.get('socket'))
+
+    if parsed_args.get('batch_file'):
+        return 1 if run_batch(session, parser, read_batch_lines(parsed_args['batch_file'])) else 0
+
+    # a single command runs at most a single find, which scans items faster than tag indexes would be built
+    session.use_tag_index = False
+
     if len(argv) > 2:
         item_type = argv[2]
         arg_executor = get_arg_executor_from_argv(session, item_type, parsed_args, argv)
@@ -67,4 +172,4 @@ def main(args: list[str] | None = None) -> int:
 
 
 if __name__ == '__main__':
-    SystemExit(main())
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+"""asyncio facade of Session, for front-ends serving many clients from a single process"""
+
+from __future__ import annotations
+
+import asyncio
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable
+
+from storage.session import Session
+from storage.search import SearchResult
+from storage.data_manager import JSONDataManager
+from storage.items.container import Container
+from storage.items.drawer import Drawer
+from storage.items.component import Component
+from storage.cli.exceptions import ContainerNotFoundError
+
+
+class AsyncSession:
+    """Runs lookups and searches straight on the event loop, as they only touch in-memory objects.
+    Changes are applied in memory while holding a lock of the changed container, so that changes of one
+    container are serialized while other containers stay available. Changed containers are then written by
+    a single background thread, so a slow save never blocks the event loop - it only delays further changes
+    of the same container.
+
+    Every container is loaded upfront by open(), no file is read while handling a request."""
+
+    def __init__(self, session: Session, executor: Executor | None = None):
+        self.session = session
+        self.session.autosave = False
+
+        # a single writer keeps writes, and updates of the manifest shared by them, in order
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='storage-writer')
+        # executor passed in by the caller is left for the caller to shut down
+        self._owns_executor = executor is None
+        # containers are kept along with their locks, so that their ids can't be reused while locked
+        self._locks: dict[int, tuple[Container, asyncio.Lock]] = {}
+        self._creation_locks: dict[str, asyncio.Lock] = {}
+
+    @classmethod
+    async def open(cls, data_manager=JSONDataManager, workers: int = 0,
+                   executor: Executor | None = None) -> AsyncSession:
+        session = Session(data_manager)
+        await asyncio.get_running_loop().run_in_executor(executor, session.load_container_data_from_file, workers)
+        return cls(session, executor)
+
+    async def close(self):
+        """Wait for pending writes and stop the writer thread, unless the executor was passed in."""
+        if self._owns_executor:
+            await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    # ===== READ ===== #
+
+    async def get_container_by_name(self, name: str) -> Container:
+        return self.session.get_container_by_name(name)
+
+    async def get_drawer_by_name(self, name: str, container: str) -> Drawer:
+        return self.session.get_drawer_by_name(name, container)
+
+    async def get_component_by_name(self, name: str, drawer: str, container: str) -> Component:
+        return self.session.get_component_by_name(name, drawer, container)
+
+    async def get_item_by_path(self, path: str) -> Container | Drawer | Component:
+        return self.session.get_item_by_path(path)
+
+    async def search_items(self, item_type: str, **kwargs) -> list[SearchResult]:
+        return self.session.search_items(item_type, **kwargs)
+
+    # ===== WRITE ===== #
+
+    async def create_container(self, name: str, rows: int, columns: int, **kwargs) -> Container:
+        return await self._change(name, self.session.create_container, name=name, rows=rows, columns=columns,
+                                  **kwargs)
+
+    async def delete_container(self, name: str, **kwargs):
+        await self._change(name, self.session.delete_container, name=name, **kwargs)
+
+    async def clear_container(self, name: str, **kwargs):
+        await self._change(name, self.session.clear_container, name=name, **kwargs)
+
+    async def update_container(self, name: str, values: dict, **kwargs):
+        await self._change(name, self.session.update_container, name=name, values=values, **kwargs)
+
+    async def create_drawer(self, name: str, container: str, **kwargs) -> Drawer:
+        return await self._change(container, self.session.create_drawer, name=name, container=container, **kwargs)
+
+    async def delete_drawer(self, name: str, container: str, **kwargs):
+        await self._change(container, self.session.delete_drawer, name=name, container=container, **kwargs)
+
+    async def clear_drawer(self, name: str, container: str, **kwargs):
+        await self._change(container, self.session.clear_drawer, name=name, container=container, **kwargs)
+
+    async def update_drawer(self, name: str, container: str, values: dict, **kwargs):
+        await self._change(container, self.session.update_drawer, name=name, container=container, values=values,
+                           **kwargs)
+
+    async def create_component(self, name: str, count, type: str, drawer: str, container: str,
+                               **kwargs) -> Component:
+        return await self._change(container, self.session.create_component, name=name, count=count, type=type,
+                                  drawer=drawer, container=container, **kwargs)
+
+    async def delete_component(self, name: str, drawer: str, container: str, **kwargs):
+        await self._change(container, self.session.delete_component, name=name, drawer=drawer,
+                           container=container, **kwargs)
+
+    async def update_component(self, name: str, drawer: str, container: str, values: dict, **kwargs):
+        await self._change(container, self.session.update_component, name=name, drawer=drawer,
+                           container=container, values=values, **kwargs)
+
+    def get_lock(self, container: Container | str) -> asyncio.Lock:
+        """Return lock of the container, or lock of the name of a container yet to be created."""
+        if isinstance(container, str):
+            return self._creation_locks.setdefault(container, asyncio.Lock())
+
+        return self._locks.setdefault(id(container), (container, asyncio.Lock()))[1]
+
+    async def _change(self, container_name: str, session_method: Callable, **kwargs):
+        """Apply change while holding the container lock, which is released once the change is written.
+        Locks belong to container objects rather than names, so a renamed container keeps its lock."""
+        while True:
+            container = self._find_container(container_name)
+
+            async with self.get_lock(container or container_name):
+                # container may have been renamed, replaced or deleted while waiting for the lock
+                if self._find_container(container_name) is not container:
+                    continue
+
+                result = session_method(**kwargs)
+                # only changes of the locked container are written, changes left behind by a failed change
+                # of another container are not its to write
+                changed = [item for item in (container, self._find_container(container_name)) if item is not None]
+                containers, deletions = self.session.take_pending_changes(container_name, *changed)
+
+                await asyncio.get_running_loop().run_in_executor(self._executor, self.session.write_changes,
+                                                                 containers, deletions)
+
+            if container is not None and self._find_container(container.name) is not container:
+                self._locks.pop(id(container), None)
+
+            return result
+
+    def _find_container(self, name: str) -> Container | None:
+        try:
+            return self.session.get_container_by_name(name)
+        except ContainerNotFoundError:
+            return None
@@ -85,6 +85,16 @@ class ClearArgExecutor(ArgExecutor):
         return d
 
 
+class ImportArgExecutor(ArgExecutor):
+    """Handles 'import' subparser and executes functions related to importing items from files."""
+    name: str = 'import'
+
+    @property
+    def item_func_mapping(self) -> dict[str, Callable]:
+        d = {'component': self.session.import_components}
+        return d
+
+
 class UpdateArgExecutor(ArgExecutor):
     """Handles 'update' subparser and executes functions related to updating item properties."""
     name: str = 'update'
@@ -48,6 +48,19 @@ class ItemNotFoundAtPositionError(StorageBaseException):
     CONSOLE_MESSAGE = "ITEM_NOT_FOUND_POS"
 
 
+# ===== FIND ===== #
+
+class SearchEngineNotAvailableError(StorageBaseException):
+    CONSOLE_MESSAGE = "ENGINE_NOT_AVAILABLE"
+
+
+# ===== UPDATE ===== #
+
+class ResizeNotConfirmedError(StorageBaseException):
+    CONSOLE_MESSAGE = "RESIZE_NOT_CONFIRMED"
+    REASON = "as resizing was not confirmed"
+
+
 # ===== DELETE ===== #
 
 class ItemIsNotEmptyError(StorageBaseException):
@@ -56,3 +69,10 @@ class ItemIsNotEmptyError(StorageBaseException):
 
 class ContainerIsNotEmptyError(StorageBaseException):
     CONSOLE_MESSAGE = "DEL_FAIL_CONTAINER"
+
+
+# ===== SAVE ===== #
+
+class ContainerVersionConflictError(StorageBaseException):
+    CONSOLE_MESSAGE = "SAVE_CONFLICT"
+    REASON = "as it was changed by another process since it was loaded"
@@ -6,11 +6,12 @@ import argparse
 from abc import ABC, abstractmethod
 from argparse import ArgumentParser
 
-from storage.const import ComponentType, get_component_types
+from storage.const import ComponentType, get_component_types, IMPORT_BATCH_SIZE
+from storage.importer import IMPORT_FORMATS
 from storage.util import get_operator
 
 
-SUBPARSERS = ['create', 'delete', 'clear', 'update', 'get', 'find']
+SUBPARSERS = ['create', 'delete', 'clear', 'update', 'get', 'find', 'import', 'batch', 'serve']
 
 
 def was_subparser_specified(argv: list[str]) -> bool:
@@ -312,6 +313,7 @@ class FindSubparser(Subparser):
             self.add_sort_argument(parser)
             self.add_count_argument(parser)
             self.add_mode_parser(parser)
+            self.add_engine_argument(parser)
 
     def add_verbosity_flag(self, parser):
         parser.add_argument('-v',
@@ -326,7 +328,8 @@ class FindSubparser(Subparser):
                             type=str,
                             default='accuracy',
                             help="Sort returned items via specific key\n"
-                                 "Applied after filtering")
+                                 "Applied after filtering\n"
+                                 "'none' - print items in order they are found, as soon as they are found")
 
         parser.add_argument('--reverse',
                             action='store_true',
@@ -348,6 +351,16 @@ class FindSubparser(Subparser):
                                  "'all' - find all items that match ALL the provided tags\n"
                                  "'any' - find all items that match ANY of the provided tags\n")
 
+    def add_engine_argument(self, parser):
+        parser.add_argument('--engine',
+                            type=str,
+                            default='python',
+                            choices=['python', 'numpy'],
+                            help="Search engine evaluating comparison tags\n"
+                                 "'python' - compare values item by item\n"
+                                 "'numpy' - compare whole columns of numeric tag values at once, "
+                                 "requires the 'numpy' extra\n")
+
     def initialize_subparser(self):
         super().initialize_subparser()
 
@@ -588,3 +601,67 @@ class UpdateSubparser(Subparser):
                                                   "Arguments should be passed as strings or as 'key=value' pairs, "
                                                   "separated by spaces.\n"
                                                   "Example: 'max_current=500mA' 'type=NPN'")
+
+
+class ImportSubparser(Subparser):
+    subparser_name: str = 'import'
+    help: str = 'Create items listed by a CSV or JSON lines file, one item per row.'
+    subparsers_help: str = 'Choose item to import'
+
+    def initialize_subparser(self):
+        super().initialize_subparser()
+
+        # ===== IMPORT COMPONENT ===== #
+
+        import_component_parser: ArgumentParser = self.children_parsers.add_parser('component')
+
+        import_component_parser.add_argument('file',
+                                             type=str,
+                                             metavar="FILE",
+                                             help="CSV file with a header row or JSON lines file, each row with "
+                                                  "'name', 'count', 'type', 'drawer' and 'container' and "
+                                                  "optional 'compartment'.\n"
+                                                  "Any other column becomes a tag of the component")
+
+        import_component_parser.add_argument('--format',
+                                             type=str,
+                                             default=None,
+                                             choices=IMPORT_FORMATS,
+                                             help="File format, guessed from file extension by default")
+
+        import_component_parser.add_argument('--batch-size',
+                                             type=int,
+                                             default=IMPORT_BATCH_SIZE,
+                                             metavar="ROWS",
+                                             help="Number of rows saved at once")
+
+
+class BatchSubparser(Subparser):
+    subparser_name: str = 'batch'
+    help: str = 'Run commands read from a file, one per line, against a single session and save changes once.'
+
+    def initialize_subparser(self):
+        self.parser: ArgumentParser = self.parser_parent.subparsers.add_parser(self.subparser_name,
+                                                                               help=self.help)
+
+        self.parser.add_argument('batch_file',
+                                 type=str,
+                                 metavar="FILE",
+                                 help="File with a single 'storage ...' command per line, '-' reads standard input\n"
+                                      "Empty lines and lines starting with '#' are skipped")
+
+
+class ServeSubparser(Subparser):
+    subparser_name: str = 'serve'
+    help: str = 'Keep inventory loaded and run commands sent by other storage invocations over a Unix socket.'
+
+    def initialize_subparser(self):
+        self.parser: ArgumentParser = self.parser_parent.subparsers.add_parser(self.subparser_name,
+                                                                               help=self.help)
+        self.parser.set_defaults(serve=True)
+
+        self.parser.add_argument('--socket',
+                                 type=str,
+                                 default=None,
+                                 metavar="PATH",
+                                 help="Path of the Unix socket to listen on, 'save/storage.sock' by default")
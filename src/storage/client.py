@@ -0,0 +1,120 @@
+"""Thin client passing CLI commands to a running 'storage serve' daemon, falling back to running them locally.
+Only imports standard library modules, so that a command answered by the daemon costs no program startup."""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import shlex
+import socket
+import sys
+
+from typing import Iterable
+
+
+SOCKET_PATH = pathlib.Path(os.environ.get('STORAGE_SOCKET', pathlib.Path.cwd().joinpath('save', 'storage.sock')))
+
+# seconds to wait for the daemon to answer, the command is reported as failed once it's exceeded
+DAEMON_TIMEOUT = float(os.environ.get('STORAGE_DAEMON_TIMEOUT', 30))
+
+# commands that must not be sent to the daemon
+LOCAL_COMMANDS = ['serve']
+# options of 'import' taking a value, so that the value isn't mistaken for the imported file
+IMPORT_VALUE_OPTIONS = ['--format', '--batch-size']
+
+
+def send_lines(lines: Iterable[str], socket_path=SOCKET_PATH, timeout: float | None = DAEMON_TIMEOUT) -> dict | None:
+    """Send commands to the daemon and return its {"stdout", "stderr", "code"} response,
+    or None if no daemon accepted the connection. Once the commands are sent they may be run by the daemon,
+    so a daemon failing to answer in time is reported as a failed response instead."""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            # missing or stale socket
+            return None
+
+        try:
+            client.sendall(json.dumps({'lines': list(lines)}).encode() + b'\n')
+
+            with client.makefile('rb') as response:
+                return json.loads(response.readline())
+        except socket.timeout:
+            reason = f"did not answer within {timeout:g}s"
+        except (OSError, json.JSONDecodeError):
+            reason = "closed the connection without an answer"
+
+    return {'stdout': "", 'stderr': f"storage: daemon on '{socket_path}' {reason}, "
+                                    "the commands may or may not have been run\n", 'code': 1}
+
+
+def resolve_paths(args: list[str]) -> list[str]:
+    """Make file path of an 'import' command absolute, as the daemon may run from another directory."""
+    start = 1 if args[:1] == ['storage'] else 0
+
+    if args[start:start + 1] != ['import']:
+        return args
+
+    args = list(args)
+    index = start + 2
+
+    while index < len(args):
+        if args[index] in IMPORT_VALUE_OPTIONS:
+            index += 2
+        elif args[index].startswith('-'):
+            index += 1
+        else:
+            args[index] = os.path.abspath(args[index])
+            break
+
+    return args
+
+
+def resolve_line_paths(line: str) -> str:
+    try:
+        args = shlex.split(line, comments=True)
+    except ValueError:
+        # left for the daemon to report
+        return line
+
+    resolved_args = resolve_paths(args)
+    return line if resolved_args == args else shlex.join(resolved_args) + '\n'
+
+
+def get_lines_to_send(args: list[str]) -> list[str] | None:
+    """Turn console args into command lines understood by the daemon, None if they have to run locally."""
+    if not args or args[0] in LOCAL_COMMANDS or args[0].startswith('-'):
+        return None
+
+    if args[0] == 'batch' and len(args) == 2:
+        if args[1] == '-':
+            return [resolve_line_paths(line) for line in sys.stdin]
+
+        with open(args[1], 'r') as file:
+            return [resolve_line_paths(line) for line in file]
+
+    return [shlex.join(resolve_paths(args))]
+
+
+def main(args: list[str] | None = None) -> int:
+    args = sys.argv[1::] if args is None else args
+    lines = get_lines_to_send(args) if SOCKET_PATH.exists() else None
+    response = send_lines(lines, SOCKET_PATH, DAEMON_TIMEOUT) if lines is not None else None
+
+    if response is None:
+        from storage.__main__ import main as run_locally
+        return run_locally(args)
+
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    return response['code']
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
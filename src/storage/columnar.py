@@ -0,0 +1,221 @@
+"""Columnar store of component fields kept in memory-mapped arrays, scanned by aggregate and search queries
+that don't need Container, Drawer and Component objects to be built"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+
+from array import array
+from typing import Iterable, Iterator, NamedTuple
+
+from storage.search import CompiledComparison
+from storage.util import open_atomically
+
+
+class ComponentRow(NamedTuple):
+    """Single component read from the columnar store. Exposes the same automatic tags a Component has,
+    so that rows can be passed to Searcher in place of components."""
+    name: str
+    count: int
+    type: str
+    compartment: int
+    drawer: str
+    container: str
+    position: tuple[int, int]
+
+    @property
+    def tags(self) -> dict:
+        return {'name': self.name, 'count': self.count, 'type': self.type}
+
+    def get_location_readable_format(self) -> str:
+        return f"'{self.name}' in {self.container}/{self.drawer} " \
+               f"at [{self.position[0]},{self.position[1]}] ({self.compartment + 1})"
+
+
+class ColumnarComponentStore:
+    """Component fields stored column by column - counts, compartments, type codes and parent drawer ids
+    as fixed-width arrays and names as a single utf-8 blob with an array of offsets into it.
+    Types, drawers and containers are only stored once, in tables referenced by index.
+
+    A store built from container data keeps its columns in arrays, a store opened from a file keeps them as
+    views into a read-only memory map, only the pages a query actually touches are read from disk."""
+    file_name: str = '.columns'
+    magic: bytes = b'STORAGE-COLUMNS'
+    version: int = 2
+    header: struct.Struct = struct.Struct(f'<{len(magic)}sHQ')
+
+    # column name -> array typecode, every column holds one value per component except for name offsets
+    column_types: dict[str, str] = {'count': 'q',
+                                    'compartment': 'i',
+                                    'type': 'H',
+                                    'drawer': 'I',
+                                    'name_offsets': 'Q'}
+    numeric_columns: tuple[str, ...] = ('count', 'compartment')
+
+    def __init__(self, columns: dict, names: bytes | memoryview, types: list[str], drawers: list[list],
+                 containers: list[str], mapped_file: mmap.mmap | None = None):
+        self.columns = columns
+        self.names = names
+        self.types = types
+        # [container index, drawer name, row, column] of each drawer
+        self.drawers = drawers
+        self.containers = containers
+
+        self._mapped_file = mapped_file
+
+    @classmethod
+    def from_container_data(cls, container_data: Iterable[dict]) -> ColumnarComponentStore:
+        """Build the store straight from container data as returned by a DataManager."""
+        columns = {name: array(typecode) for name, typecode in cls.column_types.items()}
+        names = bytearray()
+        type_codes: dict[str, int] = {}
+        drawers: list[list] = []
+        containers: list[str] = []
+
+        columns['name_offsets'].append(0)
+
+        for container in container_data:
+            containers.append(container['name'])
+
+            for drawer in container['drawers']:
+                drawers.append([len(containers) - 1, drawer['name'], drawer['row'], drawer['column']])
+
+                for comp in drawer['components']:
+                    names += comp['name'].encode()
+                    columns['name_offsets'].append(len(names))
+                    columns['count'].append(int(comp['count']))
+                    columns['compartment'].append(comp['compartment'])
+                    columns['type'].append(type_codes.setdefault(str(comp['type']), len(type_codes)))
+                    columns['drawer'].append(len(drawers) - 1)
+
+        return cls(columns, bytes(names), list(type_codes), drawers, containers)
+
+    @classmethod
+    def open(cls, path) -> ColumnarComponentStore:
+        """Map a store file written by save() into memory, columns are not copied out of the map."""
+        with open(path, 'rb') as file:
+            mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, meta_length = cls.header.unpack_from(mapped_file)
+        if magic != cls.magic or version != cls.version:
+            mapped_file.close()
+            raise ValueError(f"'{path}' is not a columnar store of version {cls.version}!")
+
+        meta = json.loads(mapped_file[cls.header.size:cls.header.size + meta_length])
+        data_offset = cls._align(cls.header.size + meta_length)
+        view = memoryview(mapped_file)[data_offset:]
+
+        columns = {}
+        for name, typecode in cls.column_types.items():
+            start, end = meta['columns'][name]
+            columns[name] = view[start:end].cast(typecode)
+
+        start, end = meta['names']
+        names = view[start:end]
+        view.release()
+        return cls(columns, names, meta['types'], meta['drawers'], meta['containers'], mapped_file)
+
+    def save(self, path):
+        """Write the store to a file with every column aligned to 8 bytes, so it can be mapped by open().
+        Column offsets are relative to the aligned end of metadata, so that they don't depend on its length."""
+        meta = {'types': self.types, 'drawers': self.drawers, 'containers': self.containers}
+
+        # (offset, bytes) of every column and of the names blob
+        layout: list[tuple[int, bytes]] = []
+        offset = 0
+        meta['columns'] = {}
+
+        for name in self.column_types:
+            data = bytes(memoryview(self.columns[name]).cast('B'))
+            meta['columns'][name] = [offset, offset + len(data)]
+            layout.append((offset, data))
+            offset = self._align(offset + len(data))
+
+        meta['names'] = [offset, offset + len(self.names)]
+        layout.append((offset, bytes(self.names)))
+
+        encoded_meta = json.dumps(meta).encode()
+        data_offset = self._align(self.header.size + len(encoded_meta))
+
+        with open_atomically(path, 'wb') as file:
+            file.write(self.header.pack(self.magic, self.version, len(encoded_meta)))
+            file.write(encoded_meta)
+
+            for start, data in layout:
+                file.write(b'\0' * (data_offset + start - file.tell()))
+                file.write(data)
+
+    def close(self):
+        if self._mapped_file is None:
+            return
+
+        for column in self.columns.values():
+            column.release()
+
+        self.names.release()
+        self._mapped_file.close()
+        self._mapped_file = None
+
+    def get_name(self, index: int) -> str:
+        offsets = self.columns['name_offsets']
+        return bytes(self.names[offsets[index]:offsets[index + 1]]).decode()
+
+    def get_row(self, index: int) -> ComponentRow:
+        container_index, drawer, row, column = self.drawers[self.columns['drawer'][index]]
+
+        return ComponentRow(name=self.get_name(index),
+                            count=self.columns['count'][index],
+                            type=self.types[self.columns['type'][index]],
+                            compartment=self.columns['compartment'][index],
+                            drawer=drawer,
+                            container=self.containers[container_index],
+                            position=(row, column))
+
+    def iter_rows(self, indexes: Iterable[int] | None = None) -> Iterator[ComponentRow]:
+        for index in range(len(self)) if indexes is None else indexes:
+            yield self.get_row(index)
+
+    def where(self, comparison: CompiledComparison | str) -> list[int]:
+        """Return indexes of components satisfying a comparison tag such as 'count<10' or 'compartment=0-2'."""
+        if isinstance(comparison, str):
+            comparison = CompiledComparison.from_tag(comparison)
+
+        if comparison.key in self.numeric_columns:
+            return [index for index, value in enumerate(self.columns[comparison.key]) if comparison.matches(value)]
+
+        return [index for index, row in enumerate(self.iter_rows()) if comparison.matches(row.tags.get(comparison.key))]
+
+    def get_components_below(self, threshold: int) -> list[ComponentRow]:
+        return list(self.iter_rows(self.where(f"count<{threshold}")))
+
+    def get_total_count_by_type(self) -> dict[str, int]:
+        totals = [0] * len(self.types)
+
+        for type_code, count in zip(self.columns['type'], self.columns['count']):
+            totals[type_code] += count
+
+        return dict(zip(self.types, totals))
+
+    def get_total_count_by_container(self) -> dict[str, int]:
+        totals = [0] * len(self.containers)
+        drawer_containers = [drawer[0] for drawer in self.drawers]
+
+        for drawer_index, count in zip(self.columns['drawer'], self.columns['count']):
+            totals[drawer_containers[drawer_index]] += count
+
+        return dict(zip(self.containers, totals))
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + 7) & ~7
+
+    def __len__(self) -> int:
+        return len(self.columns['count'])
+
+    def __enter__(self) -> ColumnarComponentStore:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
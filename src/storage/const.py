@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 import pathlib
 
 from typing import Union, Any, NewType
@@ -18,6 +19,20 @@ MODULE_ROOT_PATH = pathlib.Path.cwd()
 SAVE_PATH = MODULE_ROOT_PATH.joinpath('save')
 CONTAINER_SAVE_PATH = SAVE_PATH.joinpath('containers')
 
+# ===== Loading ===== #
+# number of parallel workers used to load every container upfront, containers are loaded lazily when 0 or 1
+LOAD_WORKERS = int(os.environ.get('STORAGE_LOAD_WORKERS', 0))
+
+# ===== Operation Log ===== #
+# log changes to an append-only operation log instead of rewriting container files after each of them
+USE_OPERATION_LOG = os.environ.get('STORAGE_OPERATION_LOG', '0') == '1'
+# logged operations get folded back into container files once there are more of them than this
+OPERATION_LOG_MAX_RECORDS = int(os.environ.get('STORAGE_OPERATION_LOG_MAX_RECORDS', 1000))
+
+# ===== Import ===== #
+# rows of an imported file committed at once, every container touched by them is written once per batch
+IMPORT_BATCH_SIZE = 50000
+
 # ===== Config Files ===== #
 CONFIG_PATH = MODULE_ROOT_PATH.joinpath('config')
 COMPONENT_TYPE_CONFIG_PATH = CONFIG_PATH.joinpath('component_type.txt')
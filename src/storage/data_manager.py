@@ -3,11 +3,21 @@
 import json
 import os
 import pathlib
+import marshal
+import sqlite3
+import struct
+import threading
 
 from abc import ABC, abstractmethod
+from contextlib import ExitStack, contextmanager, suppress
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Protocol
 
 from storage.const import SAVE_PATH, CONTAINER_SAVE_PATH
+from storage.columnar import ColumnarComponentStore
+from storage.util import create_temp_file, fsync_file, fsync_directory, open_atomically, write_file_atomically, \
+    lock_file
+from storage.cli.exceptions import ContainerVersionConflictError
 
 
 class JSONInterface(Protocol):
@@ -17,17 +27,175 @@ class JSONInterface(Protocol):
         pass
 
 
+class Manifest:
+    """Small index file kept next to container files - container names, file paths, modification times and
+    numbers of drawers and components. It lets the session know which containers exist without parsing
+    any container file.
+    Manifest is shared by every process using the directory - only entries changed by this process are saved,
+    merged into the manifest file as it is at the time of saving."""
+    file_name: str = '.manifest'
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self.entries: dict[str, dict] = {}
+        self.is_loaded: bool = False
+
+        # container name -> changed entry, None for removed ones
+        self._changes: dict[str, dict | None] = {}
+        self._is_rebuilt: bool = False
+
+    def load(self) -> bool:
+        """Returns False if manifest file does not exist yet or cannot be read."""
+        try:
+            with open(self.path, 'r') as file:
+                self.entries = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        self.is_loaded = True
+        return True
+
+    def save(self):
+        with lock_file(self.lock_path):
+            saved_manifest = Manifest(self.path)
+
+            if not self._is_rebuilt and saved_manifest.load():
+                for name, entry in self._changes.items():
+                    if entry is None:
+                        saved_manifest.entries.pop(name, None)
+                    else:
+                        saved_manifest.entries[name] = entry
+
+                self.entries = saved_manifest.entries
+
+            # no need to flush it to disk, entries are checked against container files anyway
+            write_file_atomically(self.path, json.dumps(self.entries), fsync=False)
+
+        self._changes.clear()
+        self._is_rebuilt = False
+        self.is_loaded = True
+
+    def clear(self):
+        """Remove every entry, the manifest is then saved as it is instead of being merged with the saved one."""
+        self.entries = {}
+        self._changes.clear()
+        self._is_rebuilt = True
+
+    def set_entry(self, data: dict, filepath):
+        entry = {"file": str(filepath),
+                 "mtime": os.path.getmtime(filepath),
+                 "drawers": len(data['drawers']),
+                 "components": sum(len(drawer['components']) for drawer in data['drawers'])}
+
+        self.entries[data['name']] = entry
+        self._changes[data['name']] = entry
+
+    def remove_entry(self, container_name: str):
+        self.entries.pop(container_name, None)
+        self._changes[container_name] = None
+
+    def is_entry_up_to_date(self, container_name: str) -> bool:
+        entry = self.entries.get(container_name)
+
+        try:
+            return entry is not None and entry['mtime'] == os.path.getmtime(entry['file'])
+        except FileNotFoundError:
+            return False
+
+
+class Snapshot:
+    """Binary copy of data of every container file, loaded with a single read on cold start.
+    Each entry remembers modification time of the file it was decoded from, entries of files changed since
+    the snapshot was written are stale and have to be read from the file itself.
+    Decoded container data only consists of builtin types, which marshal serializes faster than pickle does."""
+    file_name: str = '.snapshot'
+    magic: bytes = b'STORAGE-SNAPSHOT'
+    version: int = 1
+    header: struct.Struct = struct.Struct(f'<{len(magic)}sHH')
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        # file name -> (modification time in ns, container data)
+        self.entries: dict[str, tuple[int, dict]] = {}
+
+    def load(self) -> bool:
+        """Returns False if snapshot does not exist, was written by a different version or is corrupt."""
+        try:
+            with open(self.path, 'rb') as file:
+                content = file.read()
+
+            magic, version, marshal_version = self.header.unpack_from(content)
+            if (magic, version, marshal_version) != (self.magic, self.version, marshal.version):
+                return False
+
+            self.entries = marshal.loads(content[self.header.size:])
+        except (OSError, struct.error, EOFError, ValueError, TypeError):
+            self.entries = {}
+            return False
+
+        return True
+
+    def save(self):
+        with open_atomically(self.path, 'wb', fsync=False) as file:
+            file.write(self.header.pack(self.magic, self.version, marshal.version))
+            file.write(marshal.dumps(self.entries))
+
+    def get_data(self, filepath, mtime: int) -> dict | None:
+        """Return data of a container file, or None if the file was changed since the snapshot was written."""
+        entry = self.entries.get(pathlib.Path(filepath).name)
+
+        if entry is None or entry[0] != mtime:
+            return None
+
+        return entry[1]
+
+
 class DataManager(ABC):
-    # TODO: allowed formats: json, yaml, sql
+    # TODO: allowed formats: json, yaml
     file_suffix: str = ''
+    use_snapshot: bool = False
 
     def __init__(self, save_dir_path=SAVE_PATH, container_dir_path=CONTAINER_SAVE_PATH):
         self.save_path = save_dir_path
         self.container_path = container_dir_path
+        self._manifest: Manifest | None = None
+        # target path -> (written temporary file, container data) of writes deferred until the end of a batch
+        self._pending_writes: dict[pathlib.Path, tuple[pathlib.Path, dict]] | None = None
+        # container file path -> container name of deletions deferred until the end of a batch
+        self._pending_deletions: dict[pathlib.Path, str] = {}
+        # container file path -> (inode, modification time in ns) of the file as it was last loaded or saved,
+        # every save replaces the file with a new one, so the inode changes even if the mtime doesn't
+        self._versions: dict[pathlib.Path, tuple[int, int]] = {}
 
         self.create_save_dir()
         self.create_container_save_dir()
 
+    @property
+    def manifest(self) -> Manifest:
+        """Manifest of the current container directory, (re)built from container files if it doesn't exist yet."""
+        path = pathlib.Path(self.container_path).joinpath(Manifest.file_name)
+
+        if self._manifest is None or self._manifest.path != path:
+            self._manifest = Manifest(path)
+
+            if not self._manifest.load():
+                self.rebuild_manifest()
+
+        return self._manifest
+
+    def reload_manifest(self):
+        """Read manifest file again on next access, to pick up containers saved or deleted by other processes."""
+        self._manifest = None
+
+    def rebuild_manifest(self):
+        self._manifest.clear()
+
+        for file in self._get_list_of_supported_files_in_dir(self.container_path):
+            self._manifest.set_entry(self.load_data_from_file(file), file)
+
+        self._manifest.save()
+
     def create_save_dir(self):
         if not self.save_path.exists():
             os.mkdir(self.save_path)
@@ -36,54 +204,535 @@ class DataManager(ABC):
         if not self.container_path.exists():
             os.mkdir(self.container_path)
 
-    def load_all_container_data_from_save_directory(self) -> list[dict]:
+    def load_all_container_data_from_save_directory(self, workers: int = 0, use_processes: bool = True) -> list[dict]:
+        """Load data of every saved container. With more than one worker, files are read and decoded concurrently
+        by a process pool (or a thread pool) and returned in the same order as a serial load would return them."""
         container_files = self._get_list_of_supported_files_in_dir(self.container_path)
-        container_data: list[dict] = []
 
-        for file in container_files:
-            loaded_data = self.load_data_from_file(file)
-            container_data.append(loaded_data)
+        if self.use_snapshot:
+            container_data = self._load_files_through_snapshot(container_files, workers, use_processes)
+        else:
+            container_data = self._load_files(container_files, workers, use_processes)
+
+        self._sync_manifest(container_data, container_files)
 
         return container_data
 
+    def get_container_names(self) -> list[str]:
+        """Names of all saved containers, read from the manifest without loading any of them."""
+        return list(self.manifest.entries)
+
+    def container_exists(self, container_name: str) -> bool:
+        return self.get_container_filepath(container_name).exists()
+
+    def load_container_data(self, container_name: str) -> dict:
+        filepath = self.get_container_filepath(container_name)
+        data = self.load_data_from_file(filepath)
+
+        if not self.manifest.is_entry_up_to_date(container_name):
+            self.manifest.set_entry(data, filepath)
+            self.manifest.save()
+
+        return data
+
+    def load_component_store(self) -> ColumnarComponentStore:
+        """Open memory-mapped columnar store of every saved component, rebuilt first if any container was
+        saved or deleted since it was last written."""
+        path = pathlib.Path(self.container_path).joinpath(ColumnarComponentStore.file_name)
+
+        if path.exists() and os.stat(path).st_mtime_ns >= self.get_last_modification_time():
+            try:
+                return ColumnarComponentStore.open(path)
+            except ValueError:
+                # written by another version, rebuilt below
+                pass
+
+        store = ColumnarComponentStore.from_container_data(self.load_all_container_data_from_save_directory())
+        store.save(path)
+        return ColumnarComponentStore.open(path)
+
+    def get_last_modification_time(self) -> int:
+        """Time of the last container save or deletion in ns - manifest gets written along with each of them."""
+        return os.stat(self.manifest.path).st_mtime_ns
+
     @abstractmethod
     def load_data_from_file(self, filepath) -> dict:
         pass
 
+    def _load_files(self, files: list[pathlib.Path], workers: int, use_processes: bool) -> list[dict]:
+        """Load given save files in order, managers able to read files concurrently make use of workers."""
+        return [self.load_data_from_file(file) for file in files]
+
+    def _load_files_through_snapshot(self, files: list[pathlib.Path], workers: int, use_processes: bool) -> list[dict]:
+        """Take data of unchanged files from the snapshot and only decode files changed since it was written,
+        then write a new snapshot if anything was out of date."""
+        snapshot = Snapshot(pathlib.Path(self.container_path).joinpath(Snapshot.file_name))
+        snapshot.load()
+
+        stats = [os.stat(file) for file in files]
+        mtimes = [stat.st_mtime_ns for stat in stats]
+        container_data = [snapshot.get_data(file, mtime) for file, mtime in zip(files, mtimes)]
+
+        for file, stat in zip(files, stats):
+            self._record_version(file, stat)
+        stale = [index for index, data in enumerate(container_data) if data is None]
+
+        for index, data in zip(stale, self._load_files([files[index] for index in stale], workers, use_processes)):
+            container_data[index] = data
+
+        if stale or len(snapshot.entries) != len(files):
+            snapshot.entries = {file.name: (mtime, data) for file, mtime, data in zip(files, mtimes, container_data)}
+            snapshot.save()
+
+        return container_data
+
     @abstractmethod
     def save_data_to_file(self, obj_to_save, filepath):
         pass
 
+    @contextmanager
+    def batch_writes(self):
+        """Defer container writes and deletions made inside the block until it ends, then flush all of them to disk
+        at once and swap them in place of old files. Same as with a single write, a crash leaves every container file
+        either in its old or its new state. Writes and deletions of a block interrupted by an exception
+        are discarded."""
+        if self._pending_writes is not None:
+            yield
+            return
+
+        self._pending_writes = {}
+
+        try:
+            yield
+            self._commit_pending_writes()
+        except BaseException:
+            for temp_path, _ in self._pending_writes.values():
+                with suppress(FileNotFoundError):
+                    os.remove(temp_path)
+            raise
+        finally:
+            self._pending_writes = None
+            self._pending_deletions = {}
+
+    def write_container_file(self, filepath, content: str, data: dict):
+        """Atomically replace container file, or schedule it to be replaced at the end of the current batch."""
+        filepath = pathlib.Path(filepath)
+
+        if self._pending_writes is None:
+            with self.lock_container_file(filepath):
+                self._check_version(filepath)
+                write_file_atomically(filepath, content)
+                self._record_version(filepath)
+
+            self.manifest.set_entry(data, filepath)
+            self.manifest.save()
+            return
+
+        self._discard_pending_write(filepath)
+        self._pending_deletions.pop(filepath, None)
+        # content is flushed to disk once for the whole batch, when it gets committed
+        self._pending_writes[filepath] = (create_temp_file(filepath, content, fsync=False), data)
+
+    def _commit_pending_writes(self):
+        if not self._pending_writes and not self._pending_deletions:
+            return
+
+        # files are always locked in the same order, so that two committing processes can't deadlock
+        filepaths = sorted([*self._pending_writes, *self._pending_deletions])
+
+        with ExitStack() as locks:
+            for filepath in filepaths:
+                locks.enter_context(self.lock_container_file(filepath))
+
+            # nothing is replaced or deleted unless every file of the batch is still in the version it was loaded in
+            for filepath in filepaths:
+                self._check_version(filepath)
+
+            for temp_path, _ in self._pending_writes.values():
+                fsync_file(temp_path)
+
+            for filepath, (temp_path, data) in sorted(self._pending_writes.items()):
+                os.replace(temp_path, filepath)
+                self._record_version(filepath)
+                self.manifest.set_entry(data, filepath)
+
+            for filepath, container_name in self._pending_deletions.items():
+                self._remove_container_file(filepath, container_name)
+
+            fsync_directory(self.container_path)
+
+        self.manifest.save()
+
+    @contextmanager
+    def lock_container_file(self, filepath):
+        """Hold advisory lock of a container file while it's being replaced or deleted. Readers never lock,
+        files are replaced atomically so they always read a whole file."""
+        filepath = pathlib.Path(filepath)
+
+        with lock_file(filepath.with_name(f".{filepath.name}.lock")):
+            yield
+
+    def _check_version(self, filepath: pathlib.Path):
+        """Raise ContainerVersionConflictError if the file was changed or deleted by someone else since this
+        manager loaded or saved it. Files this manager hasn't seen yet can be written freely."""
+        if self._is_file_changed(filepath):
+            raise ContainerVersionConflictError(name=filepath.stem)
+
+    def is_container_file_changed(self, container_name: str) -> bool:
+        """Return True if container file was changed or deleted by someone else since this manager loaded
+        or saved it."""
+        return self._is_file_changed(self.get_container_filepath(container_name))
+
+    def _is_file_changed(self, filepath: pathlib.Path) -> bool:
+        expected_version = self._versions.get(filepath)
+
+        if expected_version is None:
+            return False
+
+        try:
+            version = self.get_file_version(os.stat(filepath))
+        except FileNotFoundError:
+            version = None
+
+        return version != expected_version
+
+    def _record_version(self, filepath: pathlib.Path, stat: os.stat_result | None = None):
+        self._versions[pathlib.Path(filepath)] = self.get_file_version(stat or os.stat(filepath))
+
+    @staticmethod
+    def get_file_version(stat: os.stat_result) -> tuple[int, int]:
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _discard_pending_write(self, filepath: pathlib.Path) -> bool:
+        if not self._pending_writes or filepath not in self._pending_writes:
+            return False
+
+        os.remove(self._pending_writes.pop(filepath)[0])
+        return True
+
     def delete_container_file(self, container_name: str):
-        path = pathlib.Path(self.container_path).joinpath(f"{container_name}{self.file_suffix}")
-        os.remove(path)
+        """Delete container file, or schedule it to be deleted at the end of the current batch."""
+        path = self.get_container_filepath(container_name)
+
+        if self._pending_writes is not None:
+            # a container created within the current batch has no file to delete yet
+            if not self._discard_pending_write(path) or path.exists():
+                self._pending_deletions[path] = container_name
+            return
+
+        with self.lock_container_file(path):
+            self._check_version(path)
+            self._remove_container_file(path, container_name)
+
+        self.manifest.save()
+
+    def _remove_container_file(self, path: pathlib.Path, container_name: str):
+        with suppress(FileNotFoundError):
+            os.remove(path)
+
+        self._versions.pop(path, None)
+        self.manifest.remove_entry(container_name)
 
     def _get_list_of_supported_files_in_dir(self, dir_path):
         ls = os.listdir(dir_path)
-        return [pathlib.Path(CONTAINER_SAVE_PATH).joinpath(file) for file in ls if
+        return [pathlib.Path(dir_path).joinpath(file) for file in ls if
                 self._file_is_supported_by_manager(file)]
 
     def _file_is_supported_by_manager(self, filepath) -> bool:
         return pathlib.Path(filepath).suffix == self.file_suffix
 
     def create_filepath(self, obj):
-        return pathlib.Path(self.container_path).joinpath(f"{obj.name}{self.file_suffix}")
+        return self.get_container_filepath(obj.name)
+
+    def get_container_filepath(self, container_name: str) -> pathlib.Path:
+        return pathlib.Path(self.container_path).joinpath(f"{container_name}{self.file_suffix}")
+
+    def _sync_manifest(self, container_data: list[dict], container_files: list[pathlib.Path]):
+        """Bring manifest in line with a full load of the container directory."""
+        manifest = self.manifest
+        loaded_names = {data['name'] for data in container_data}
+        is_changed = set(manifest.entries) != loaded_names
+
+        for data, file in zip(container_data, container_files):
+            if not manifest.is_entry_up_to_date(data['name']):
+                manifest.set_entry(data, file)
+                is_changed = True
+
+        if is_changed:
+            for name in set(manifest.entries) - loaded_names:
+                manifest.remove_entry(name)
+
+            manifest.save()
 
 
 class JSONDataManager(DataManager):
     file_suffix: str = '.json'
+    use_snapshot: bool = True
 
     def load_data_from_file(self, filepath) -> dict:
+        with open(filepath, 'r') as file:
+            self._record_version(filepath, os.fstat(file.fileno()))
+            return json.load(file)
+
+    @staticmethod
+    def read_file(filepath) -> dict:
+        """Read and decode a single save file, run by pool workers so it must not depend on manager state."""
         with open(filepath, 'r') as file:
             data = json.load(file)
 
         return data
 
+    def _load_files(self, files: list[pathlib.Path], workers: int, use_processes: bool) -> list[dict]:
+        if workers > 1 and len(files) > 1:
+            return self._load_files_in_parallel(files, workers, use_processes)
+
+        return super()._load_files(files, workers, use_processes)
+
+    def _load_files_in_parallel(self, files: list[pathlib.Path], workers: int, use_processes: bool) -> list[dict]:
+        executor_class: type[Executor] = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        # hand files out in chunks, so that a few thousand small files don't cost a few thousand round trips
+        chunk_size = max(1, len(files) // (workers * 4))
+
+        # versions are taken before reading, a file changed in the meantime at worst causes a false conflict
+        for file in files:
+            self._record_version(file)
+
+        with executor_class(max_workers=workers) as executor:
+            return list(executor.map(self.read_file, files, chunksize=chunk_size))
+
     def save_data_to_file(self, obj_to_save: JSONInterface, filepath=None):
         if not filepath:
             filepath = self.create_filepath(obj_to_save)
 
-        with open(filepath, 'w') as file:
-            data = obj_to_save.to_json()
-            data = json.dumps(data, indent=4)
-            file.write(data)
+        data = obj_to_save.to_json()
+        self.write_container_file(filepath, json.dumps(data, indent=4), data)
+
+
+class SQLiteDataManager(DataManager):
+    """Stores containers, drawers, components and their tags as rows of a single SQLite database.
+    Saving a container only writes the rows that differ from the last loaded or saved state, so creating,
+    updating or deleting a single component touches a single row (plus its tags)."""
+    file_suffix: str = '.db'
+    database_name: str = 'storage'
+
+    schema: str = """
+        CREATE TABLE IF NOT EXISTS containers (
+            name TEXT PRIMARY KEY,
+            total_rows INTEGER NOT NULL,
+            max_drawers_per_row INTEGER NOT NULL,
+            compartments_per_drawer INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS drawers (
+            container TEXT NOT NULL,
+            name TEXT NOT NULL,
+            row INTEGER NOT NULL,
+            "column" INTEGER NOT NULL,
+            PRIMARY KEY (container, name)
+        );
+        CREATE TABLE IF NOT EXISTS components (
+            container TEXT NOT NULL,
+            drawer TEXT NOT NULL,
+            name TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            compartment INTEGER NOT NULL,
+            PRIMARY KEY (container, drawer, name)
+        );
+        CREATE TABLE IF NOT EXISTS tags (
+            container TEXT NOT NULL,
+            drawer TEXT NOT NULL,
+            component TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT,
+            PRIMARY KEY (container, drawer, component, key)
+        );
+    """
+
+    # table name -> (primary key columns, value columns)
+    tables: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+        'containers': (('name',), ('total_rows', 'max_drawers_per_row', 'compartments_per_drawer')),
+        'drawers': (('container', 'name'), ('row', '"column"')),
+        'components': (('container', 'drawer', 'name'), ('count', 'type', 'compartment')),
+        'tags': (('container', 'drawer', 'component', 'key'), ('value',)),
+    }
+
+    def __init__(self, save_dir_path=SAVE_PATH, container_dir_path=CONTAINER_SAVE_PATH, database_path=None):
+        super().__init__(save_dir_path, container_dir_path)
+
+        if database_path is None:
+            database_path = pathlib.Path(self.save_path).joinpath(f"{self.database_name}{self.file_suffix}")
+
+        self.database_path = database_path
+        # connection is shared by threads of the session, e.g. the writer thread of AsyncSession,
+        # every use of it goes through the lock
+        self.connection = sqlite3.connect(database_path, check_same_thread=False)
+        self.connection.executescript(self.schema)
+        self._lock = threading.RLock()
+
+        # last persisted rows of each container, used to find rows that actually changed
+        self._persisted_rows: dict[str, dict[str, dict[tuple, tuple]]] = {}
+
+    def load_all_container_data_from_save_directory(self, workers: int = 0, use_processes: bool = True) -> list[dict]:
+        """Rows are read through a single connection, worker count is accepted for compatibility and ignored."""
+        with self._lock:
+            return [self.load_data_from_file(name) for name in self.get_container_names()]
+
+    def load_data_from_file(self, filepath) -> dict:
+        """There are no per-container files in a database, the container name is used in place of a file path."""
+        container_name = str(filepath)
+
+        with self._lock:
+            rows = self._select_container_rows(container_name)
+            self._persisted_rows[container_name] = rows
+
+        return self._rows_to_container_data(container_name, rows)
+
+    def save_data_to_file(self, obj_to_save: JSONInterface, filepath=None):
+        self.save_container_data(obj_to_save.to_json())
+
+    def save_container_data(self, data: dict):
+        container_name = data['name']
+        new_rows = self._container_data_to_rows(data)
+
+        with self._lock:
+            if container_name not in self._persisted_rows:
+                self._persisted_rows[container_name] = self._select_container_rows(container_name)
+
+            old_rows = self._persisted_rows[container_name]
+
+            with self.connection:
+                for table, (key_columns, value_columns) in self.tables.items():
+                    old_table_rows, new_table_rows = old_rows[table], new_rows[table]
+
+                    removed = [key for key in old_table_rows if key not in new_table_rows]
+                    changed = [key + values for key, values in new_table_rows.items()
+                               if old_table_rows.get(key) != values]
+
+                    if removed:
+                        self.connection.executemany(self._delete_statement(table, key_columns), removed)
+
+                    if changed:
+                        self.connection.executemany(self._upsert_statement(table, key_columns, value_columns),
+                                                    changed)
+
+            self._persisted_rows[container_name] = new_rows
+
+    def get_container_names(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self.connection.execute("SELECT name FROM containers ORDER BY rowid")]
+
+    def container_exists(self, container_name: str) -> bool:
+        with self._lock:
+            cursor = self.connection.execute("SELECT 1 FROM containers WHERE name = ?", (container_name,))
+            return cursor.fetchone() is not None
+
+    def load_container_data(self, container_name: str) -> dict:
+        return self.load_data_from_file(container_name)
+
+    def delete_container_file(self, container_name: str):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM containers WHERE name = ?", (container_name,))
+
+            for table in ('drawers', 'components', 'tags'):
+                self.connection.execute(f"DELETE FROM {table} WHERE container = ?", (container_name,))
+
+            self._persisted_rows.pop(container_name, None)
+
+    def create_filepath(self, obj):
+        return self.database_path
+
+    def get_last_modification_time(self) -> int:
+        return os.stat(self.database_path).st_mtime_ns
+
+    def _select_container_rows(self, container_name: str) -> dict[str, dict[tuple, tuple]]:
+        rows: dict[str, dict[tuple, tuple]] = {}
+
+        for table, (key_columns, value_columns) in self.tables.items():
+            container_column = 'name' if table == 'containers' else 'container'
+            columns = ', '.join(key_columns + value_columns)
+            cursor = self.connection.execute(f"SELECT {columns} FROM {table} WHERE {container_column} = ? "
+                                             f"ORDER BY rowid", (container_name,))
+            key_length = len(key_columns)
+            rows[table] = {row[:key_length]: row[key_length:] for row in cursor}
+
+        return rows
+
+    def _container_data_to_rows(self, data: dict) -> dict[str, dict[tuple, tuple]]:
+        """Flatten nested container data into table rows keyed by their primary key."""
+        container_name = data['name']
+        rows: dict[str, dict[tuple, tuple]] = {table: {} for table in self.tables}
+
+        rows['containers'][(container_name,)] = (data['total_rows'], data['max_drawers_per_row'],
+                                                 data['compartments_per_drawer'])
+        self._add_tag_rows(rows['tags'], data['tags'], container_name)
+
+        for drawer in data['drawers']:
+            rows['drawers'][(container_name, drawer['name'])] = (drawer['row'], drawer['column'])
+            self._add_tag_rows(rows['tags'], drawer['tags'], container_name, drawer['name'])
+
+            for comp in drawer['components']:
+                rows['components'][(container_name, drawer['name'], comp['name'])] = (comp['count'], str(comp['type']),
+                                                                                      comp['compartment'])
+                self._add_tag_rows(rows['tags'], comp['tags'], container_name, drawer['name'], comp['name'])
+
+        return rows
+
+    def _add_tag_rows(self, tag_rows: dict, tags: dict, container: str, drawer: str = '', component: str = ''):
+        for key, value in tags.items():
+            tag_rows[(container, drawer, component, str(key))] = (json.dumps(value),)
+
+    def _rows_to_container_data(self, container_name: str, rows: dict[str, dict[tuple, tuple]]) -> dict:
+        """Rebuild nested container data, in the same shape as JSON save files, from table rows."""
+        tags: dict[tuple[str, str], dict] = {}
+        for (_, drawer, component, key), (value,) in rows['tags'].items():
+            tags.setdefault((drawer, component), {})[key] = json.loads(value)
+
+        drawers: dict[str, dict] = {}
+        for (_, name), (row, column) in rows['drawers'].items():
+            drawers[name] = {"name": name,
+                             "row": row,
+                             "column": column,
+                             "tags": tags.get((name, ''), {}),
+                             "components": []}
+
+        for (_, drawer, name), (count, type, compartment) in rows['components'].items():
+            drawers[drawer]['components'].append({"name": name,
+                                                  "count": count,
+                                                  "type": type,
+                                                  "compartment": compartment,
+                                                  "tags": tags.get((drawer, name), {})})
+
+        total_rows, max_drawers_per_row, compartments_per_drawer = rows['containers'][(container_name,)]
+
+        return {"name": container_name,
+                "total_rows": total_rows,
+                "max_drawers_per_row": max_drawers_per_row,
+                "compartments_per_drawer": compartments_per_drawer,
+                "tags": tags.get(('', ''), {}),
+                "drawers": list(drawers.values())}
+
+    def _delete_statement(self, table: str, key_columns: tuple[str, ...]) -> str:
+        condition = ' AND '.join(f"{column} = ?" for column in key_columns)
+        return f"DELETE FROM {table} WHERE {condition}"
+
+    def _upsert_statement(self, table: str, key_columns: tuple[str, ...], value_columns: tuple[str, ...]) -> str:
+        columns = key_columns + value_columns
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in value_columns)
+        return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) " \
+               f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}"
+
+
+def convert_json_save_to_sqlite(json_manager: DataManager | None = None,
+                                sqlite_manager: SQLiteDataManager | None = None) -> int:
+    """Copy every container from the JSON save directory (save/containers/*.json) into the SQLite database.
+    Returns the number of converted containers."""
+    json_manager = json_manager or JSONDataManager()
+    sqlite_manager = sqlite_manager or SQLiteDataManager()
+
+    container_data = json_manager.load_all_container_data_from_save_directory()
+
+    for data in container_data:
+        sqlite_manager.save_container_data(data)
+
+    return len(container_data)
@@ -0,0 +1,112 @@
+"""Streaming import of components from CSV and JSON lines files"""
+
+from __future__ import annotations
+
+import csv
+import json
+import pathlib
+import sys
+
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, TextIO
+
+from storage.cli.exceptions import StorageBaseException
+
+if TYPE_CHECKING:
+    from storage.session import Session
+
+
+IMPORT_FORMATS = ['csv', 'jsonl']
+
+# every row has to specify these, any other column or key of a row becomes a tag of the component
+REQUIRED_FIELDS = ('name', 'count', 'type', 'drawer', 'container')
+
+
+class ImportResult(NamedTuple):
+    imported: int
+    failed: int
+
+
+def get_file_format(path, file_format: str | None = None) -> str:
+    """Return given format, or the one matching file extension - CSV unless it's a .jsonl or .ndjson file."""
+    if file_format is not None:
+        return file_format
+
+    return 'jsonl' if pathlib.Path(path).suffix.lower() in ('.jsonl', '.ndjson') else 'csv'
+
+
+def read_rows(file: TextIO, file_format: str) -> Iterator[tuple[int, dict | str]]:
+    """Yield (line number, row) one at a time, so that memory use doesn't grow with file size.
+    JSON lines are yielded undecoded, so that a malformed line only fails its own row."""
+    if file_format == 'csv':
+        reader = csv.DictReader(file)
+
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(file, start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def get_component_kwargs(row: dict | str) -> dict:
+    """Turn row into keyword arguments of Session.create_component()."""
+    row = json.loads(row) if isinstance(row, str) else dict(row)
+
+    if not isinstance(row, dict):
+        raise TypeError("row is not an object")
+
+    missing_fields = [field for field in REQUIRED_FIELDS if row.get(field) in (None, '')]
+
+    if missing_fields:
+        raise ValueError(f"row is missing {', '.join(repr(field) for field in missing_fields)}")
+
+    kwargs = {field: row.pop(field) for field in REQUIRED_FIELDS}
+    kwargs['count'] = int(kwargs['count'])
+
+    compartment = row.pop('compartment', None)
+    if compartment not in (None, ''):
+        kwargs['compartment'] = int(compartment)
+
+    tags = row.pop('tags', None) or {}
+
+    if not isinstance(tags, dict):
+        raise TypeError("'tags' of a row must be an object")
+
+    # csv.DictReader puts values beyond the header under None, empty cells are not tags
+    tags.update({key: value for key, value in row.items() if key is not None and value not in (None, '')})
+    kwargs['tags'] = tags
+
+    return kwargs
+
+
+def import_components(session: Session, rows: Iterable[tuple[int, dict | str]], batch_size: int,
+                      prog: str = 'storage') -> ImportResult:
+    """Create a component out of every row, each batch of rows in a single transaction - so that every container
+    touched by the batch is written once. A row failing to import is reported along with its line number and
+    does not stop the import."""
+    imported = failed = 0
+    rows = iter(rows)
+
+    while True:
+        batch_imported = batch_failed = 0
+
+        with session.transaction():
+            for line_number, row in rows:
+                try:
+                    session.create_component(**get_component_kwargs(row))
+                except (StorageBaseException, ValueError, KeyError, TypeError) as error:
+                    batch_failed += 1
+                    print(f"{prog}: line {line_number}: {error}", file=sys.stderr)
+                else:
+                    batch_imported += 1
+
+                if batch_imported + batch_failed == batch_size:
+                    break
+
+        # counted once the batch is committed, a rolled back batch imports nothing
+        imported += batch_imported
+        failed += batch_failed
+
+        if batch_imported + batch_failed < batch_size:
+            return ImportResult(imported, failed)
@@ -11,7 +11,7 @@ class ComponentPlaceholder:
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Component:
     """Singular component or a group of components stored in parent drawer."""
     name: str
@@ -21,6 +21,16 @@ class Component:
     tags: dict = field(repr=False, default_factory=dict)
     parent_drawer: Drawer = None
 
+    def __setattr__(self, key, value):
+        # renaming (e.g. via 'update component') has to be reflected in parent drawer name index
+        if key == 'name' and getattr(self, 'parent_drawer', None) is not None:
+            self.parent_drawer.rename_component(self, self.name, value)
+
+            if 'name' in self.tags:
+                self.tags['name'] = value
+
+        object.__setattr__(self, key, value)
+
     @property
     def location(self) -> tuple[Position, int]:
         """Returns drawer position and compartment at which this component is located"""
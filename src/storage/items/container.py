@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from datetime import datetime
 from dataclasses import dataclass, field
 
 from storage.validator import RowValidator, ColumnValidator, CompartmentValidator
 from storage.nochange import NoChange
+from storage.util import get_timestamp
 from storage.cli.exceptions import DuplicateNameError, SpaceOccupiedError, NoFreeSpacesError, ItemNotFoundError, \
     ItemNotFoundAtPositionError, ItemIsNotEmptyError
 from storage.cli.printer import Printer
@@ -25,6 +25,8 @@ class Container:
 
     drawer_rows: list[Row] = field(default_factory=list)
     _drawers: list[Drawer] = field(default_factory=list)
+    _drawers_by_name: dict[str, Drawer] = field(init=False, repr=False, compare=False, default_factory=dict)
+    _rows_with_free_space: int = field(init=False, repr=False, compare=False, default=0)
 
     def __post_init__(self):
         self.create_rows()
@@ -41,9 +43,9 @@ class Container:
     def add_special_tags(self):
         self.tags['rows'] = self.total_rows
         self.tags['columns'] = self.max_drawers_per_row
-        self.tags['last_update'] = datetime.now().strftime("%d/%m/%Y, %H:%M")
-        self.tags['children_count'] = len(self.drawers)
-        self.tags['free_space'] = all([row.has_free_space() for row in self.drawer_rows])
+        self.tags['last_update'] = get_timestamp()
+        self.tags['children_count'] = len(self._drawers)
+        self.tags['free_space'] = self._all_rows_have_free_space()
 
     def create_rows(self, fill_empty_spaces=True):
         """Create Row class for each row and fill it with placeholder drawers."""
@@ -55,6 +57,8 @@ class Container:
             if fill_empty_spaces:
                 new_row.fill_columns(self.max_drawers_per_row)
 
+        self._sync_rows_with_free_space()
+
     def add_drawer(self, name: str, row: int = -1, column: int = -1, tags=None, components=None) -> Drawer:
         """Add new Drawer child class identified by unique name.\n
         List of child components can be empty.\n
@@ -71,9 +75,9 @@ class Container:
             for comp in components:
                 new_drawer.add_component(**comp)
 
-        row = self.drawer_rows[pos.row]
-        row.items[pos.column] = new_drawer
+        self._set_drawer_at_pos(pos.row, pos.column, new_drawer)
         self._drawers.append(new_drawer)
+        self._drawers_by_name[new_drawer.name] = new_drawer
 
         self.add_special_tags()
 
@@ -89,12 +93,22 @@ class Container:
         return new_drawer
 
     def get_drawer_by_name(self, drawer_name: str) -> Drawer:
-        """Return child Drawer by name. Returns None if drawer wasn't found."""
-        for drawer in self._drawers:
-            if drawer.name == drawer_name:
-                return drawer
+        """Return child Drawer by name. Raises ItemNotFoundError if drawer wasn't found."""
+        try:
+            return self._drawers_by_name[drawer_name]
+        except KeyError:
+            raise ItemNotFoundError(item='drawer', name=drawer_name, relation=self.name)
+
+    def rename_drawer(self, drawer: Drawer, old_name: str, new_name: str):
+        """Keep drawer name index in sync, called by Drawer whenever its name changes."""
+        if self._drawers_by_name.get(old_name) is not drawer or old_name == new_name:
+            return
+
+        if new_name in self._drawers_by_name:
+            raise DuplicateNameError(item='drawer', name=new_name, relation=self.name, pos=drawer.location)
 
-        raise ItemNotFoundError(item='drawer', name=drawer_name, relation=self.name)
+        del self._drawers_by_name[old_name]
+        self._drawers_by_name[new_name] = drawer
 
     def get_drawer_at_pos(self, row: int, column: int) -> Drawer:
         """Return child Drawer at target row and column."""
@@ -114,8 +128,9 @@ class Container:
         drawer_to_del = self.get_drawer_by_name(name)
 
         if (len(drawer_to_del.components) == 0) + forced > 0:
-            self.drawer_rows[drawer_to_del.row].pop_item(drawer_to_del.column)
+            self._pop_drawer_at_pos(drawer_to_del.row, drawer_to_del.column)
             self._drawers.remove(drawer_to_del)
+            del self._drawers_by_name[drawer_to_del.name]
 
             self.add_special_tags()
 
@@ -136,8 +151,9 @@ class Container:
         if not drawer:
             return None
 
-        drawer = self.drawer_rows[row].pop_item(column)
+        drawer = self._pop_drawer_at_pos(row, column)
         self._drawers.remove(drawer)
+        del self._drawers_by_name[drawer.name]
 
         self.add_special_tags()
 
@@ -152,15 +168,14 @@ class Container:
         """This method will fail if target location is occupied.
         Forced=True will remove drawer at target location without throwing error if it exists and
         move the desired drawer there."""
-        target_row = self.drawer_rows[row]
         is_space_free = self._is_pos_free(row, column)
         old_pos = drawer_obj.position
 
         if is_space_free + forced > 0:
-            target_row.items[column] = drawer_obj
+            self._pop_drawer_at_pos(old_pos[0], old_pos[1])
+            self._set_drawer_at_pos(row, column, drawer_obj)
             drawer_obj.row = row
             drawer_obj.column = column
-            self.drawer_rows[old_pos[0]].items[old_pos[1]] = DrawerPlaceholder()
 
             self.add_special_tags()
         else:
@@ -170,10 +185,10 @@ class Container:
         old_pos = drawer_obj.position
         new_pos = self._clamp_new_drawer_position()
 
-        self.drawer_rows[new_pos.row].items[new_pos.column] = drawer_obj
+        self._pop_drawer_at_pos(old_pos[0], old_pos[1])
+        self._set_drawer_at_pos(new_pos.row, new_pos.column, drawer_obj)
         drawer_obj.row = new_pos.row
         drawer_obj.column = new_pos.column
-        self.drawer_rows[old_pos[0]].items[old_pos[1]] = DrawerPlaceholder()
 
     def resize_container(self, new_row_count: int | NoChange = NoChange, new_column_count: int | NoChange = NoChange):
         """Change number of rows and/or columns. This action is non-destructive, if any drawers would overflow and
@@ -194,6 +209,7 @@ class Container:
         self.total_rows = new_row_count
         self.drawer_rows = self.drawer_rows[:new_row_count:]
         self._delete_overflowing_drawers(new_row_count)
+        self._sync_rows_with_free_space()
 
     def _resize_columns(self, new_column_count: int):
         """Change maximum number of columns and resize container.
@@ -206,13 +222,17 @@ class Container:
         for row in self.drawer_rows:
             row.resize(new_column_count)
 
+        self._sync_rows_with_free_space()
+
     def _delete_overflowing_drawers(self, start_index: int):
         drawers_to_delete = self.drawers[start_index::]
         for drawer in drawers_to_delete:
             self.drawers.remove(drawer)
+            del self._drawers_by_name[drawer.name]
 
     def clear_container(self):
         self._drawers.clear()
+        self._drawers_by_name.clear()
         self.drawer_rows.clear()
         self.create_rows()
         self.add_special_tags()
@@ -226,16 +246,20 @@ class Container:
     def get_next_free_row_and_column(self, start_row: int = -1) -> Position:
         """Find the first free spot where a new Drawer can be put in."""
         if start_row > -1:
-            row = self.drawer_rows[start_row]
-            if row.get_column_length() < self.max_drawers_per_row:
-                return Position(row=start_row, column=row.get_column_length())
+            column = self.drawer_rows[start_row].get_next_free_column()
+            if column is not None:
+                return Position(row=start_row, column=column)
             else:
                 raise NoFreeSpacesError(item='drawer', relation=self.name,
                                         reason=f"as the row {start_row} has no free spaces")
 
-        for row in self.drawer_rows:
-            if row.get_column_length() < self.max_drawers_per_row:
-                return Position(row=row.index, column=row.get_column_length())
+        if self._rows_with_free_space:
+            # lowest set bit is the first row with a free column
+            row_index = (self._rows_with_free_space & -self._rows_with_free_space).bit_length() - 1
+            column = self.drawer_rows[row_index].get_next_free_column()
+
+            if column is not None:
+                return Position(row=row_index, column=column)
 
         raise NoFreeSpacesError(item='drawer', relation=self.name)
 
@@ -261,6 +285,30 @@ class Container:
 
         return pos
 
+    def _set_drawer_at_pos(self, row: int, column: int, drawer: Drawer):
+        self.drawer_rows[row].set_item(column, drawer)
+        self._update_row_free_space(row)
+
+    def _pop_drawer_at_pos(self, row: int, column: int) -> Drawer | DrawerPlaceholder:
+        drawer = self.drawer_rows[row].pop_item(column)
+        self._update_row_free_space(row)
+        return drawer
+
+    def _all_rows_have_free_space(self) -> bool:
+        return self._rows_with_free_space == (1 << len(self.drawer_rows)) - 1
+
+    def _update_row_free_space(self, row_index: int):
+        if self.drawer_rows[row_index].get_next_free_column() is not None:
+            self._rows_with_free_space |= 1 << row_index
+        else:
+            self._rows_with_free_space &= ~(1 << row_index)
+
+    def _sync_rows_with_free_space(self):
+        self._rows_with_free_space = 0
+
+        for row_index in range(len(self.drawer_rows)):
+            self._update_row_free_space(row_index)
+
     def _is_pos_free(self, row: int, column: int) -> bool:
         try:
             target_row = self.drawer_rows[row]
@@ -271,9 +319,7 @@ class Container:
         return is_space_free
 
     def _is_drawer_name_unique(self, drawer_name: str) -> bool:
-        if drawer_name in [drawer.name for drawer in self._drawers]:
-            return False
-        return True
+        return drawer_name not in self._drawers_by_name
 
     def _drawers_to_dict_list(self) -> list[dict]:
         return [drawer.to_json() for drawer in self._drawers]
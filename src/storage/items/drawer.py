@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
 from typing import TYPE_CHECKING
 
 from storage.cli.exceptions import DuplicateNameError, NoFreeSpacesError, ItemNotFoundError, \
@@ -10,6 +9,7 @@ from storage.cli.printer import Printer
 from storage.items.component import Component, ComponentPlaceholder
 from storage.items.position import Position
 from storage.items.row import Row
+from storage.util import get_timestamp
 
 if TYPE_CHECKING:
     from storage.items.container import Container
@@ -19,7 +19,7 @@ class DrawerPlaceholder:
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Drawer:
     """A drawer belonging to certain container and containing specified amount of components."""
     name: str
@@ -29,11 +29,22 @@ class Drawer:
     tags: dict = field(repr=False, default_factory=dict)
     parent_container: Container = None
     _row: Row = None
+    _components_by_name: dict[str, Component] = field(init=False, repr=False, compare=False, default_factory=dict)
 
     def __post_init__(self):
         self.create_component_spaces()
         self._add_special_tags()
 
+    def __setattr__(self, key, value):
+        # renaming (e.g. via 'update drawer') has to be reflected in parent container name index
+        if key == 'name' and getattr(self, 'parent_container', None) is not None:
+            self.parent_container.rename_drawer(self, self.name, value)
+
+            if 'name' in self.tags:
+                self.tags['name'] = value
+
+        object.__setattr__(self, key, value)
+
     @property
     def location(self) -> Position:
         return Position(self.row, self.column)
@@ -51,9 +62,9 @@ class Drawer:
         return self.row, self.column
 
     def _add_special_tags(self):
-        self.tags['last_update'] = datetime.now().strftime("%d/%m/%Y, %H:%M")
-        self.tags['children_count'] = len(self.components)
-        self.tags['free_space'] = self._free_spot_exists(self.components)
+        self.tags['last_update'] = get_timestamp()
+        self.tags['children_count'] = self._row.get_column_length()
+        self.tags['free_space'] = self._free_spot_exists()
 
     def create_component_spaces(self):
         new_row = Row(0, [], Component, ComponentPlaceholder)
@@ -69,7 +80,7 @@ class Drawer:
         if self._component_already_exists(name):
             raise DuplicateNameError(item='component', name=name, relation=self.name)
 
-        if not self._free_spot_exists(self.components):
+        if not self._free_spot_exists():
             raise NoFreeSpacesError(item='component', relation=self.name)
         else:
             target_compartment = self._clamp_new_component_location(compartment)
@@ -77,7 +88,6 @@ class Drawer:
                                       compartment=target_compartment, tags=tags)
             self.move_component_to(new_component, target_compartment)
 
-            self._add_special_tags()
             new_component.tags.update({'name': name, 'count': count, 'type': type})
 
             out = Printer.get_message("ADD_SUCCESS", 2,
@@ -91,13 +101,23 @@ class Drawer:
             return new_component
 
     def get_component_by_name(self, component_name: str) -> Component:
-        """Get child component by name. Returns none if component wasn't found."""
+        """Get child component by name. Raises ItemNotFoundError if component wasn't found."""
         try:
-            index = self.component_names.index(component_name)
-            return self.components[index]
-        except ValueError:
+            return self._components_by_name[component_name]
+        except KeyError:
             raise ItemNotFoundError(item='component', name=component_name, relation=self.name)
 
+    def rename_component(self, component: Component, old_name: str, new_name: str):
+        """Keep component name index in sync, called by Component whenever its name changes."""
+        if self._components_by_name.get(old_name) is not component or old_name == new_name:
+            return
+
+        if new_name in self._components_by_name:
+            raise DuplicateNameError(item='component', name=new_name, relation=self.name)
+
+        del self._components_by_name[old_name]
+        self._components_by_name[new_name] = component
+
     def remove_component_by_name(self, component_name: str):
         component = self.get_component_by_name(component_name)
         index = component.compartment
@@ -106,6 +126,7 @@ class Drawer:
             return
 
         self._row.pop_item(index)
+        del self._components_by_name[component.name]
         self._add_special_tags()
 
         m = Printer.get_message("DEL_SUCCESS", 2,
@@ -122,6 +143,7 @@ class Drawer:
 
             component = self._row.pop_item(component_index)
             component_name = component.name
+            del self._components_by_name[component_name]
             self._add_special_tags()
 
             m = Printer.get_message("DEL_SUCCESS", 2,
@@ -135,7 +157,8 @@ class Drawer:
             raise ItemNotFoundAtPositionError(item='component', relation=self.name, pos=f"index {component_index}")
 
     def clear_drawer(self):
-        self._row.items.clear()
+        self._row.clear()
+        self._components_by_name.clear()
         self._row.fill_columns(self.parent_container.compartments_per_drawer)
         self._add_special_tags()
 
@@ -154,8 +177,11 @@ class Drawer:
                                     reason=f"as specified compartment number is not valid")
 
         if self._row.is_column_free(compartment) + forced > 0:
-            self._row.pop_item(compartment)
-            self._row.items[compartment] = component
+            replaced_item = self._row.set_item(compartment, component)
+            if self._row.is_valid_item(replaced_item):
+                del self._components_by_name[replaced_item.name]
+
+            self._components_by_name[component.name] = component
             component.compartment = compartment
             self._add_special_tags()
         else:
@@ -171,26 +197,26 @@ class Drawer:
             return self.get_next_free_compartment()
 
     def get_next_free_compartment(self) -> int:
-        for i, space in enumerate(self._row.items):
-            if self._row.is_column_free(i):
-                return i
-        raise NoFreeSpacesError(item='component', relation=self.name)
+        compartment = self._row.get_next_free_column()
+
+        if compartment is None:
+            raise NoFreeSpacesError(item='component', relation=self.name)
+
+        return compartment
 
     def has_free_space(self) -> bool:
         return self._row.has_free_space()
 
-    def _free_spot_exists(self, components: list[Component]) -> bool:
+    def _free_spot_exists(self) -> bool:
         """Check whether all compartments are taken or not."""
         if self.parent_container:
-            if len(components) < self.parent_container.compartments_per_drawer:
+            if self._row.get_column_length() < self.parent_container.compartments_per_drawer:
                 return True
 
         return False
 
     def _component_already_exists(self, component_name) -> bool:
-        if component_name in self.component_names:
-            return True
-        return False
+        return component_name in self._components_by_name
 
     def get_readable_format(self) -> str:
         components = [f"{comp.get_readable_format()}" for comp in self.components]
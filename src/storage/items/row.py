@@ -1,23 +1,67 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+_placeholders: dict[type, Any] = {}
+
+
+def get_placeholder(placeholder_class: type) -> Any:
+    """Return placeholder instance shared by every empty slot of every row using this placeholder class."""
+    try:
+        return _placeholders[placeholder_class]
+    except KeyError:
+        return _placeholders.setdefault(placeholder_class, placeholder_class())
+
+
+@dataclass(slots=True)
 class Row:
-    """Singular row of items."""
+    """Singular row of items.
+    Occupied columns are tracked in an int bitmask alongside a live count of items, so occupancy queries and
+    finding the next free column do not have to scan the row."""
     index: int
     items: list
     item_class: Any
     placeholder_item_class: Any
     _max_items: int = 1
+    _occupied: int = field(init=False, repr=False, default=0)
+    _count: int = field(init=False, repr=False, default=0)
 
-    def pop_item(self, column: int = -1) -> item_class:
+    def __post_init__(self):
+        self._sync_occupancy()
+
+    def set_item(self, column: int, item) -> item_class:
+        """Put item at target column, returning whatever occupied it before."""
+        column = self._normalize_column(column)
         old_item = self.items[column]
-        self.items[column] = self.placeholder_item_class()
+        self.items[column] = item
+
+        bit = 1 << column
+        was_occupied = bool(self._occupied & bit)
+        is_occupied = self.is_valid_item(item)
+
+        if is_occupied and not was_occupied:
+            self._occupied |= bit
+            self._count += 1
+        elif was_occupied and not is_occupied:
+            self._occupied &= ~bit
+            self._count -= 1
+
         return old_item
 
+    @property
+    def placeholder(self):
+        return get_placeholder(self.placeholder_item_class)
+
+    def pop_item(self, column: int = -1) -> item_class:
+        return self.set_item(column, self.placeholder)
+
+    def clear(self):
+        self.items.clear()
+        self._occupied = 0
+        self._count = 0
+
     def resize(self, column_count: int):
         """Change number of columns. This action is destructive and will delete overflowing items."""
         if column_count < 1:
@@ -25,46 +69,64 @@ class Row:
 
         self._max_items = column_count
         self.items = self.items[:column_count:]
+        self._occupied &= (1 << column_count) - 1
+        self._count = self._occupied.bit_count()
 
     def fill_columns(self, max_items_per_row):
         self._max_items = max_items_per_row
-
-        for column_n in range(0, max_items_per_row):
-            self.items.append(self.placeholder_item_class())
+        self.items.extend([self.placeholder] * max_items_per_row)
 
     def get_column_length(self) -> int:
-        return len([x for x in self.items if isinstance(x, self.item_class)])
+        return self._count
 
     def is_column_free(self, column: int) -> bool:
-        item = self.items[column]
-        return isinstance(item, self.placeholder_item_class)
+        column = self._normalize_column(column)
+        return not self._occupied >> column & 1
 
     def has_free_space(self) -> bool:
-        if self._max_items > len(self.get_all_valid_items()):
-            return True
-        else:
-            return False
+        return self._max_items > self._count
 
-    def get_free_spaces(self) -> list[int]:
-        free_cols: list[int] = []
+    def get_next_free_column(self) -> int | None:
+        """Return the lowest free column or None if the row is full."""
+        # lowest unset bit of the mask
+        column = (~self._occupied & (self._occupied + 1)).bit_length() - 1
 
-        for index, item in enumerate(self.items):
-            if not isinstance(item, self.item_class):
-                free_cols.append(index)
+        if column >= min(self._max_items, len(self.items)):
+            return None
+
+        return column
 
-        return free_cols
+    def get_free_spaces(self) -> list[int]:
+        return [index for index in range(len(self.items)) if not self._occupied >> index & 1]
 
     def has_items(self) -> bool:
-        return len(self.get_all_valid_items()) > 0
+        return self._count > 0
 
     def get_all_valid_items(self) -> list[item_class]:
         items = []
+        occupied = self._occupied
 
-        for item in self.items:
-            if isinstance(item, self.item_class):
-                items.append(item)
+        while occupied:
+            lowest_bit = occupied & -occupied
+            items.append(self.items[lowest_bit.bit_length() - 1])
+            occupied ^= lowest_bit
 
         return items
 
     def is_valid_item(self, item) -> bool:
         return not isinstance(item, self.placeholder_item_class)
+
+    def _normalize_column(self, column: int) -> int:
+        if not -len(self.items) <= column < len(self.items):
+            raise IndexError(f"Column at index '{column}' does not exist!")
+
+        return column % len(self.items)
+
+    def _sync_occupancy(self):
+        self._occupied = 0
+
+        for index, item in enumerate(self.items):
+            if self.is_valid_item(item):
+                self._occupied |= 1 << index
+
+        self._count = self._occupied.bit_count()
@@ -0,0 +1,158 @@
+"""Append-only log of session mutations, replayed over saved containers on startup"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import pathlib
+
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from storage.util import fsync_file, lock_file
+
+
+class OperationLog:
+    """JSON lines file of session method calls that changed the inventory - one {"op": name, "kwargs": {...}}
+    record per line. Appending a record is much cheaper than rewriting a whole container file,
+    containers only get rewritten when the log is compacted.
+    The log is shared by every process using the directory, writes to it hold its lock."""
+    file_name: str = '.operations.jsonl'
+
+    def __init__(self, path, fsync: bool = True):
+        self.path = pathlib.Path(path)
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self.fsync = fsync
+        # size of the log up to which its records are known to this process - read by it or appended by it,
+        # None until the log is first read
+        self.known_size: int | None = None
+
+        self._is_locked: bool = False
+        self._buffer: list[str] | None = None
+
+    @contextmanager
+    def lock(self):
+        """Hold lock of the log for the duration of the block, blocks nested within it don't lock it again."""
+        if self._is_locked:
+            yield
+            return
+
+        with lock_file(self.lock_path):
+            self._is_locked = True
+
+            try:
+                yield
+            finally:
+                self._is_locked = False
+
+    @contextmanager
+    def buffered(self):
+        """Keep records appended within the block in memory, and append all of them at once when it ends.
+        Records of a block interrupted by an exception are discarded. A block nested within another one
+        is part of the outer one."""
+        if self._buffer is not None:
+            yield
+            return
+
+        self._buffer = []
+
+        try:
+            yield
+            lines, self._buffer = self._buffer, None
+            self._write(lines)
+        finally:
+            self._buffer = None
+
+    def append(self, operation: str, encoded_kwargs: str):
+        line = f'{{"op": {json.dumps(operation)}, "kwargs": {encoded_kwargs}}}\n'
+
+        if self._buffer is not None:
+            self._buffer.append(line)
+        else:
+            self._write([line])
+
+    def is_up_to_date(self) -> bool:
+        """Return False if the log may contain records appended by another process this one doesn't know of."""
+        return self.known_size is not None and self.known_size == self.get_size()
+
+    def _write(self, lines: list[str]):
+        if not lines:
+            return
+
+        with self.lock(), open(self.path, 'a') as file:
+            size = os.fstat(file.fileno()).st_size
+            file.writelines(lines)
+            file.flush()
+
+            if self.fsync:
+                os.fsync(file.fileno())
+
+            # records appended by others in the meantime stay unknown
+            if size == self.known_size:
+                self.known_size = os.fstat(file.fileno()).st_size
+
+    def read(self) -> Iterator[dict]:
+        """Yield logged records in order. A record cut short by a crash can only be the last one, it is skipped.
+        Records are only known to this process once all of them are read, which should be done holding the lock."""
+        try:
+            file = open(self.path, 'r')
+        except FileNotFoundError:
+            self.known_size = 0
+            return
+
+        with file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+
+            self.known_size = file.tell()
+
+    def clear(self):
+        with self.lock():
+            with open(self.path, 'w'):
+                pass
+
+            if self.fsync:
+                fsync_file(self.path)
+
+            self.known_size = 0
+
+    def get_size(self) -> int:
+        """Size of the log in bytes."""
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def __len__(self) -> int:
+        try:
+            with open(self.path, 'rb') as file:
+                return sum(1 for _ in file)
+        except FileNotFoundError:
+            return 0
+
+
+def logged_operation(method: Callable) -> Callable:
+    """Record session method call in the operation log of the session, once the call succeeds.
+    Arguments are encoded before the call, as methods are free to change passed tags in place."""
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.use_operation_log or self.is_replaying:
+            return method(self, *args, **kwargs)
+
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        arguments.pop('self')
+        arguments.update(arguments.pop('kwargs', {}))
+        encoded_kwargs = json.dumps(arguments, default=str)
+
+        result = method(self, *args, **kwargs)
+        self.operation_log.append(method.__name__, encoded_kwargs)
+        return result
+
+    return wrapper
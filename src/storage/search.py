@@ -1,9 +1,11 @@
 """Search and filter items through positional and keyword tags"""
 
+from __future__ import annotations
+
 from dataclasses import dataclass, field
-from typing import Callable
+from typing import Callable, Iterable, Iterator
 
-from storage.const import SearchMode, ITEM, DICT_ITEMS
+from storage.const import SearchMode, ITEM
 from storage.util import split_op_value_into_strings, split_range_value_into_strings
 
 
@@ -29,109 +31,144 @@ class SearchResult:
         return f"{self.item_ref.get_location_readable_format()} (Matched Tags: {self.len_of_matches()})"
 
 
-class Searcher:
-    def __init__(self, query: SearchQuery, items: list[ITEM]):
-        self.query = query
-        self.items = items
-
-    def search_through_items(self, tags_positionals: list[str], tags_keywords: dict,
-                             tags_comparison: list[str]) -> list:
-        valid_items = []
-
-        for item in self.items:
-            search_result = None
-            vals = item.tags.items()
-
-            keyword_matches = self.get_matching_keywords(vals, tags_keywords)
-            positional_matches = self.get_matching_positionals(vals, tags_positionals)
-            comparison_matches = self.get_matching_comparisons(vals, tags_comparison)
-
-            if self.query.mode == SearchMode.ANY:
-                if any((keyword_matches, positional_matches, comparison_matches)):
-                    search_result = SearchResult(item_ref=item, query=self.query)
-                    search_result.matched_positionals = positional_matches
-                    search_result.matched_keywords = keyword_matches
-                    search_result.matched_comparisons = comparison_matches
-            elif self.query.mode == SearchMode.ALL:
-                search_result = SearchResult(item_ref=item, query=self.query)
-                search_result.matched_positionals = positional_matches
-                search_result.matched_keywords = keyword_matches
-                search_result.matched_comparisons = comparison_matches
-
-                if not self.all_tags_matched(search_result, tags_positionals, tags_keywords, comparison_matches):
-                    search_result = None
-
-            if search_result:
-                valid_items.append(search_result)
-
-        return valid_items
-
-    def get_matching_keywords(self, item_tags: DICT_ITEMS, tags_keywords: dict) -> dict:
-        """Return shared tags between item_tags (dict_items) and passed tags_keywords arg (dict)"""
-        tags_keywords = self._normalize_dict_values(tags_keywords)
-        return {item[0]: item[1] for item in item_tags
-                if item in tags_keywords.items()}
-
-    def get_matching_positionals(self, item_tags: DICT_ITEMS, tags_positionals: list[str]) -> list[str]:
-        """Return a list of shared strings (key or value) between the item_tags (dict_items)
-        and tags_positionals (list[str])"""
-        matched_positionals: list[str] = []
-
-        for k, v in item_tags:
-            k = str(k)
-            v = str(v)
-
-            if k in tags_positionals:
-                matched_positionals.append(k)
-
-            elif v in tags_positionals:
-                matched_positionals.append(v)
-
-        return matched_positionals
+@dataclass
+class CompiledComparison:
+    """Comparison tag ('count<10', 'count=10-50') parsed once into its key, operator and numeric bounds."""
+    tag: str
+    key: str
+    operator: str
+    bounds: tuple
+    compare: Callable = field(repr=False, compare=False)
+
+    @classmethod
+    def from_tag(cls, tag: str) -> CompiledComparison:
+        key, value, operator = split_op_value_into_strings(tag)
+
+        if '-' in value:
+            operator = '-'
+            bounds = split_range_value_into_strings(value)
+        else:
+            bounds = (int(value) if value.isdigit() else value,)
+
+        return cls(tag, key, operator, bounds, OperatorHandler().op_mapping[operator])
+
+    def matches(self, item_value) -> bool:
+        if isinstance(item_value, str):
+            if not item_value.isdigit():
+                return False
+            item_value = int(item_value)
 
-    def get_matching_comparisons(self, item_tags: DICT_ITEMS, tags_comparison: list[str]) -> list[str]:
-        """Return a list of shared strings (key or value) between the item_tags (dict_items)
-        and tags_positionals (list[str])"""
-        matched_comparisons: list[str] = []
+        try:
+            return self.compare(item_value, *self.bounds)
+        except TypeError:
+            return False
 
-        for item in item_tags:
-            for tag in tags_comparison:
-                key, value, operator = split_op_value_into_strings(tag)
-                item_key, item_val = item[0], item[1]
 
-                if item_key == key:
-                    op_handler = OperatorHandler()
+@dataclass
+class CompiledQuery:
+    """Search query compiled once from tags passed to 'find' - positional tags as a frozen set, keyword values
+    normalized and comparison tags pre-parsed, so matching an item involves no string parsing."""
+    query: SearchQuery
+    positionals: frozenset[str]
+    keywords: dict
+    comparisons: tuple[CompiledComparison, ...]
+    comparisons_by_key: dict[str, list[CompiledComparison]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.comparisons_by_key = {}
+        for comparison in self.comparisons:
+            self.comparisons_by_key.setdefault(comparison.key, []).append(comparison)
+
+    @property
+    def mode(self) -> SearchMode:
+        return self.query.mode
+
+    @classmethod
+    def compile(cls, query: SearchQuery, tags_positionals: list[str], tags_keywords: dict,
+                tags_comparison: list[str]) -> CompiledQuery:
+        return cls(query=query,
+                   positionals=frozenset(tags_positionals),
+                   keywords=cls._normalize_dict_values(tags_keywords),
+                   comparisons=tuple(CompiledComparison.from_tag(tag) for tag in tags_comparison))
+
+    def match(self, item: ITEM, comparison_matches: list[str] | None = None) -> SearchResult | None:
+        """Return SearchResult if item matches the query or None otherwise.
+        Comparison tags the item is already known to match can be passed in, so that they aren't evaluated again."""
+        positional_matches: list[str] = []
+        keyword_matches: dict = {}
+        comparisons_by_key = self.comparisons_by_key if comparison_matches is None else {}
+        comparison_matches = [] if comparison_matches is None else comparison_matches
+
+        for k, v in item.tags.items():
+            if k in self.keywords and self.keywords[k] == v:
+                keyword_matches[k] = v
+
+            str_k = str(k)
+            if str_k in self.positionals:
+                positional_matches.append(str_k)
+            else:
+                str_v = str(v)
+                if str_v in self.positionals:
+                    positional_matches.append(str_v)
+
+            for comparison in comparisons_by_key.get(k, ()):
+                if comparison.matches(v):
+                    comparison_matches.append(comparison.tag)
+
+        if self.query.mode == SearchMode.ANY:
+            if not (keyword_matches or positional_matches or comparison_matches):
+                return None
+        elif self.query.mode == SearchMode.ALL:
+            if not self._all_tags_matched(positional_matches, keyword_matches, comparison_matches):
+                return None
+
+        search_result = SearchResult(item_ref=item, query=self.query)
+        search_result.matched_positionals = positional_matches
+        search_result.matched_keywords = keyword_matches
+        search_result.matched_comparisons = comparison_matches
+
+        return search_result
+
+    def _all_tags_matched(self, positional_matches: list[str], keyword_matches: dict,
+                          comparison_matches: list[str]) -> bool:
+        # a positional tag matching several tags of the item still counts once
+        return len(set(positional_matches)) == len(self.positionals) \
+            and len(keyword_matches) == len(self.keywords) \
+            and len(comparison_matches) == len(self.comparisons)
+
+    @staticmethod
+    def _normalize_dict_values(tags_keywords: dict) -> dict:
+        """Turn any occurring digit string values into actual ints"""
+        normalized = {}
 
-                    if '-' in value:
-                        range_a, range_b = split_range_value_into_strings(value)
-                        match = op_handler.get_result('-', item_val, range_a, range_b)
-                    else:
-                        match = op_handler.get_result(operator, item_val, value)
+        for k, v in tags_keywords.items():
+            if isinstance(v, str) and v.isdigit():
+                v = int(v)
+            normalized[k] = v
 
-                    if match:
-                        matched_comparisons.append(tag)
+        return normalized
 
-        return matched_comparisons
 
-    def all_tags_matched(self, search_result: SearchResult, positional_tags: list[str], keyword_tags: dict,
-                         comparison_tags: list[str]) -> bool:
+class Searcher:
+    def __init__(self, query: SearchQuery, items: Iterable[ITEM]):
+        self.query = query
+        self.items = items
 
-        all_positionals_matched: bool = len(search_result.matched_positionals) == len(positional_tags)
-        all_keywords_matched: bool = len(search_result.matched_keywords) == len(keyword_tags)
-        all_comparisons_matched: bool = len(search_result.matched_comparisons) == len(comparison_tags)
+    def search_through_items(self, tags_positionals: list[str], tags_keywords: dict,
+                             tags_comparison: list[str]) -> list:
+        compiled_query = CompiledQuery.compile(self.query, tags_positionals, tags_keywords, tags_comparison)
+        return self.run_compiled_query(compiled_query)
 
-        return all_positionals_matched + all_keywords_matched + all_comparisons_matched > 2
+    def run_compiled_query(self, compiled_query: CompiledQuery) -> list:
+        return list(self.iter_compiled_query(compiled_query))
 
-    def _normalize_dict_values(self, tags_keywords: dict) -> dict:
-        """Turn any occurring digit string values into actual ints"""
-        for k, v in tags_keywords.items():
-            try:
-                if v.isdigit():
-                    tags_keywords[k] = int(v)
-            except AttributeError:
-                continue
+    def iter_compiled_query(self, compiled_query: CompiledQuery) -> Iterator[SearchResult]:
+        """Yield search results one by one as matching items are found"""
+        for item in self.items:
+            search_result = compiled_query.match(item)
 
-        return tags_keywords
+            if search_result:
+                yield search_result
 
 
 class OperatorHandler:
@@ -0,0 +1,81 @@
+"""Daemon keeping a single session loaded in memory and running commands sent over a Unix domain socket"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import pathlib
+import signal
+import socket
+import socketserver
+
+from contextlib import redirect_stdout, redirect_stderr
+from typing import Callable
+
+from storage.client import SOCKET_PATH
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    """Reads a single {"lines": [...]} request and answers with {"stdout", "stderr", "code"} of its commands."""
+    server: StorageServer
+
+    def handle(self):
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                request = json.loads(self.rfile.readline())
+                failed = self.server.run_lines(request['lines'])
+            except Exception as error:
+                print(f"storage: {error!r}", file=stderr)
+                failed = 1
+
+        response = {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'code': 1 if failed else 0}
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class StorageServer(socketserver.UnixStreamServer):
+    """Requests are handled one at a time, so commands never run concurrently against the session.
+    run_lines runs command lines the same way 'storage batch' does and returns number of failed commands."""
+
+    def __init__(self, run_lines: Callable[[list[str]], int], socket_path=SOCKET_PATH):
+        self.run_lines = run_lines
+        self.socket_path = pathlib.Path(socket_path)
+
+        self._remove_stale_socket()
+        super().__init__(str(self.socket_path), CommandHandler)
+
+    def serve_until_stopped(self):
+        """Serve until interrupted or terminated, the socket file is removed afterwards."""
+        signal.signal(signal.SIGTERM, self._raise_keyboard_interrupt)
+
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server_close()
+
+    def server_close(self):
+        super().server_close()
+
+        if self.socket_path.exists():
+            os.remove(self.socket_path)
+
+    def _remove_stale_socket(self):
+        """Socket file left behind by a daemon that didn't exit cleanly is removed, a live one is not."""
+        if not self.socket_path.exists():
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(self.socket_path))
+            except ConnectionRefusedError:
+                os.remove(self.socket_path)
+            else:
+                raise OSError(f"Another daemon is already listening on '{self.socket_path}'!")
+
+    @staticmethod
+    def _raise_keyboard_interrupt(*args):
+        raise KeyboardInterrupt
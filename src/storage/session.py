@@ -1,53 +1,359 @@
 """Single program instance, initialized upon """
 
-from storage.search import SearchQuery, Searcher
-from storage.sorter import sort_items
+import io
+import json
+import pathlib
+import sys
+
+from contextlib import contextmanager, redirect_stdout
+from typing import Iterable, Iterator
+
+from storage import vectorized, importer
+from storage.search import SearchQuery, SearchResult, Searcher, CompiledQuery
+from storage.tag_index import InventoryIndex, TagIndex
+from storage.sorter import iter_sorted_items
 from storage.data_manager import JSONDataManager
-from storage.const import ComponentType, SearchMode
+from storage.operation_log import OperationLog, logged_operation
+from storage.const import ComponentType, SearchMode, ITEM, LOAD_WORKERS, OPERATION_LOG_MAX_RECORDS, IMPORT_BATCH_SIZE
 
 from storage.items.container import Container
 from storage.items.drawer import Drawer
 from storage.items.component import Component
 
-from storage.cli.exceptions import ContainerNotFoundError, ItemIsNotEmptyError
+from storage.cli.exceptions import StorageBaseException, ContainerNotFoundError, ItemIsNotEmptyError, \
+    SearchEngineNotAvailableError
 from storage.cli.printer import Printer
+from storage.validator import Prompter
 
 
 class Session:
     """Session is a program instance that handles data-processing tasks."""
 
-    def __init__(self, data_manager=JSONDataManager):
+    def __init__(self, data_manager=JSONDataManager, use_operation_log: bool = False):
         self.data_manager = data_manager()
-        self.containers: list[Container] = []
-
-    def load_container_data_from_file(self):
+        self._containers: list[Container] = []
+        self._containers_by_name: dict[str, Container] = {}
+        self._unloaded_containers: dict[str, None] = {}
+        self._dirty_containers: dict[int, Container] = {}
+        self.tag_index = InventoryIndex()
+        self.numeric_columns = vectorized.InventoryColumns()
+
+        # with operation log in use, changes are logged and container files only rewritten on compaction
+        self.use_operation_log = use_operation_log
+        self._operation_log: OperationLog | None = None
+        self.is_replaying: bool = False
+        self._pending_deletions: set[str] = set()
+        self._deferred_saves_depth: int = 0
+        # with autosave off, changes are only written by an explicit call to write_pending_changes()
+        self.autosave: bool = True
+        # a session running a single query scans items directly, building tag indexes first would cost more
+        self.use_tag_index: bool = True
+        # id -> (container, its data encoded as JSON) of containers accessed within the current transaction,
+        # None outside of one
+        self._transaction_backups: dict[int, tuple[Container, str | None]] | None = None
+
+    @property
+    def operation_log(self) -> OperationLog:
+        """Operation log of the current container directory of the data manager."""
+        path = pathlib.Path(self.data_manager.container_path).joinpath(OperationLog.file_name)
+
+        if self._operation_log is None or self._operation_log.path != path:
+            self._operation_log = OperationLog(path)
+
+        return self._operation_log
+
+    @property
+    def containers(self) -> list[Container]:
+        """All containers of the session, containers only listed by the manifest get loaded on first access."""
+        if self._unloaded_containers:
+            self._load_remaining_containers()
+
+        return self._containers
+
+    @containers.setter
+    def containers(self, containers: list[Container]):
+        self._containers = containers
+        self._containers_by_name = {container.name: container for container in containers}
+        self._unloaded_containers.clear()
+
+    def load_container_data_from_file(self, workers: int = 0):
+        """Load every saved container at once. Files are read by a pool of given number of workers if it's above 1."""
         Printer.silent = True
 
         self.containers = []
-        container_data = self.data_manager.load_all_container_data_from_save_directory()
+        container_data = self.data_manager.load_all_container_data_from_save_directory(workers)
 
         for data in container_data:
-            drawers = data.pop('drawers')
-
-            new_container = Container(**data)
-
-            for drawer in drawers:
-                new_container.add_drawer(**drawer)
-
-            self.containers.append(new_container)
+            self._containers.append(self._build_container(data))
 
+        self._containers_by_name = {container.name: container for container in self._containers}
+        self._dirty_containers.clear()
         Printer.silent = False
 
-    def save_container_file_and_resync(self, container: Container):
-        self.data_manager.save_data_to_file(container)
-        self.load_container_data_from_file()
+    def load_container_manifest(self):
+        """Only read names of saved containers, each container is loaded when it is first accessed."""
+        self.containers = []
+        self._dirty_containers.clear()
+        self._unloaded_containers = dict.fromkeys(self.data_manager.get_container_names())
+
+    def is_container_loaded(self, name: str) -> bool:
+        return name in self._containers_by_name and name not in self._unloaded_containers
+
+    def mark_container_as_dirty(self, container: Container):
+        """Schedule container to be written on the next save. In-memory objects remain the source of truth."""
+        self._dirty_containers[id(container)] = container
+        self.tag_index.invalidate(container)
+        self.numeric_columns.invalidate(container)
+
+    def is_container_dirty(self, container: Container) -> bool:
+        return id(container) in self._dirty_containers
+
+    def discard_pending_changes(self):
+        """Drop every container changed or deleted since the last write, so that each one is loaded from its file
+        again on next access. Lets the session recover from a write that failed, e.g. on a version conflict."""
+        for container in list(self._dirty_containers.values()):
+            self._unload_container(container)
+
+        for name in self._pending_deletions:
+            if self.data_manager.container_exists(name):
+                self._unloaded_containers[name] = None
+
+        self._dirty_containers.clear()
+        self._pending_deletions.clear()
+
+    def reload_changed_containers(self):
+        """Drop loaded containers whose files were changed or deleted by another process, and list containers
+        saved by other processes since, so that all of them get loaded on next access. Changed containers
+        not written yet are kept."""
+        self.data_manager.reload_manifest()
+
+        for container in list(self._containers):
+            if not self.is_container_dirty(container) and self.data_manager.is_container_file_changed(container.name):
+                self._unload_container(container)
+
+        for name in self.data_manager.get_container_names():
+            if name not in self._containers_by_name and name not in self._pending_deletions:
+                self._unloaded_containers[name] = None
+
+    def _unload_container(self, container: Container):
+        self._containers[:] = [loaded for loaded in self._containers if loaded is not container]
+
+        if self._containers_by_name.get(container.name) is container:
+            del self._containers_by_name[container.name]
+
+        self.tag_index.invalidate(container)
+        self.numeric_columns.invalidate(container)
+
+        if self.data_manager.container_exists(container.name):
+            self._unloaded_containers[container.name] = None
+
+    def save_dirty_containers(self):
+        """Write every container modified since the last save, leaving the rest of the save directory untouched."""
+        with self.data_manager.batch_writes():
+            for container in self._dirty_containers.values():
+                self.data_manager.save_data_to_file(container)
+
+        self._dirty_containers.clear()
+
+    def save_container_file(self, container: Container):
+        self.mark_container_as_dirty(container)
+
+        if not self.are_saves_deferred:
+            self.save_dirty_containers()
+
+    @property
+    def are_saves_deferred(self) -> bool:
+        return self.use_operation_log or self.is_replaying or self._deferred_saves_depth > 0 or not self.autosave
+
+    @contextmanager
+    def deferred_saves(self):
+        """Only mark changed containers as dirty within the block, and write all of them at once when it ends."""
+        self._deferred_saves_depth += 1
+
+        try:
+            yield
+        finally:
+            self._deferred_saves_depth -= 1
+
+            if not self.are_saves_deferred:
+                self.write_pending_changes()
+
+    @contextmanager
+    def transaction(self):
+        """Only apply changes in memory within the block and write every touched container once, when it ends.
+        If the block or the final write raises, changes are rolled back instead - containers are restored to the
+        state they were in when the transaction first accessed them, created ones are dropped and their operations
+        never logged. Items obtained within a rolled back transaction should no longer be used.
+        A transaction started within another one is part of the outer one."""
+        if self._transaction_backups is not None:
+            yield
+            return
+
+        self._transaction_backups = {}
+        dirty_containers = dict(self._dirty_containers)
+        pending_deletions = set(self._pending_deletions)
+        self._deferred_saves_depth += 1
+
+        try:
+            try:
+                # operations are only logged once the whole transaction succeeds
+                with self.operation_log.buffered():
+                    yield
+            finally:
+                self._deferred_saves_depth -= 1
+
+            if not self.are_saves_deferred:
+                self.write_pending_changes()
+        except BaseException:
+            self._roll_back_transaction(dirty_containers, pending_deletions)
+            raise
+        finally:
+            self._transaction_backups = None
+
+    def _back_up_container(self, container: Container, is_created: bool = False):
+        """Remember state of container accessed within a transaction, created containers are remembered
+        without any data, as they are dropped on rollback."""
+        if self._transaction_backups is not None and id(container) not in self._transaction_backups:
+            # encoding copies tags shared with the items along, and is several times faster than a deep copy
+            self._transaction_backups[id(container)] = container, None if is_created else \
+                json.dumps(container.to_json())
+
+    def _roll_back_transaction(self, dirty_containers: dict[int, Container], pending_deletions: set[str]):
+        created = [container for container, data in self._transaction_backups.values() if data is None]
+        restored: dict[int, Container] = {}
+        silent = Printer.silent
+        Printer.silent = True
+
+        try:
+            for container_id, (_, data) in self._transaction_backups.items():
+                if data is not None:
+                    restored[container_id] = self._build_container(json.loads(data))
+        finally:
+            Printer.silent = silent
+
+        created_ids = {id(container) for container in created}
+        containers = [restored.get(id(container), container) for container in self._containers
+                      if id(container) not in created_ids]
+        # containers deleted within the transaction
+        in_list = {id(container) for container in containers}
+        containers.extend(container for container in restored.values() if id(container) not in in_list)
+
+        self._containers[:] = containers
+        self._containers_by_name = {container.name: container for container in self._containers}
+        self._pending_deletions = pending_deletions
+        self._dirty_containers = {}
+
+        for container_id, container in dirty_containers.items():
+            container = restored.get(container_id, container)
+            self._dirty_containers[id(container)] = container
+
+        # saved containers overwritten by a created one get loaded from their files again
+        for container in created:
+            if container.name not in self._containers_by_name and container.name not in pending_deletions \
+                    and self.data_manager.container_exists(container.name):
+                self._unloaded_containers[container.name] = None
+
+    def take_pending_changes(self, name: str, *containers: Container) -> tuple[list[Container], set[str]]:
+        """Return those of given containers changed since the last write, and the name if its file was deleted
+        since then, which are then no longer pending - the caller becomes responsible for writing them.
+        Changes of other containers stay pending."""
+        changed = [container for container in containers
+                   if self._dirty_containers.pop(id(container), None) is not None]
+        deletions = {name} & self._pending_deletions
+        self._pending_deletions -= deletions
+        return changed, deletions
+
+    def write_pending_changes(self):
+        """Delete files of containers deleted and write every container changed since the last write,
+        all as a single batch of writes."""
+        self.write_changes(self._dirty_containers.values(), self._pending_deletions)
+        self._dirty_containers.clear()
+        self._pending_deletions.clear()
+
+    def write_changes(self, containers: Iterable[Container], deletions: Iterable[str]):
+        with self.data_manager.batch_writes():
+            for name in deletions:
+                if self.data_manager.container_exists(name):
+                    self.data_manager.delete_container_file(name)
+
+            for container in containers:
+                self.data_manager.save_data_to_file(container)
+
+    def replay_operation_log(self) -> int:
+        """Re-apply logged operations over saved containers, returns number of replayed records.
+        Records failing to apply are skipped - they can only come from a compaction interrupted after writing
+        container files, which already contain their changes. The log is compacted right away if the session
+        doesn't use it, so that turning the log off never loses logged changes."""
+        with self.operation_log.lock():
+            count = self._apply_operation_log()
+
+            if count > OPERATION_LOG_MAX_RECORDS or (count and not self.use_operation_log):
+                self.compact_operation_log()
+
+        return count
+
+    def compact_operation_log(self):
+        """Fold logged operations into container files and start a new, empty log. The log stays locked
+        throughout, so that operations logged by other processes are never cleared without being written."""
+        with self.operation_log.lock():
+            if not self.operation_log.is_up_to_date():
+                # the log has records this session hasn't applied, start over from saved containers
+                self.discard_pending_changes()
+                self._apply_operation_log()
+
+            self.write_pending_changes()
+            self.operation_log.clear()
+
+    def _apply_operation_log(self) -> int:
+        count = 0
+        silent = Printer.silent
+        Printer.silent = True
+        # only confirmed changes get logged, declined ones raise
+        assume_yes = Prompter.assume_yes
+        Prompter.assume_yes = True
+        self.is_replaying = True
+
+        try:
+            with self.operation_log.lock(), redirect_stdout(io.StringIO()):
+                for record in self.operation_log.read():
+                    count += 1
+
+                    try:
+                        getattr(self, record['op'])(**record['kwargs'])
+                    except StorageBaseException:
+                        continue
+        finally:
+            self.is_replaying = False
+            Prompter.assume_yes = assume_yes
+            Printer.silent = silent
+
+        return count
+
+    def _delete_container_file(self, name: str):
+        if self.are_saves_deferred:
+            self._pending_deletions.add(name)
+        else:
+            self.data_manager.delete_container_file(name)
 
+    @logged_operation
     def create_container(self, name: str, rows: int, columns: int, drawer_compartments: int = 3, tags=None,
                          **kwargs) -> Container:
         tags = {} if tags is None else tags
         tags.update({'name': name})
         new_container = Container(name, rows, columns, compartments_per_drawer=drawer_compartments, tags=tags)
-        self.save_container_file_and_resync(new_container)
+
+        # a container of the same name gets overwritten, same as its save file
+        self._unloaded_containers.pop(name, None)
+
+        for container in self._containers:
+            if container.name == name:
+                self._back_up_container(container)
+
+        self._containers[:] = [container for container in self._containers if container.name != name]
+        self._containers.append(new_container)
+        self._containers_by_name[name] = new_container
+        self._back_up_container(new_container, is_created=True)
+        self.save_container_file(new_container)
 
         out = Printer.get_message("ADD_SUCCESS", verbosity=1, name=new_container.name, item='container')
         if out:
@@ -55,41 +361,51 @@ class Session:
 
         return new_container
 
+    @logged_operation
     def delete_container(self, name: str, forced=False, **kwargs):
         container_to_del = self.get_container_by_name(name)
 
         if (len(container_to_del.drawers) == 0) + forced > 0:
-            self.data_manager.delete_container_file(name)
-            self.containers.remove(container_to_del)
+            self._delete_container_file(name)
+            self._containers.remove(container_to_del)
+            self._containers_by_name.pop(name, None)
+            self._dirty_containers.pop(id(container_to_del), None)
 
             out = Printer.get_message("DEL_SUCCESS", verbosity=1, name=container_to_del.name, item='container')
             print(out)
         else:
             raise ItemIsNotEmptyError(name=name, item='container', reason='because it has child drawers!')
 
+    @logged_operation
     def clear_container(self, name: str, **kwargs):
         container_to_clear = self.get_container_by_name(name)
         container_to_clear.clear_container()
+        self.save_container_file(container_to_clear)
 
+    @logged_operation
     def create_drawer(self, name: str, container: str, row: int = -1, column: int = -1, tags=None, **kwargs) -> Drawer:
         container = self.get_container_by_name(container)
         tags = {} if tags is None else tags
         tags.update({'name': name})
         new_drawer = container.add_drawer(name, int(row), int(column), tags)
-        self.save_container_file_and_resync(container)
+        self.save_container_file(container)
 
         return new_drawer
 
+    @logged_operation
     def delete_drawer(self, name: str, container: str, forced=False, **kwargs):
         container = self.get_container_by_name(container)
         container.remove_drawer_by_name(name, forced)
-        self.save_container_file_and_resync(container)
+        self.save_container_file(container)
 
+    @logged_operation
     def clear_drawer(self, name: str, container: str, **kwargs):
         container = self.get_container_by_name(container)
         drawer_to_clear = container.get_drawer_by_name(name)
         drawer_to_clear.clear_drawer()
+        self.save_container_file(container)
 
+    @logged_operation
     def create_component(self, name: str, count, type: str, container: str,
                          drawer: str, compartment: int = -1, tags=None, **kwargs) -> Component:
         container = self.get_container_by_name(container)
@@ -99,22 +415,51 @@ class Session:
         tags = {} if tags is None else tags
         tags.update({'name': name, 'count': count, 'type': type})
         new_component = drawer.add_component(name, type, tags, int(count), compartment)
-        self.save_container_file_and_resync(container)
+        self.save_container_file(container)
 
         return new_component
 
+    @logged_operation
     def delete_component(self, name: str, drawer: str, container: str, **kwargs):
         container = self.get_container_by_name(container)
         drawer = container.get_drawer_by_name(drawer)
         drawer.remove_component_by_name(name)
-        self.save_container_file_and_resync(container)
+        self.save_container_file(container)
+
+    def import_components(self, file: str, format: str | None = None, batch_size: int = IMPORT_BATCH_SIZE,
+                          **kwargs) -> importer.ImportResult:
+        """Create components listed by a CSV or JSON lines file, one per row. Rows are read one at a time and
+        committed in batches, rows failing to import are reported and skipped."""
+        file_format = importer.get_file_format(file, format)
+        silent = Printer.silent
+        Printer.silent = True
+
+        try:
+            with open(file, 'r', newline='') as rows_file:
+                result = importer.import_components(self, importer.read_rows(rows_file, file_format), batch_size)
+        finally:
+            Printer.silent = silent
+
+        print(f"Imported {result.imported} components, {result.failed} rows failed")
+        return result
 
     def get_container_by_name(self, name: str, **kwargs) -> Container:
-        for container in self.containers:
-            if container.name == name:
-                return container
+        container = self._containers_by_name.get(name)
+
+        # containers list may have been changed directly or a container renamed, rebuild the index in that case
+        if container is None or container.name != name \
+                or not any(loaded is container for loaded in self._containers):
+            self._containers_by_name = {container.name: container for container in self._containers}
+            container = self._containers_by_name.get(name)
+
+        if container is None and name not in self._pending_deletions and self.data_manager.container_exists(name):
+            container = self._load_container(name)
 
-        raise ContainerNotFoundError(name=name)
+        if container is None:
+            raise ContainerNotFoundError(name=name)
+
+        self._back_up_container(container)
+        return container
 
     def get_drawer_by_name(self, name: str, container: str, **kwargs) -> Drawer:
         container = self.get_container_by_name(container)
@@ -125,6 +470,23 @@ class Session:
         drawer = container.get_drawer_by_name(drawer)
         return drawer.get_component_by_name(name)
 
+    def get_item_by_path(self, path: str) -> Container | Drawer | Component:
+        """Resolve fully qualified 'container', 'container/drawer' or 'container/drawer/component' path."""
+        names = path.strip('/').split('/')
+
+        if len(names) > 3:
+            raise ValueError(f"'{path}' is not a valid item path!")
+
+        item = self.get_container_by_name(names[0])
+
+        if len(names) > 1:
+            item = item.get_drawer_by_name(names[1])
+
+        if len(names) > 2:
+            item = item.get_component_by_name(names[2])
+
+        return item
+
     def print_container_info(self, name: str, verbosity: int = 1, **kwargs):
         if name == '*':
             for container in self.containers:
@@ -142,91 +504,55 @@ class Session:
         print(component)
 
     def find_container(self, **kwargs):
-        tags_positional: list[str] = kwargs.get('tags_positional')
-        tags_comparison: list[str] = kwargs.get('tags_comparison')
-        tags_keywords: dict = kwargs.get('tags')
-        search_mode = SearchMode(kwargs.get('mode'))
-        max_count = self._get_max_count(kwargs)
-
-        query = SearchQuery(search_mode)
-        searcher = Searcher(query, self.containers)
-
-        items = searcher.search_through_items(tags_positional, tags_keywords, tags_comparison)
-        items = sort_items(items, kwargs.get('sort'), kwargs.get('reverse'))
-
-        if max_count > 0:
-            items = items[:max_count:]
-
-        self._print_search_results(items)
+        self._find_items('container', kwargs)
 
     def find_drawer(self, **kwargs):
-        tags_positional: list[str] = kwargs.get('tags_positional')
-        tags_comparison: list[str] = kwargs.get('tags_comparison')
-        tags_keywords: dict = kwargs.get('tags')
-        search_mode = SearchMode(kwargs.get('mode'))
-        max_count = self._get_max_count(kwargs)
-
-        if kwargs.get('container'):
-            container_name = kwargs.get('container')
-            container = self.get_container_by_name(container_name)
-
-            drawers = container.drawers
-        else:
-            all_drawers = [container.drawers for container in self.containers]
-            drawers = []
-            [drawers.extend(drawer_list) for drawer_list in all_drawers]
-
-        query = SearchQuery(search_mode)
-        searcher = Searcher(query, drawers)
-
-        items = searcher.search_through_items(tags_positional, tags_keywords, tags_comparison)
-        items = sort_items(items, kwargs.get('sort'), kwargs.get('reverse'))
-
-        if max_count > 0:
-            items = items[:max_count:]
-
-        self._print_search_results(items)
+        self._find_items('drawer', kwargs, kwargs.get('container'))
 
     def find_component(self, **kwargs):
-        tags_positional: list[str] = kwargs.get('tags_positional')
-        tags_comparison: list[str] = kwargs.get('tags_comparison')
-        tags_keywords: dict = kwargs.get('tags')
-        search_mode = SearchMode(kwargs.get('mode'))
-        max_count = self._get_max_count(kwargs)
-
-        if kwargs.get('container'):
-            container_name = kwargs.get('container')
-            container = self.get_container_by_name(container_name)
-
-            comps = container.get_all_components()
+        self._find_items('component', kwargs, kwargs.get('container'))
+
+    def search_items(self, item_type: str, **kwargs) -> list[SearchResult]:
+        """Same as find_container, find_drawer and find_component, with results returned instead of printed."""
+        container_name = kwargs.get('container') if item_type != 'container' else None
+        return list(self._search_items(item_type, kwargs, container_name))
+
+    def get_tag_index(self, item_type: str, container: Container | None = None) -> TagIndex:
+        """Return tag index of containers, drawers or components, up-to-date for a single container if one is given
+        or for all of them otherwise."""
+        if container is not None:
+            self.tag_index.refresh_container(container)
         else:
-            all_comps = [container.get_all_components() for container in self.containers]
-            comps = []
-            [comps.extend(comp_list) for comp_list in all_comps]
-
-        query = SearchQuery(search_mode)
-        searcher = Searcher(query, comps)
+            self.tag_index.refresh(self.containers)
 
-        items = searcher.search_through_items(tags_positional, tags_keywords, tags_comparison)
-        items = sort_items(items, kwargs.get('sort'), kwargs.get('reverse'))
+        return self.tag_index.get_index(item_type)
 
-        if max_count > 0:
-            items = items[:max_count:]
+    def get_numeric_columns(self, item_type: str, container: Container | None = None) -> list[vectorized.ColumnBlock]:
+        """Return up-to-date numeric tag columns of containers, drawers or components, of a single container
+        if one is given."""
+        if container is not None:
+            self.numeric_columns.refresh_container(container)
+            return self.numeric_columns.get_blocks(item_type, [container])
 
-        self._print_search_results(items)
+        self.numeric_columns.refresh(self.containers)
+        return self.numeric_columns.get_blocks(item_type, self.containers)
 
+    @logged_operation
     def update_container(self, **kwargs):
         container_name = kwargs.get('name')
         container = self.get_container_by_name(container_name)
 
         values_to_update: dict = kwargs.get('values')
-        print(values_to_update)
 
         for k, v in values_to_update.items():
             setattr(container, k, v)
 
-        self.save_container_file_and_resync(container)
+        self.save_container_file(container)
 
+        if container.name != container_name:
+            self._delete_container_file(container_name)
+
+    @logged_operation
     def update_drawer(self, **kwargs):
         container_name = kwargs.get('container')
         container = self.get_container_by_name(container_name)
@@ -238,8 +564,9 @@ class Session:
         for k, v in values_to_update.items():
             setattr(drawer, k, v)
 
-        self.save_container_file_and_resync(container)
+        self.save_container_file(container)
 
+    @logged_operation
     def update_component(self, **kwargs):
         container_name = kwargs.get('container')
         container = self.get_container_by_name(container_name)
@@ -253,7 +580,48 @@ class Session:
         for k, v in values_to_update.items():
             setattr(component, k, v)
 
-        self.save_container_file_and_resync(container)
+        self.save_container_file(container)
+
+    def _build_container(self, data: dict) -> Container:
+        drawers = data.pop('drawers')
+
+        new_container = Container(**data)
+
+        for drawer in drawers:
+            new_container.add_drawer(**drawer)
+
+        return new_container
+
+    def _load_container(self, name: str) -> Container:
+        silent = Printer.silent
+        Printer.silent = True
+
+        try:
+            container = self._build_container(self.data_manager.load_container_data(name))
+        finally:
+            Printer.silent = silent
+
+        self._unloaded_containers.pop(name, None)
+        self._containers.append(container)
+        self._containers_by_name[container.name] = container
+
+        return container
+
+    def _load_remaining_containers(self):
+        """Load every container not loaded yet, in one go - a single snapshot read when it is up to date."""
+        silent = Printer.silent
+        Printer.silent = True
+
+        try:
+            for data in self.data_manager.load_all_container_data_from_save_directory(LOAD_WORKERS):
+                if data['name'] in self._unloaded_containers:
+                    container = self._build_container(data)
+                    self._containers.append(container)
+                    self._containers_by_name[container.name] = container
+        finally:
+            Printer.silent = silent
+
+        self._unloaded_containers.clear()
 
     def _get_max_count(self, kwargs) -> int:
         count = kwargs.get('count')
@@ -262,5 +630,66 @@ class Session:
         else:
             return 0
 
-    def _print_search_results(self, items: list):
-        print(str(items).replace('[', '').replace(']', ''))
+    def _find_items(self, item_type: str, kwargs: dict, container_name: str | None = None):
+        self._print_search_results(self._search_items(item_type, kwargs, container_name))
+
+    def _search_items(self, item_type: str, kwargs: dict,
+                      container_name: str | None = None) -> Iterator[SearchResult]:
+        tags_positional: list[str] = kwargs.get('tags_positional')
+        tags_comparison: list[str] = kwargs.get('tags_comparison')
+        tags_keywords: dict = kwargs.get('tags')
+        search_mode = SearchMode(kwargs.get('mode'))
+        max_count = self._get_max_count(kwargs)
+
+        container = self.get_container_by_name(container_name) if container_name else None
+
+        query = SearchQuery(search_mode)
+        compiled_query = CompiledQuery.compile(query, tags_positional, tags_keywords, tags_comparison)
+
+        # lazy pipeline: index candidates -> matching -> sorting/top-k -> printing, results are yielded one by one
+        searcher = self._get_searcher(kwargs.get('engine'), item_type, compiled_query, container)
+
+        items = searcher.iter_compiled_query(compiled_query)
+        return iter_sorted_items(items, kwargs.get('sort'), kwargs.get('reverse'), max_count)
+
+    def _get_searcher(self, engine: str | None, item_type: str, compiled_query: CompiledQuery,
+                      container: Container | None = None) -> Searcher:
+        if engine == 'numpy':
+            if not vectorized.is_available():
+                raise SearchEngineNotAvailableError(name=engine, reason="as NumPy is not installed")
+
+            if compiled_query.comparisons:
+                blocks = self.get_numeric_columns(item_type, container)
+                return vectorized.VectorizedSearcher(compiled_query.query, blocks)
+
+        if not self.use_tag_index:
+            return Searcher(compiled_query.query, self._iter_items(item_type, container))
+
+        # narrow searched items down to those sharing at least one (any) or every (all) searched tag
+        index = self.get_tag_index(item_type, container)
+        candidates = index.iter_candidates(compiled_query, owner=container)
+
+        return Searcher(compiled_query.query, candidates)
+
+    def _iter_items(self, item_type: str, container: Container | None = None) -> Iterator[ITEM]:
+        """Yield containers, drawers or components of a single container or of all of them, in traversal order."""
+        for container in [container] if container is not None else self.containers:
+            if item_type == 'container':
+                yield container
+                continue
+
+            for drawer in container.drawers:
+                if item_type == 'drawer':
+                    yield drawer
+                else:
+                    yield from drawer.components
+
+    def _print_search_results(self, items: Iterable[SearchResult]):
+        """Write results out as they come, separated by commas."""
+        separator = ''
+
+        for item in items:
+            sys.stdout.write(f"{separator}{item!r}")
+            separator = ', '
+
+        sys.stdout.write('\n')
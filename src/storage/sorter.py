@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import heapq
+
 from abc import ABC, abstractmethod
-from typing import Literal
+from itertools import islice
+from typing import Literal, Iterable, Iterator
 
 from storage.const import ITEM
 from storage.search import SearchResult
@@ -17,13 +20,48 @@ def get_sorter(sorter_type: Literal['accuracy'] | str) -> Sorter:
             return TagValueSorter(sorter_type)
 
 
-def sort_items(items: list[ITEM], sorter_name: Literal['accuracy'] | str, reverse=False) -> list[ITEM]:
+def sort_items(items: list[ITEM], sorter_name: Literal['accuracy'] | str, reverse=False,
+               max_count: int = 0) -> list[ITEM]:
+    """Sort items in place. With max_count > 0 only the first max_count items are selected and returned."""
     reverse = True if sorter_name == 'accuracy' else False
     sorter = get_sorter(sorter_name)
+
+    if max_count > 0:
+        return get_top_items(items, sorter, max_count, reverse)
+
     items.sort(key=sorter, reverse=reverse)
     return items
 
 
+def iter_sorted_items(items: Iterable[ITEM], sorter_name: Literal['accuracy', 'none'] | str, reverse=False,
+                      max_count: int = 0) -> Iterator[ITEM]:
+    """Lazy counterpart of sort_items() used by the search pipeline.
+    'none' sorter passes items through as they come, max_count > 0 never holds more than max_count items
+    and only a full sort has to wait for all the items."""
+    if sorter_name in (None, 'none'):
+        yield from islice(items, max_count) if max_count > 0 else items
+    elif max_count > 0:
+        yield from stream_top_items(items, sorter_name, max_count)
+    else:
+        yield from sort_items(list(items), sorter_name, reverse)
+
+
+def stream_top_items(items: Iterable[ITEM], sorter_name: Literal['accuracy'] | str, max_count: int) -> list[ITEM]:
+    """Select first max_count items in sorted order from any iterable (e.g. a generator of search results)
+    without ever holding more than max_count of them in memory."""
+    reverse = True if sorter_name == 'accuracy' else False
+    return get_top_items(items, get_sorter(sorter_name), max_count, reverse)
+
+
+def get_top_items(items: Iterable[ITEM], sorter: Sorter, max_count: int, reverse=False) -> list[ITEM]:
+    """Heap-based top-k selection, same result as sorted(items, key=sorter, reverse=reverse)[:max_count]
+    in O(n log k) time instead of O(n log n)."""
+    if reverse:
+        return heapq.nlargest(max_count, items, key=sorter)
+
+    return heapq.nsmallest(max_count, items, key=sorter)
+
+
 class Sorter(ABC):
     @abstractmethod
     def __call__(self, search_result: SearchResult):
@@ -53,9 +91,7 @@ class TagValueSorter(Sorter):
             item_ref = search_result.item_ref
             value = item_ref.tags.get(self.tag_name, 9999)
         else:
-            print(search_result.tags)
             value = search_result.tags.get(self.tag_name, 9999)
-            print(value)
         return self._normalize_arg(value)
 
     def _normalize_arg(self, arg: str):
@@ -0,0 +1,283 @@
+"""Inverted indexes of item tags, used to narrow searched items down without scanning every one of them"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from storage.const import SearchMode, ITEM
+
+if TYPE_CHECKING:
+    from storage.items.container import Container
+    from storage.search import CompiledQuery, CompiledComparison
+
+
+class NumericTagIndex:
+    """Numeric values of a single tag key kept in sorted order, so that comparison and range queries are
+    answered with a binary search and a slice. Sorting is deferred until the first query after a change."""
+
+    def __init__(self):
+        self.values: dict[int, int | float] = {}
+
+        self._sorted_values: list[int | float] = []
+        self._sorted_ids: list[int] = []
+        self._is_sorted: bool = True
+
+    def add(self, item_id: int, value: int | float):
+        self.values[item_id] = value
+        self._is_sorted = False
+
+    def remove(self, item_id: int):
+        if self.values.pop(item_id, None) is not None:
+            self._is_sorted = False
+
+    def get_matching(self, operator: str, value: int, range_end: int | None = None) -> list[int]:
+        """Return ids of items whose value satisfies the comparison, range_end is only used by the range operator"""
+        self._sort()
+
+        match operator:
+            case '<':
+                return self._sorted_ids[:bisect_left(self._sorted_values, value)]
+            case '<=':
+                return self._sorted_ids[:bisect_right(self._sorted_values, value)]
+            case '>':
+                return self._sorted_ids[bisect_right(self._sorted_values, value):]
+            case '>=':
+                return self._sorted_ids[bisect_left(self._sorted_values, value):]
+            case '-':
+                start = bisect_left(self._sorted_values, value)
+                end = bisect_right(self._sorted_values, range_end)
+                return self._sorted_ids[start:end]
+
+        raise ValueError(f"Unsupported comparison operator '{operator}'!")
+
+    def _sort(self):
+        if self._is_sorted:
+            return
+
+        pairs = sorted(self.values.items(), key=lambda pair: pair[1])
+        self._sorted_ids = [item_id for item_id, _ in pairs]
+        self._sorted_values = [value for _, value in pairs]
+        self._is_sorted = True
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class TagIndex:
+    """Posting lists of items keyed by tag key, by (key, value) pair and by value string,
+    plus a sorted index of numeric values per tag key for comparison queries.
+    Items are referenced by id() and returned ordered by rank of their owner, then in the order they were indexed."""
+
+    def __init__(self, owner_ranks: dict[int, int] | None = None):
+        self.items: dict[int, ITEM] = {}
+        self.keys: dict[str, set[int]] = defaultdict(set)
+        self.pairs: dict[tuple, set[int]] = defaultdict(set)
+        self.values: dict[str, set[int]] = defaultdict(set)
+        self.numeric: dict[str, NumericTagIndex] = defaultdict(NumericTagIndex)
+
+        self._indexed_tags: dict[int, list[tuple]] = {}
+        self._order: dict[int, int] = {}
+        self._owners: dict[int, int] = {}
+        self._next_order: int = 0
+        # id of owner -> its position among owners, items of a re-indexed owner keep their place among others
+        self.owner_ranks: dict[int, int] = {} if owner_ranks is None else owner_ranks
+
+    def add_item(self, item: ITEM, owner=None):
+        """Index item tags. Owner is the container the item belongs to, used to scope lookups."""
+        item_id = id(item)
+
+        if item_id in self.items:
+            self.remove_item(item)
+
+        tags = list(item.tags.items())
+
+        for key, value in tags:
+            self.keys[str(key)].add(item_id)
+            self.values[str(value)].add(item_id)
+
+            numeric_value = self._to_number(value)
+            if numeric_value is not None:
+                self.numeric[str(key)].add(item_id, numeric_value)
+
+            try:
+                self.pairs[(key, value)].add(item_id)
+            except TypeError:
+                # unhashable values can never be equal to a str or int searched for
+                continue
+
+        self.items[item_id] = item
+        self._indexed_tags[item_id] = tags
+        self._order[item_id] = self._next_order
+        self._owners[item_id] = id(owner)
+        self._next_order += 1
+
+    def remove_item(self, item: ITEM):
+        item_id = id(item)
+
+        for key, value in self._indexed_tags.pop(item_id, []):
+            self._discard(self.keys, str(key), item_id)
+            self._discard(self.values, str(value), item_id)
+
+            if str(key) in self.numeric:
+                self.numeric[str(key)].remove(item_id)
+
+            try:
+                self._discard(self.pairs, (key, value), item_id)
+            except TypeError:
+                continue
+
+        self.items.pop(item_id, None)
+        self._order.pop(item_id, None)
+        self._owners.pop(item_id, None)
+
+    def get_candidates(self, compiled_query: CompiledQuery, owner=None) -> list[ITEM]:
+        """Return items that can possibly match the query - union of posting lists in 'any' mode and their
+        intersection in 'all' mode. Returned items still have to be matched by the compiled query."""
+        return list(self.iter_candidates(compiled_query, owner))
+
+    def iter_candidates(self, compiled_query: CompiledQuery, owner=None) -> Iterator[ITEM]:
+        postings = [self._get_positional_postings(tag) for tag in compiled_query.positionals]
+        postings += [self._get_keyword_postings(key, value) for key, value in compiled_query.keywords.items()]
+        postings += [self._get_comparison_postings(comparison) for comparison in compiled_query.comparisons]
+
+        if compiled_query.mode == SearchMode.ALL:
+            candidates = self._intersect(postings)
+        else:
+            candidates = set().union(*postings)
+
+        if owner is not None:
+            candidates = {item_id for item_id in candidates if self._owners[item_id] == id(owner)}
+
+        for item_id in sorted(candidates, key=self._get_sort_key):
+            yield self.items[item_id]
+
+    def _get_sort_key(self, item_id: int) -> tuple[int, int]:
+        return self.owner_ranks.get(self._owners[item_id], 0), self._order[item_id]
+
+    def _get_positional_postings(self, tag: str) -> set[int]:
+        return self.keys.get(tag, set()) | self.values.get(tag, set())
+
+    def _get_keyword_postings(self, key: str, value) -> set[int]:
+        try:
+            return self.pairs.get((key, value), set())
+        except TypeError:
+            return set()
+
+    def _get_comparison_postings(self, comparison: CompiledComparison) -> set[int]:
+        numeric_index = self.numeric.get(comparison.key)
+
+        if numeric_index is None:
+            return set()
+
+        try:
+            return set(numeric_index.get_matching(comparison.operator, *comparison.bounds))
+        except (ValueError, TypeError):
+            # non-numeric comparisons are left to the compiled query, any item having the key is a candidate
+            return self.keys.get(comparison.key, set())
+
+    def _to_number(self, value) -> int | float | None:
+        """Values that Searcher compares as numbers - ints, floats and digit strings."""
+        if isinstance(value, (int, float)):
+            return value
+
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+
+        return None
+
+    def _intersect(self, postings: list[set[int]]) -> set[int]:
+        if not postings:
+            return set(self.items)
+
+        postings = sorted(postings, key=len)
+        candidates = set(postings[0])
+
+        for posting in postings[1::]:
+            candidates.intersection_update(posting)
+
+        return candidates
+
+    def _discard(self, postings: dict, key, item_id: int):
+        posting = postings.get(key)
+
+        if posting is None:
+            return
+
+        posting.discard(item_id)
+
+        if not posting:
+            del postings[key]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class InventoryIndex:
+    """Tag indexes of all containers, drawers and components of a session.
+    Indexes are maintained per container - a changed container only has its own items re-indexed.
+    Items are returned in traversal order - by position of their container, then of drawer and compartment."""
+
+    def __init__(self):
+        self._container_ranks: dict[int, int] = {}
+        self.indexes: dict[str, TagIndex] = {'container': TagIndex(self._container_ranks),
+                                             'drawer': TagIndex(self._container_ranks),
+                                             'component': TagIndex(self._container_ranks)}
+
+        self._indexed_containers: dict[int, Container] = {}
+        self._indexed_items: dict[int, list[tuple[str, ITEM]]] = {}
+        self._stale_containers: set[int] = set()
+
+    def invalidate(self, container: Container):
+        """Mark container as changed, its items will be re-indexed on next refresh."""
+        self._stale_containers.add(id(container))
+
+    def refresh(self, containers: Iterable[Container]):
+        """Bring indexes in sync with given containers, only (re)indexing new, removed and changed ones."""
+        current = {id(container): container for container in containers}
+
+        for container_id in list(self._indexed_containers):
+            if container_id not in current or container_id in self._stale_containers:
+                self._remove_container(container_id)
+
+        for container_id, container in current.items():
+            if container_id not in self._indexed_containers:
+                self._index_container(container)
+
+        self._stale_containers.clear()
+        self._container_ranks.clear()
+        self._container_ranks.update((container_id, rank) for rank, container_id in enumerate(current))
+
+    def refresh_container(self, container: Container):
+        """Bring indexes of a single container in sync, leaving items of other containers as they are."""
+        container_id = id(container)
+
+        if container_id in self._stale_containers:
+            self._remove_container(container_id)
+            self._stale_containers.discard(container_id)
+
+        if container_id not in self._indexed_containers:
+            self._index_container(container)
+
+    def get_index(self, item_type: str) -> TagIndex:
+        return self.indexes[item_type]
+
+    def _index_container(self, container: Container):
+        items: list[tuple[str, ITEM]] = [('container', container)]
+
+        for drawer in container.drawers:
+            items.append(('drawer', drawer))
+            items.extend(('component', comp) for comp in drawer.components)
+
+        for item_type, item in items:
+            self.indexes[item_type].add_item(item, owner=container)
+
+        self._indexed_containers[id(container)] = container
+        self._indexed_items[id(container)] = items
+
+    def _remove_container(self, container_id: int):
+        for item_type, item in self._indexed_items.pop(container_id, []):
+            self.indexes[item_type].remove_item(item)
+
+        self._indexed_containers.pop(container_id, None)
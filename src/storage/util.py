@@ -1,6 +1,21 @@
+import os
+import pathlib
+import stat
+import tempfile
+import time
+
+from contextlib import contextmanager, suppress
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 
 def get_operator(value: str) -> str:
-    operators = ["<", ">", "<=", ">=", "="]
+    # two-character operators go first, otherwise '<=' would be recognized as '<'
+    operators = ["<=", ">=", "<", ">", "="]
 
     for op in operators:
         if op in value:
@@ -27,3 +42,139 @@ def json_digit_string_keys_to_ints(json_data: dict) -> dict:
             json_data[key] = {int(k) if k.isdigit() else k: v for k, v in json_data[key].items()}
 
     return json_data
+
+
+_timestamp_cache: dict[int, str] = {}
+
+
+def get_timestamp() -> str:
+    """Current time in the format of 'last_update' tags. Timestamps have minute precision, so the string is
+    only formatted once per minute no matter how many items get updated."""
+    minute = int(time.time() // 60)
+
+    try:
+        return _timestamp_cache[minute]
+    except KeyError:
+        _timestamp_cache.clear()
+        return _timestamp_cache.setdefault(minute, datetime.now().strftime("%d/%m/%Y, %H:%M"))
+
+
+_umask: int | None = None
+
+
+def get_umask() -> int:
+    """Umask of the process, read once - reading it means setting it, which isn't safe to do while other threads
+    may be creating files."""
+    global _umask
+
+    if _umask is None:
+        _umask = os.umask(0o022)
+        os.umask(_umask)
+
+    return _umask
+
+
+def make_temp_file(path) -> tuple[int, pathlib.Path]:
+    """Create a new temporary file in the same directory as path, to be moved over it by os.replace().
+    Temporary files are hidden and use the '.tmp' suffix, so they are never mistaken for save files.
+    mkstemp() makes them readable by the owner only, so they are given the mode of the file they replace,
+    or the mode a newly created file would get."""
+    path = pathlib.Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~get_umask()
+
+    try:
+        os.chmod(temp_path, mode)
+    except BaseException:
+        os.close(fd)
+        os.remove(temp_path)
+        raise
+
+    return fd, pathlib.Path(temp_path)
+
+
+def create_temp_file(path, content: str | bytes, fsync: bool = True) -> pathlib.Path:
+    """Write content to a new temporary file made by make_temp_file()."""
+    fd, temp_path = make_temp_file(path)
+
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(content, bytes) else 'w') as file:
+            file.write(content)
+
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+
+    return temp_path
+
+
+def fsync_file(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_directory(path):
+    """Persist renames inside a directory. Directories can't be opened on Windows, where this does nothing."""
+    try:
+        fsync_file(path)
+    except OSError:
+        pass
+
+
+def write_file_atomically(path, content: str | bytes, fsync: bool = True):
+    """Replace file at path with given content. A crash at any point leaves either the old or the new file
+    in place, never a partially written one."""
+    with open_atomically(path, 'wb' if isinstance(content, bytes) else 'w', fsync) as file:
+        file.write(content)
+
+
+@contextmanager
+def open_atomically(path, mode: str = 'w', fsync: bool = True):
+    """Same as write_file_atomically() for content written bit by bit into the yielded file."""
+    path = pathlib.Path(path)
+    fd, temp_path = make_temp_file(path)
+
+    try:
+        with os.fdopen(fd, mode) as file:
+            yield file
+
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+
+    if fsync:
+        fsync_directory(path.parent)
+
+
+@contextmanager
+def lock_file(path):
+    """Hold an exclusive advisory lock of path for the duration of the block, anyone else locking the same path
+    waits until it's released. The lock file itself is left in place. Does nothing where fcntl is not available."""
+    if fcntl is None:
+        yield
+        return
+
+    with open(path, 'a') as file:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 from sys import argv
 
+from storage.cli.exceptions import ResizeNotConfirmedError
+
 
 class Validator(ABC):
     def __set_name__(self, owner, name):
@@ -39,7 +41,7 @@ class RowValidator(Validator):
                             setattr(obj, self.private_name, value)
                             self.reassign(value, overflowing_rows)
                         else:
-                            print("Action aborted")
+                            raise ResizeNotConfirmedError()
 
                     else:
                         setattr(obj, self.private_name, value)
@@ -113,7 +115,7 @@ class ColumnValidator(Validator):
                             setattr(obj, self.private_name, value)
                             self.reassign(value, overflowing_drawers)
                         else:
-                            print("Action aborted")
+                            raise ResizeNotConfirmedError()
 
                     else:
                         setattr(obj, self.private_name, value)
@@ -195,7 +197,7 @@ class CompartmentValidator(Validator):
                             self.reassign(value, overflowing_components)
                             setattr(obj, self.private_name, value)
                         else:
-                            print("Action aborted")
+                            raise ResizeNotConfirmedError()
 
                     else:
                         self.reassign(value, overflowing_components)
@@ -250,12 +252,24 @@ class CompartmentValidator(Validator):
 
 
 class Prompter:
+    # confirm every prompt without asking, e.g. while replaying changes that were already confirmed
+    assume_yes: bool = False
+    # without a user at the console, e.g. in the daemon, prompts are rejected instead of asked
+    interactive: bool = True
+
     def __init__(self, overflowing_items_count: int, items_to_be_lost_count: int = 0, item_type: str = 'items'):
         self.overflowing_items_count: int = overflowing_items_count
         self.items_to_be_lost_count: int = items_to_be_lost_count
         self.item_type: str = item_type
 
     def get_user_input(self) -> bool:
+        if Prompter.assume_yes:
+            return True
+
+        if not Prompter.interactive:
+            raise ResizeNotConfirmedError(reason="as resizing has to be confirmed at the console - "
+                                                 "run the command with the daemon stopped")
+
         choice = input(
             f"WARNING: There are {self.overflowing_items_count} overflowing {self.item_type}(s).\n"
             f"If you choose to change the number of {self.item_type}s, {self.overflowing_items_count - self.items_to_be_lost_count} {self.item_type}(s) will be moved and reassigned to "
@@ -0,0 +1,271 @@
+"""Search engine evaluating comparison tags over whole columns of numeric tag values at once.
+Requires NumPy, installed with the 'numpy' extra."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from storage.const import SearchMode, ITEM
+from storage.search import Searcher, SearchResult, CompiledQuery, CompiledComparison
+
+if TYPE_CHECKING:
+    from storage.items.container import Container
+
+# integers above this lose precision once stored in a float column
+MAX_EXACT_FLOAT_INT = 2 ** 53
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+class NumericColumn:
+    """Values of a single tag key across searched items. Items without the key or with a value that can't be
+    compared as a number (which Searcher never matches either) are left out through the present mask."""
+
+    def __init__(self, values, present):
+        self.values = values
+        self.present = present
+
+    @classmethod
+    def from_items(cls, key: str, items: list[ITEM]) -> NumericColumn | None:
+        """Return None if values can't be stored in a single int64 or float64 array without losing precision."""
+        values: list[int | float] = []
+        present: list[bool] = []
+
+        for item in items:
+            value = cls._to_number(item.tags.get(key))
+            present.append(value is not None)
+            values.append(0 if value is None else value)
+
+        if all(isinstance(value, int) for value in values):
+            dtype = np.int64
+        elif all(isinstance(value, float) or abs(value) <= MAX_EXACT_FLOAT_INT for value in values):
+            dtype = np.float64
+        else:
+            return None
+
+        try:
+            return cls(np.array(values, dtype=dtype), np.array(present, dtype=bool))
+        except OverflowError:
+            return None
+
+    def evaluate(self, comparison: CompiledComparison):
+        """Return boolean mask of items satisfying the comparison, same as CompiledComparison.matches()."""
+        values = self.values
+
+        match comparison.operator:
+            case '<':
+                mask = values < comparison.bounds[0]
+            case '<=':
+                mask = values <= comparison.bounds[0]
+            case '>':
+                mask = values > comparison.bounds[0]
+            case '>=':
+                mask = values >= comparison.bounds[0]
+            case '-':
+                # range operator checks membership in range(a, b+1), so only whole numbers can match
+                start, end = comparison.bounds
+                mask = (values >= start) & (values <= end) & (values == np.floor(values))
+            case _:
+                raise ValueError(f"Unsupported comparison operator '{comparison.operator}'!")
+
+        return mask & self.present
+
+    @staticmethod
+    def _to_number(value) -> int | float | None:
+        if isinstance(value, (int, float)):
+            return value
+
+        if isinstance(value, str) and value.isdigit():
+            try:
+                return int(value)
+            except ValueError:
+                return None
+
+        return None
+
+
+class ColumnBlock:
+    """Items of one type belonging to a single container, along with numeric columns of their tags.
+    Columns are built on the first search comparing their tag key and kept until the block is rebuilt."""
+
+    def __init__(self, items: list[ITEM]):
+        self.items = items
+        self._columns: dict[str, NumericColumn | None] = {}
+        self._key_positions: dict[str, np.ndarray] = {}
+
+    def get_column(self, key: str) -> NumericColumn | None:
+        if key not in self._columns:
+            self._columns[key] = NumericColumn.from_items(key, self.items)
+
+        return self._columns[key]
+
+    def get_key_positions(self, key: str):
+        """Return position of the key among tags of each item, -1 for items without it."""
+        if key not in self._key_positions:
+            self._key_positions[key] = np.array([self._get_key_position(item.tags, key) for item in self.items],
+                                                dtype=np.int64)
+
+        return self._key_positions[key]
+
+    def evaluate(self, comparison: CompiledComparison):
+        """Return boolean mask of block items satisfying the comparison."""
+        column = self.get_column(comparison.key)
+
+        if column is not None:
+            try:
+                return column.evaluate(comparison)
+            except (TypeError, OverflowError):
+                # non-numeric or out of range bounds, left to the per-item comparison
+                pass
+
+        return np.array([comparison.matches(item.tags.get(comparison.key)) for item in self.items], dtype=bool)
+
+    @staticmethod
+    def _get_key_position(tags: dict, key: str) -> int:
+        for position, tag_key in enumerate(tags):
+            if tag_key == key:
+                return position
+
+        return -1
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class InventoryColumns:
+    """Column blocks of all containers, drawers and components of a session, kept between searches.
+    Blocks are maintained per container - a changed container only has its own columns rebuilt."""
+
+    def __init__(self):
+        self._blocks: dict[int, dict[str, ColumnBlock]] = {}
+        self._containers: dict[int, Container] = {}
+        self._stale_containers: set[int] = set()
+
+    def invalidate(self, container: Container):
+        """Mark container as changed, its blocks will be rebuilt on next refresh."""
+        self._stale_containers.add(id(container))
+
+    def refresh(self, containers: Iterable[Container]):
+        """Bring blocks in sync with given containers, only (re)building new, removed and changed ones."""
+        current = {id(container): container for container in containers}
+
+        for container_id in list(self._containers):
+            if container_id not in current:
+                self._remove_container(container_id)
+
+        for container in current.values():
+            self.refresh_container(container)
+
+    def refresh_container(self, container: Container):
+        """Bring blocks of a single container in sync, leaving blocks of other containers as they are."""
+        container_id = id(container)
+
+        if container_id in self._stale_containers:
+            self._remove_container(container_id)
+            self._stale_containers.discard(container_id)
+
+        if container_id not in self._containers:
+            self._build_container(container)
+
+    def get_blocks(self, item_type: str, containers: Iterable[Container]) -> list[ColumnBlock]:
+        """Return blocks of given item type, in the order of given (refreshed) containers."""
+        return [self._blocks[id(container)][item_type] for container in containers]
+
+    def _build_container(self, container: Container):
+        drawers = container.drawers
+
+        self._blocks[id(container)] = {'container': ColumnBlock([container]),
+                                       'drawer': ColumnBlock(list(drawers)),
+                                       'component': ColumnBlock([comp for drawer in drawers
+                                                                 for comp in drawer.components])}
+        self._containers[id(container)] = container
+
+    def _remove_container(self, container_id: int):
+        self._blocks.pop(container_id, None)
+        self._containers.pop(container_id, None)
+
+
+class VectorizedSearcher(Searcher):
+    """Searcher evaluating each comparison tag as a boolean mask over a numeric column of a block of items,
+    combined with AND in 'all' mode and OR in 'any' mode. Search results are built straight from the masks,
+    items are only matched one by one for positional and keyword tags."""
+
+    def __init__(self, query, blocks: Iterable[ColumnBlock]):
+        if np is None:
+            raise ImportError("NumPy is required by the vectorized search engine, install it with "
+                              "'pip install storage[numpy]'")
+
+        self.blocks = list(blocks)
+        super().__init__(query, [item for block in self.blocks for item in block.items])
+
+    def iter_compiled_query(self, compiled_query: CompiledQuery) -> Iterator[SearchResult]:
+        if not compiled_query.comparisons:
+            yield from super().iter_compiled_query(compiled_query)
+            return
+
+        for block in self.blocks:
+            if len(block):
+                yield from self._iter_block_results(block, compiled_query)
+
+    def _iter_block_results(self, block: ColumnBlock, compiled_query: CompiledQuery) -> Iterator[SearchResult]:
+        comparisons = compiled_query.comparisons
+        masks = np.array([block.evaluate(comparison) for comparison in comparisons])
+        has_other_tags = bool(compiled_query.positionals or compiled_query.keywords)
+
+        if compiled_query.mode == SearchMode.ALL:
+            selected = np.logical_and.reduce(masks)
+        elif not has_other_tags:
+            selected = np.logical_or.reduce(masks)
+        else:
+            # any positional or keyword tag alone is enough for a match in 'any' mode
+            selected = np.ones(len(block), dtype=bool)
+
+        hits = np.flatnonzero(selected)
+
+        if not len(hits):
+            return
+
+        # matched comparisons are listed in the order CompiledQuery.match() finds them - by item tag order,
+        # hits sharing the same order and matches share the list of matched comparison tags built once
+        order = self._get_comparison_order(block, compiled_query, hits)
+        matched = np.take_along_axis(masks[:, hits], order, axis=0)
+        patterns, pattern_indexes = np.unique(np.concatenate([order, matched]).T, axis=0, return_inverse=True)
+
+        comparison_count = len(comparisons)
+        pattern_matches = [[comparisons[index].tag for index, is_match
+                            in zip(pattern[:comparison_count], pattern[comparison_count:]) if is_match]
+                           for pattern in patterns.tolist()]
+
+        for index, pattern_index in zip(hits.tolist(), pattern_indexes.ravel().tolist()):
+            item = block.items[index]
+            comparison_matches = list(pattern_matches[pattern_index])
+
+            if has_other_tags:
+                search_result = compiled_query.match(item, comparison_matches)
+
+                if search_result:
+                    yield search_result
+                continue
+
+            search_result = SearchResult(item_ref=item, query=compiled_query.query)
+            search_result.matched_comparisons = comparison_matches
+            yield search_result
+
+    def _get_comparison_order(self, block: ColumnBlock, compiled_query: CompiledQuery, hits):
+        """Return indexes of comparisons ordered by position of their key among tags of each hit item."""
+        comparison_count = len(compiled_query.comparisons)
+
+        if len(compiled_query.comparisons_by_key) == 1:
+            return np.broadcast_to(np.arange(comparison_count)[:, np.newaxis], (comparison_count, len(hits)))
+
+        positions = np.array([block.get_key_positions(comparison.key)[hits]
+                              for comparison in compiled_query.comparisons])
+
+        return np.argsort(positions, axis=0, kind='stable')
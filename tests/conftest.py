@@ -1,13 +1,43 @@
 import pytest
 
+from typing import Callable
+
 from storage.session import Session
+from storage.data_manager import JSONDataManager
 from storage.items.container import Container
 from storage.items.drawer import Drawer
 
 
 @pytest.fixture
-def session() -> Session:
-    return Session()
+def make_session(tmp_path) -> Callable[..., Session]:
+    """Create sessions saving to the same directory, as separate processes would."""
+    def make(**kwargs) -> Session:
+        session = Session(**kwargs)
+        session.data_manager.container_path = tmp_path
+        return session
+
+    return make
+
+
+@pytest.fixture
+def session(make_session) -> Session:
+    return make_session()
+
+
+@pytest.fixture
+def make_data_manager(tmp_path) -> Callable[[], JSONDataManager]:
+    """Create data managers of the same directory, as separate processes would."""
+    def make() -> JSONDataManager:
+        data_manager = JSONDataManager()
+        data_manager.container_path = tmp_path
+        return data_manager
+
+    return make
+
+
+@pytest.fixture
+def data_manager(make_data_manager) -> JSONDataManager:
+    return make_data_manager()
 
 
 TEST_CONTAINER_NAME = 'testContainer'
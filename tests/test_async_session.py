@@ -0,0 +1,105 @@
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+
+from storage.async_session import AsyncSession
+from storage.data_manager import SQLiteDataManager
+
+
+def test_changes_are_written_in_background(session, container_dict, drawer_dict):
+    async def run():
+        async_session = AsyncSession(session)
+        await async_session.create_container(**container_dict)
+        await async_session.create_drawer(**drawer_dict)
+        await async_session.close()
+        return async_session
+
+    async_session = asyncio.run(run())
+    saved_data = async_session.session.data_manager.load_container_data(container_dict['name'])
+
+    assert [drawer['name'] for drawer in saved_data['drawers']] == [drawer_dict['name']]
+
+
+def test_concurrent_changes_of_a_container_are_serialized(session, container_dict):
+    async def run():
+        async_session = AsyncSession(session)
+        await async_session.create_container(**container_dict)
+        await asyncio.gather(*(async_session.create_drawer(f"drawer{n}", container_dict['name']) for n in range(10)))
+        results = await async_session.search_items('drawer', tags_positional=['drawer3'], tags_comparison=[],
+                                                   tags={}, mode='any')
+        await async_session.close()
+        return async_session, results
+
+    async_session, results = asyncio.run(run())
+    saved_data = async_session.session.data_manager.load_container_data(container_dict['name'])
+
+    assert len(saved_data['drawers']) == 10
+    assert [result.item_ref.name for result in results] == ['drawer3']
+
+
+def test_changes_are_written_to_database_in_background(tmp_path, container_dict, drawer_dict):
+    database_path = tmp_path.joinpath('storage.db')
+
+    async def run():
+        async_session = await AsyncSession.open(lambda: SQLiteDataManager(database_path=database_path))
+        await async_session.create_container(**container_dict)
+        await async_session.create_drawer(**drawer_dict)
+        await async_session.close()
+
+    asyncio.run(run())
+    saved_data = SQLiteDataManager(database_path=database_path).load_container_data(container_dict['name'])
+
+    assert [drawer['name'] for drawer in saved_data['drawers']] == [drawer_dict['name']]
+
+
+def test_executor_passed_in_is_not_shut_down(session, container_dict):
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def run():
+        async_session = AsyncSession(session, executor)
+        await async_session.create_container(**container_dict)
+        await async_session.close()
+
+    asyncio.run(run())
+
+    assert executor.submit(lambda: 1).result() == 1
+    executor.shutdown()
+
+
+def test_change_writes_only_its_container(session, container_dict, drawer_dict):
+    async def run():
+        async_session = AsyncSession(session)
+        await async_session.create_container(**container_dict)
+        await async_session.create_container('otherContainer', 2, 2)
+
+        # change of the other container left in memory only, as by a change failing halfway
+        async_session.session.get_container_by_name('otherContainer').tags['color'] = 'red'
+        async_session.session.mark_container_as_dirty(async_session.session.get_container_by_name('otherContainer'))
+
+        await async_session.create_drawer(**drawer_dict)
+        await async_session.close()
+        return async_session
+
+    data_manager = asyncio.run(run()).session.data_manager
+
+    assert len(data_manager.load_container_data(container_dict['name'])['drawers']) == 1
+    assert 'color' not in data_manager.load_container_data('otherContainer')['tags']
+
+
+def test_renamed_container_keeps_its_lock(session, container_dict, drawer_dict):
+    async def run():
+        async_session = AsyncSession(session)
+        container = await async_session.create_container(**container_dict)
+        lock = async_session.get_lock(container)
+
+        await asyncio.gather(async_session.update_container(container_dict['name'], {'name': 'renamed'}),
+                             async_session.create_drawer(drawer_dict['name'], 'renamed'))
+        await async_session.close()
+        return async_session, container, lock
+
+    async_session, container, lock = asyncio.run(run())
+    data_manager = async_session.session.data_manager
+
+    assert async_session.get_lock(container) is lock
+    assert data_manager.container_exists(container_dict['name']) is False
+    assert len(data_manager.load_container_data('renamed')['drawers']) == 1
@@ -10,8 +10,9 @@ from storage.session import Session
 s = Session()
 
 
-@pytest.fixture
-def executor_session() -> Session:
+@pytest.fixture(scope='session')
+def executor_session(tmp_path_factory) -> Session:
+    s.data_manager.container_path = tmp_path_factory.mktemp('containers')
     return s
 
 
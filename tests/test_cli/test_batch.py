@@ -0,0 +1,93 @@
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from storage.__main__ import run_batch, setup_subparsers
+from storage.cli.parser import ArgParser
+
+
+def create_parser() -> ArgParser:
+    parser = ArgParser()
+    parser.setup_args()
+    setup_subparsers(parser)
+    return parser
+
+
+def test_batch_saves_changes_once(session, monkeypatch):
+    saved_containers = []
+    monkeypatch.setattr(session.data_manager, 'save_data_to_file', saved_containers.append)
+
+    lines = ['storage create container batchContainer 2 2',
+             '# comment',
+             'create drawer batchDrawer batchContainer',
+             'create component "batch component" 5 other batchDrawer batchContainer']
+    failed = run_batch(session, create_parser(), lines)
+
+    assert failed == 0
+    assert [container.name for container in saved_containers] == ['batchContainer']
+    assert session.get_item_by_path('batchContainer/batchDrawer/batch component').count == 5
+
+
+def test_batch_reports_failing_lines_and_continues(session, capsys):
+    lines = ['create container batchContainer 2 2',
+             'create drawer batchDrawer missingContainer',
+             'unknown command',
+             'create drawer batchDrawer batchContainer']
+    failed = run_batch(session, create_parser(), lines)
+
+    errors = capsys.readouterr().err
+    assert failed == 2
+    assert 'line 2:' in errors and 'line 3:' in errors
+    assert session.get_drawer_by_name('batchDrawer', 'batchContainer') is not None
+
+
+@pytest.mark.parametrize('module', ['storage', 'storage.client'])
+def test_failed_batch_exits_with_non_zero_status(tmp_path, module):
+    repo_path = pathlib.Path(__file__).parents[2]
+    shutil.copytree(repo_path.joinpath('config'), tmp_path.joinpath('config'))
+    tmp_path.joinpath('batch.txt').write_text('create container batchContainer 2 2\n'
+                                              'create drawer batchDrawer missingContainer\n')
+    env = {**os.environ, 'PYTHONPATH': str(repo_path.joinpath('src')),
+           'STORAGE_SOCKET': str(tmp_path.joinpath('storage.sock'))}
+
+    process = subprocess.run([sys.executable, '-m', module, 'batch', 'batch.txt'], cwd=tmp_path, env=env,
+                             capture_output=True, text=True)
+
+    assert process.returncode == 1
+    assert 'line 2:' in process.stderr
+
+
+def test_batch_recovers_from_failed_save(session, make_session, capsys):
+    run_batch(session, create_parser(), ['create container batchContainer 2 2'])
+
+    other_session = make_session()
+    other_session.load_container_manifest()
+    other_session.create_drawer(name='otherDrawer', container='batchContainer')
+
+    failed = run_batch(session, create_parser(), ['create drawer batchDrawer batchContainer'])
+
+    assert failed == 1
+    assert 'batchContainer' in capsys.readouterr().err
+
+    # the session sees the container as saved by the other process and keeps working
+    assert run_batch(session, create_parser(), ['create drawer batchDrawer batchContainer']) == 0
+    assert {drawer.name for drawer in session.get_container_by_name('batchContainer').drawers} == \
+        {'otherDrawer', 'batchDrawer'}
+
+
+def test_changes_of_other_processes_are_picked_up(make_session, session):
+    run_batch(session, create_parser(), ['create container batchContainer 2 2'])
+
+    other_session = make_session()
+    other_session.load_container_manifest()
+    other_session.create_drawer(name='otherDrawer', container='batchContainer')
+    other_session.create_container(name='otherContainer', rows=1, columns=1)
+
+    session.reload_changed_containers()
+
+    assert session.get_drawer_by_name('otherDrawer', 'batchContainer') is not None
+    assert session.get_container_by_name('otherContainer') is not None
@@ -0,0 +1,79 @@
+import pytest
+
+from storage.columnar import ColumnarComponentStore
+from storage.search import SearchQuery, Searcher, CompiledQuery
+from storage.const import SearchMode
+
+
+@pytest.fixture
+def container_data() -> list[dict]:
+    components = [{'name': 'r1', 'count': 5, 'type': 'resistor', 'compartment': 0, 'tags': {}},
+                  {'name': 'c1', 'count': 50, 'type': 'capacitor', 'compartment': 1, 'tags': {}},
+                  {'name': 'r2', 'count': 1, 'type': 'resistor', 'compartment': 2, 'tags': {}}]
+    drawer = {'name': 'drawer', 'row': 0, 'column': 1, 'tags': {}, 'components': components}
+    return [{'name': 'container', 'drawers': [drawer]}]
+
+
+@pytest.fixture
+def mapped_store(tmp_path, container_data) -> ColumnarComponentStore:
+    path = tmp_path.joinpath(ColumnarComponentStore.file_name)
+    ColumnarComponentStore.from_container_data(container_data).save(path)
+
+    with ColumnarComponentStore.open(path) as store:
+        yield store
+
+
+def test_mapped_store_reads_back_saved_rows(mapped_store):
+    row = mapped_store.get_row(1)
+
+    assert len(mapped_store) == 3
+    assert (row.name, row.count, row.type, row.drawer, row.container) == ('c1', 50, 'capacitor', 'drawer', 'container')
+
+
+def test_total_count_is_aggregated_per_type(mapped_store):
+    assert mapped_store.get_total_count_by_type() == {'resistor': 6, 'capacitor': 50}
+
+
+def test_components_below_threshold_are_found(mapped_store):
+    assert [row.name for row in mapped_store.get_components_below(10)] == ['r1', 'r2']
+
+
+def test_searcher_scans_store_rows(mapped_store):
+    query = SearchQuery(SearchMode.ALL)
+    compiled_query = CompiledQuery.compile(query, ['resistor'], {}, ['count>2'])
+    results = Searcher(query, mapped_store.iter_rows()).run_compiled_query(compiled_query)
+
+    assert [result.item_ref.name for result in results] == ['r1']
+
+
+def test_store_is_rebuilt_after_save(data_manager, container_complete):
+    data_manager.save_data_to_file(container_complete)
+
+    with data_manager.load_component_store() as store:
+        assert len(store) == 1
+
+    container_complete.get_drawer_by_name('testDrawer').add_component('other', 'other', {}, 1)
+    data_manager.save_data_to_file(container_complete)
+
+    with data_manager.load_component_store() as store:
+        assert len(store) == 2
+
+
+def test_store_with_large_metadata_reads_back_every_row(tmp_path):
+    drawers = [{'name': f'drawer{i}' * 20, 'row': i, 'column': 0, 'tags': {},
+                'components': [{'name': f'c{i}', 'count': i, 'type': f'type{i}', 'compartment': 0, 'tags': {}}]}
+               for i in range(2000)]
+    path = tmp_path.joinpath(ColumnarComponentStore.file_name)
+    ColumnarComponentStore.from_container_data([{'name': 'container', 'drawers': drawers}]).save(path)
+
+    with ColumnarComponentStore.open(path) as store:
+        assert [row.count for row in store.iter_rows()] == list(range(2000))
+        assert store.get_row(1999).name == 'c1999'
+
+
+def test_store_of_another_version_is_rebuilt(data_manager, tmp_path, container_complete):
+    data_manager.save_data_to_file(container_complete)
+    tmp_path.joinpath(ColumnarComponentStore.file_name).write_bytes(b'STORAGE-COLUMNS' + b'\0' * 64)
+
+    with data_manager.load_component_store() as store:
+        assert len(store) == 1
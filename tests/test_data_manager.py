@@ -1,22 +1,24 @@
+import os
 import pathlib
+import stat
 
-from storage.data_manager import JSONDataManager
+import pytest
 
+from storage.data_manager import SQLiteDataManager, Snapshot, convert_json_save_to_sqlite
+from storage.cli.exceptions import ContainerVersionConflictError
+from storage.util import get_umask
 
-def test_container_is_saved_to_file(tmp_path, container):
-    data_manager = JSONDataManager()
-    data_manager.container_path = tmp_path
+
+def test_container_is_saved_to_file(data_manager, tmp_path, container):
     data_manager.save_data_to_file(container)
     file_path = pathlib.Path(tmp_path).joinpath(data_manager.create_filepath(container))
 
     assert file_path.exists() is True
 
 
-def test_container_file_is_updated(tmp_path, container, drawer_dict):
+def test_container_file_is_updated(data_manager, tmp_path, container, drawer_dict):
     drawer_dict.pop('container')
 
-    data_manager = JSONDataManager()
-    data_manager.container_path = tmp_path
     data_manager.save_data_to_file(container)
     file_path = pathlib.Path(tmp_path).joinpath(data_manager.create_filepath(container))
     drawers_a = container.drawers.copy()
@@ -29,11 +31,186 @@ def test_container_file_is_updated(tmp_path, container, drawer_dict):
     assert len(drawers_a) != len(container_new.get('drawers'))
 
 
-def test_container_file_is_deleted(tmp_path, container):
-    data_manager = JSONDataManager()
-    data_manager.container_path = tmp_path
+def test_container_file_is_deleted(data_manager, tmp_path, container):
     data_manager.save_data_to_file(container)
     file_path = pathlib.Path(tmp_path).joinpath(data_manager.create_filepath(container))
     data_manager.delete_container_file(container.name)
 
     assert file_path.exists() is False
+
+
+def test_container_is_saved_to_database(tmp_path, container_complete):
+    data_manager = SQLiteDataManager(database_path=tmp_path.joinpath('storage.db'))
+    data_manager.save_data_to_file(container_complete)
+
+    assert data_manager.load_data_from_file(container_complete.name) == container_complete.to_json()
+
+
+def test_component_update_writes_single_row(tmp_path, container_complete):
+    data_manager = SQLiteDataManager(database_path=tmp_path.joinpath('storage.db'))
+    data_manager.save_data_to_file(container_complete)
+    changes_before = data_manager.connection.total_changes
+
+    container_complete.get_all_components()[0].count = 100
+    data_manager.save_data_to_file(container_complete)
+
+    assert data_manager.connection.total_changes - changes_before == 1
+
+
+def test_container_is_deleted_from_database(tmp_path, container_complete):
+    data_manager = SQLiteDataManager(database_path=tmp_path.joinpath('storage.db'))
+    data_manager.save_data_to_file(container_complete)
+    data_manager.delete_container_file(container_complete.name)
+
+    assert data_manager.load_all_container_data_from_save_directory() == []
+
+
+def test_json_save_is_converted_to_database(make_data_manager, tmp_path, container_complete):
+    json_manager = make_data_manager()
+    json_manager.save_data_to_file(container_complete)
+    sqlite_manager = SQLiteDataManager(database_path=tmp_path.joinpath('storage.db'))
+
+    convert_json_save_to_sqlite(json_manager, sqlite_manager)
+
+    assert sqlite_manager.load_data_from_file(container_complete.name) == container_complete.to_json()
+
+
+def test_manifest_lists_saved_containers(data_manager, make_data_manager, container_complete):
+    data_manager.save_data_to_file(container_complete)
+
+    fresh_data_manager = make_data_manager()
+    entry = fresh_data_manager.manifest.entries[container_complete.name]
+
+    assert fresh_data_manager.get_container_names() == [container_complete.name]
+    assert (entry['drawers'], entry['components']) == (1, 1)
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_parallel_load_matches_serial_load(data_manager, container_complete, use_processes):
+
+    for name in ('a', 'b', 'c', 'd'):
+        container_complete.name = name
+        data_manager.save_data_to_file(container_complete)
+
+    serial = data_manager.load_all_container_data_from_save_directory()
+    parallel = data_manager.load_all_container_data_from_save_directory(workers=2, use_processes=use_processes)
+
+    assert parallel == serial
+
+
+def test_unchanged_containers_are_loaded_from_snapshot(data_manager, tmp_path, container_complete, monkeypatch):
+    data_manager.save_data_to_file(container_complete)
+    expected = data_manager.load_all_container_data_from_save_directory()
+
+    def fail(*args):
+        raise AssertionError("container file should not be decoded")
+
+    monkeypatch.setattr(data_manager, 'load_data_from_file', fail)
+
+    assert tmp_path.joinpath(Snapshot.file_name).exists() is True
+    assert data_manager.load_all_container_data_from_save_directory() == expected
+
+
+def test_stale_snapshot_falls_back_to_container_file(data_manager, container_complete):
+    data_manager.save_data_to_file(container_complete)
+    data_manager.load_all_container_data_from_save_directory()
+
+    container_complete.add_drawer('newDrawer')
+    data_manager.save_data_to_file(container_complete)
+    container_data = data_manager.load_all_container_data_from_save_directory()
+
+    assert len(container_data[0]['drawers']) == 2
+
+
+def test_batched_writes_are_applied_at_the_end_of_batch(data_manager, tmp_path, container_complete):
+    file_path = data_manager.create_filepath(container_complete)
+
+    with data_manager.batch_writes():
+        data_manager.save_data_to_file(container_complete)
+        assert file_path.exists() is False
+
+    assert data_manager.load_data_from_file(file_path) == container_complete.to_json()
+    assert list(tmp_path.glob('*.tmp')) == []
+
+
+def test_interrupted_batch_leaves_files_untouched(data_manager, tmp_path, container_complete):
+    data_manager.save_data_to_file(container_complete)
+    file_path = data_manager.create_filepath(container_complete)
+    saved_data = data_manager.load_data_from_file(file_path)
+
+    with pytest.raises(RuntimeError):
+        with data_manager.batch_writes():
+            container_complete.add_drawer('newDrawer')
+            data_manager.save_data_to_file(container_complete)
+            raise RuntimeError
+
+    assert data_manager.load_data_from_file(file_path) == saved_data
+    assert list(tmp_path.glob('*.tmp')) == []
+
+
+def test_save_of_container_changed_by_another_process_is_refused(data_manager, make_data_manager, tmp_path,
+                                                                 container_complete):
+    data_manager.save_data_to_file(container_complete)
+    file_path = data_manager.create_filepath(container_complete)
+
+    other_data_manager = make_data_manager()
+    other_data_manager.load_data_from_file(file_path)
+    other_data_manager.save_data_to_file(container_complete)
+
+    container_complete.add_drawer('newDrawer')
+
+    with pytest.raises(ContainerVersionConflictError):
+        data_manager.save_data_to_file(container_complete)
+
+    with pytest.raises(ContainerVersionConflictError):
+        with data_manager.batch_writes():
+            data_manager.save_data_to_file(container_complete)
+
+    assert len(data_manager.load_data_from_file(file_path)['drawers']) == len(container_complete.drawers) - 1
+    assert list(tmp_path.glob('*.tmp')) == []
+
+    # reloaded container can be saved again
+    data_manager.save_data_to_file(container_complete)
+    assert data_manager.load_data_from_file(file_path) == container_complete.to_json()
+
+
+def test_manifest_keeps_entries_saved_by_another_process(data_manager, make_data_manager, container_complete):
+    assert data_manager.manifest.entries == {}
+
+    other_data_manager = make_data_manager()
+    assert other_data_manager.manifest.entries == {}
+
+    data_manager.save_data_to_file(container_complete)
+    container_name = container_complete.name
+    container_complete.name = 'otherContainer'
+    other_data_manager.save_data_to_file(container_complete)
+
+    reloaded_data_manager = make_data_manager()
+
+    assert sorted(other_data_manager.manifest.entries) == sorted([container_name, 'otherContainer'])
+    assert sorted(reloaded_data_manager.manifest.entries) == sorted([container_name, 'otherContainer'])
+
+
+def test_database_is_loaded_with_workers(tmp_path, container_complete):
+    data_manager = SQLiteDataManager(database_path=tmp_path.joinpath('storage.db'))
+    data_manager.save_data_to_file(container_complete)
+
+    assert data_manager.load_all_container_data_from_save_directory(workers=4) == [container_complete.to_json()]
+    assert hasattr(data_manager, 'read_file') is False
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="file modes are only kept on POSIX systems")
+def test_saved_files_keep_their_mode(data_manager, container_complete):
+    data_manager.save_data_to_file(container_complete)
+    file_path = data_manager.create_filepath(container_complete)
+
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o666 & ~get_umask()
+    assert stat.S_IMODE(os.stat(data_manager.manifest.path).st_mode) == 0o666 & ~get_umask()
+
+    os.chmod(file_path, 0o664)
+
+    with data_manager.batch_writes():
+        data_manager.save_data_to_file(container_complete)
+
+    data_manager.save_data_to_file(container_complete)
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o664
@@ -0,0 +1,57 @@
+import json
+
+from storage.session import Session
+from storage.importer import get_file_format
+
+
+def create_import_drawers(session: Session):
+    session.create_container('importContainer', 2, 2, drawer_compartments=2)
+    session.create_drawer('drawerA', 'importContainer')
+    session.create_drawer('drawerB', 'importContainer')
+
+
+def test_csv_rows_are_imported_and_failing_rows_reported(session, tmp_path, capsys):
+    create_import_drawers(session)
+    rows_path = tmp_path.joinpath('delivery.csv')
+    rows_path.write_text("name,count,type,drawer,container,value\n"
+                         "R1,10,resistor,drawerA,importContainer,10k\n"
+                         "R2,x,resistor,drawerA,importContainer,\n"
+                         "C1,5,capacitor,missingDrawer,importContainer,\n"
+                         "C2,5,capacitor,drawerB,importContainer,100n\n")
+
+    result = session.import_components(str(rows_path))
+
+    assert (result.imported, result.failed) == (2, 2)
+    assert session.get_item_by_path('importContainer/drawerA/R1').tags['value'] == '10k'
+    assert session.get_item_by_path('importContainer/drawerB/C2').count == 5
+
+    errors = capsys.readouterr().err
+    assert 'line 3' in errors and 'line 4' in errors
+
+    saved_drawers = session.data_manager.load_container_data('importContainer')['drawers']
+    assert sum(len(drawer['components']) for drawer in saved_drawers) == 2
+
+
+def test_jsonl_rows_are_committed_in_batches(session, tmp_path, monkeypatch):
+    create_import_drawers(session)
+    rows_path = tmp_path.joinpath('delivery.jsonl')
+    rows = [{'name': f'part{i}', 'count': i, 'type': 'other', 'drawer': 'drawerA' if i < 2 else 'drawerB',
+             'container': 'importContainer', 'tags': {'lot': i}} for i in range(4)]
+    rows_path.write_text('\n'.join(json.dumps(row) for row in rows) + '\n{"name": \n')
+
+    saved: list[str] = []
+    save_data_to_file = session.data_manager.save_data_to_file
+    monkeypatch.setattr(session.data_manager, 'save_data_to_file',
+                        lambda container: saved.append(container.name) or save_data_to_file(container))
+
+    result = session.import_components(str(rows_path), batch_size=2)
+
+    assert (result.imported, result.failed) == (4, 1)
+    assert saved == ['importContainer'] * 2
+    assert session.get_item_by_path('importContainer/drawerB/part3').tags['lot'] == 3
+
+
+def test_file_format_is_guessed_from_extension():
+    assert get_file_format('delivery.csv') == 'csv'
+    assert get_file_format('delivery.JSONL') == 'jsonl'
+    assert get_file_format('delivery.txt', 'jsonl') == 'jsonl'
@@ -1,5 +1,6 @@
 import pytest
 
+from storage.items.container import Container
 from storage.cli.exceptions import DuplicateNameError, NoFreeSpacesError, ItemIsNotEmptyError
 
 
@@ -60,3 +61,24 @@ def test_container_is_cleared(container, test_drawer_name):
     container.add_drawer(test_drawer_name)
     container.clear_container()
     assert len(container.drawers) == 0
+
+
+def test_drawer_cannot_be_renamed_to_existing_name(container, test_drawer_name):
+    with pytest.raises(DuplicateNameError):
+        container.add_drawer(test_drawer_name)
+        second_drawer = container.add_drawer('secondDrawer')
+        second_drawer.name = test_drawer_name
+
+
+def test_drawer_is_added_at_freed_spot(container, test_drawer_name):
+    container.add_drawer(test_drawer_name)
+    container.add_drawer('secondDrawer')
+    container.remove_drawer_at_pos(0, 0)
+    drawer = container.add_drawer('thirdDrawer')
+    assert drawer.position == (0, 0)
+
+
+def test_free_space_tag_is_false_when_a_row_is_full(test_drawer_name):
+    container = Container(name='smallContainer', total_rows=2, max_drawers_per_row=1, compartments_per_drawer=1)
+    container.add_drawer(test_drawer_name)
+    assert container.tags['children_count'] == 1 and container.tags['free_space'] is False
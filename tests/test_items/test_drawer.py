@@ -1,6 +1,6 @@
 import pytest
 
-from storage.cli.exceptions import DuplicateNameError, NoFreeSpacesError
+from storage.cli.exceptions import DuplicateNameError, NoFreeSpacesError, ItemNotFoundError
 
 
 def test_component_is_added_to_drawer(drawer, component_dict):
@@ -36,3 +36,65 @@ def test_drawer_is_cleared(drawer, component_dict):
     drawer.add_component(**component_dict)
     drawer.clear_drawer()
     assert len(drawer.components) == 0
+
+
+def test_renamed_component_is_found_by_new_name(drawer, component_dict, test_component_name):
+    component = drawer.add_component(**component_dict)
+    component.name = 'renamed'
+
+    with pytest.raises(ItemNotFoundError):
+        drawer.get_component_by_name(test_component_name)
+
+    assert drawer.get_component_by_name('renamed') is component
+
+
+def test_special_tags_follow_added_and_removed_components(drawer, component_dict, test_component_name):
+    drawer.add_component(**component_dict)
+    assert drawer.tags['children_count'] == 1 and drawer.tags['free_space'] is True
+
+    drawer.remove_component_by_name(test_component_name)
+    assert drawer.tags['children_count'] == 0
+
+
+def test_slotted_component_accepts_updated_attributes(drawer, component_dict):
+    component = drawer.add_component(**component_dict, compartment=0)
+
+    for key, value in {'count': 5, 'type': 'resistor', 'compartment': 2, 'tags': {'value': '10k'}}.items():
+        setattr(component, key, value)
+
+    assert component.to_json() == {'name': component_dict['name'], 'count': 5, 'type': 'resistor',
+                                   'compartment': 2, 'tags': {'value': '10k'}}
+    assert component.location == ((0, 0), 2)
+
+    with pytest.raises(AttributeError):
+        component.unknown = 1
+
+
+def test_slotted_drawer_accepts_updated_attributes(drawer):
+    drawer.row, drawer.column = 1, 2
+    drawer.tags = {'shelf': 'top'}
+
+    assert drawer.to_json() == {'name': drawer.name, 'row': 1, 'column': 2, 'tags': {'shelf': 'top'},
+                                'components': []}
+    assert drawer.get_pos_str() == "[1,2]"
+
+    with pytest.raises(AttributeError):
+        drawer.unknown = 1
+
+
+def test_rename_goes_through_setattr_hooks(container, component_dict, test_drawer_name, test_component_name):
+    drawer = container.add_drawer(test_drawer_name)
+    component = drawer.add_component(**component_dict)
+    drawer.tags['name'] = test_drawer_name
+    component.tags['name'] = test_component_name
+
+    setattr(drawer, 'name', 'renamed drawer')
+    setattr(component, 'name', 'renamed component')
+
+    assert container.get_drawer_by_name('renamed drawer') is drawer
+    assert drawer.get_component_by_name('renamed component') is component
+    assert drawer.tags['name'] == 'renamed drawer'
+    assert component.tags['name'] == 'renamed component'
+
+    with pytest.raises(ItemNotFoundError):
+        container.get_drawer_by_name(test_drawer_name)
@@ -0,0 +1,39 @@
+import json
+
+from storage.cli.exceptions import ItemNotFoundAtPositionError
+from storage.items.position import Position
+
+
+def test_position_is_printed_as_coordinates():
+    position = Position(row=1, column=2)
+
+    assert repr(position) == "[1,2]"
+    assert str(position) == "[1,2]"
+    assert f"{position}" == "[1,2]"
+
+
+def test_position_compares_by_coordinates():
+    assert Position(1, 2) == Position(row=1, column=2)
+    assert Position(1, 2) != Position(2, 1)
+    assert Position(1, 2) == (1, 2)
+
+
+def test_position_is_unpacked_and_serialized_as_coordinates():
+    row, column = Position(3, 4)
+
+    assert (row, column) == (3, 4)
+    assert json.dumps(Position(3, 4)) == "[3, 4]"
+
+
+def test_position_from_drawer(drawer):
+    drawer.row, drawer.column = 2, 5
+
+    assert Position.from_drawer(drawer) == Position(2, 5)
+    assert drawer.location == Position(2, 5)
+    assert drawer.location == drawer.position
+
+
+def test_position_in_error_message(container):
+    error = ItemNotFoundAtPositionError(item='drawer', relation=container.name, pos=Position(1, 2))
+
+    assert "[1,2]" in str(error)
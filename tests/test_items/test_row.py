@@ -0,0 +1,60 @@
+import pytest
+
+from storage.items.component import Component, ComponentPlaceholder
+from storage.items.row import Row
+
+
+@pytest.fixture
+def row() -> Row:
+    new_row = Row(0, [], Component, ComponentPlaceholder)
+    new_row.fill_columns(3)
+    return new_row
+
+
+@pytest.fixture
+def component() -> Component:
+    return Component('testComponent', 1, 'other', 0)
+
+
+def test_occupancy_is_tracked_on_set_and_pop(row, component):
+    row.set_item(1, component)
+    assert row.get_column_length() == 1 and row.is_column_free(1) is False
+
+    row.pop_item(1)
+    assert row.get_column_length() == 0 and row.is_column_free(1) is True
+
+
+def test_next_free_column_skips_occupied_columns(row, component):
+    row.set_item(0, component)
+    row.set_item(2, component)
+    assert row.get_next_free_column() == 1
+
+
+def test_full_row_has_no_free_column(row, component):
+    for column in range(3):
+        row.set_item(column, component)
+
+    assert row.get_next_free_column() is None and row.has_free_space() is False
+
+
+def test_resize_drops_occupancy_of_overflowing_columns(row, component):
+    row.set_item(2, component)
+    row.resize(2)
+    assert row.has_items() is False
+
+
+def test_empty_slots_share_single_placeholder(row, component):
+    row.set_item(0, component)
+    row.pop_item(0)
+    assert len({id(item) for item in row.items}) == 1
+
+
+def test_slotted_row_accepts_reassigned_fields(row, component):
+    row.set_item(1, component)
+    row.items = [component, row.placeholder, row.placeholder]
+    row._sync_occupancy()
+
+    assert row.get_all_valid_items() == [component] and row.get_next_free_column() == 1
+
+    with pytest.raises(AttributeError):
+        row.unknown = 1
@@ -1,7 +1,7 @@
 import pytest
 
 from storage.const import SearchMode
-from storage.search import SearchQuery, Searcher
+from storage.search import SearchQuery, Searcher, CompiledQuery
 
 
 @pytest.fixture
@@ -43,3 +43,45 @@ def test_search_components_all(container_complete, second_component):
     search_results = searcher.search_through_items([], {"name": "secondComponent"}, [])
 
     assert len(search_results) == 1
+
+
+def test_compiled_query_parses_comparisons_once():
+    query = CompiledQuery.compile(SearchQuery(SearchMode.ANY), [], {}, ['count>=10', 'count=5-20'])
+    comparisons = [(c.key, c.operator, c.bounds) for c in query.comparisons]
+    assert comparisons == [('count', '>=', (10,)), ('count', '-', (5, 20))]
+
+
+def test_search_components_all_with_comparison(container_complete, second_component):
+    container_complete.drawers[0].add_component(**second_component)
+    unsorted_comps = container_complete.get_all_components()
+
+    query = SearchQuery(SearchMode.ALL)
+    searcher = Searcher(query, unsorted_comps)
+
+    search_results = searcher.search_through_items(['other'], {}, ['count>=1'])
+
+    assert len(search_results) == 1
+
+
+@pytest.mark.parametrize('mode, positionals, comparisons', [(SearchMode.ANY, [], ['count<5', 'size>=10']),
+                                                            (SearchMode.ANY, ['other'], ['count=1-3']),
+                                                            (SearchMode.ALL, [], ['count>0', 'size=2-20']),
+                                                            (SearchMode.ALL, ['other'], ['count<=3']),
+                                                            (SearchMode.ANY, ['other'], ['count>=1', 'size<=15']),
+                                                            (SearchMode.ALL, [], ['count<5', 'size>=2'])])
+def test_vectorized_searcher_matches_searcher(container_complete, mode, positionals, comparisons):
+    pytest.importorskip('numpy')
+    from storage.vectorized import VectorizedSearcher, ColumnBlock
+
+    drawer = container_complete.add_drawer('extraDrawer')
+    for n, size in enumerate([2, '15', 2.5]):
+        drawer.add_component(f"extra{n}", 'other', {'size': size}, count=n)
+    container_complete.drawers[0].add_component('big', 'other', {'size': 'big'}, count=3)
+    comps = container_complete.get_all_components()
+
+    query = SearchQuery(mode)
+    compiled_query = CompiledQuery.compile(query, positionals, {}, comparisons)
+    expected = Searcher(query, comps).run_compiled_query(compiled_query)
+    results = VectorizedSearcher(query, [ColumnBlock(comps)]).run_compiled_query(compiled_query)
+
+    assert results == expected
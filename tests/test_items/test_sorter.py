@@ -1,7 +1,7 @@
 import pytest
 
 from storage.search import SearchQuery, Searcher, SearchMode
-from storage.sorter import sort_items
+from storage.sorter import sort_items, stream_top_items, iter_sorted_items
 
 
 @pytest.fixture
@@ -47,3 +47,28 @@ def test_components_can_be_sorted_in_reverse(container_complete, second_componen
     sorted_comps = sort_items(unsorted_comps.copy(), 'name', reverse=True)
 
     assert sorted_comps != unsorted_comps
+
+
+def test_top_items_match_full_sort(container_complete, second_component):
+    container_complete.drawers[0].add_component(**second_component)
+    container_complete.drawers[0].add_component(**{**second_component, 'name': 'thirdComponent', 'count': 7})
+
+    comps = container_complete.get_all_components()
+    fully_sorted = sort_items(comps.copy(), 'count')[:2]
+
+    assert sort_items(comps.copy(), 'count', max_count=2) == fully_sorted
+
+
+def test_top_items_are_streamed_from_generator(container_complete, second_component):
+    container_complete.drawers[0].add_component(**second_component)
+    searcher = Searcher(SearchQuery(SearchMode.ANY), container_complete.get_all_components())
+
+    search_results = searcher.search_through_items(['other'], {}, ["count<1"])
+    results_stream = (result for result in search_results)
+
+    assert stream_top_items(results_stream, 'accuracy', 1) == sort_items(search_results, 'accuracy')[:1]
+
+
+def test_unsorted_items_are_yielded_lazily():
+    endless_results = iter(int, 1)
+    assert list(iter_sorted_items(endless_results, 'none', max_count=3)) == [0, 0, 0]
@@ -0,0 +1,120 @@
+import socket
+import threading
+
+import pytest
+
+from storage.client import send_lines, get_lines_to_send
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="Unix sockets are not available")
+
+
+@pytest.fixture
+def server(tmp_path):
+    from storage.server import StorageServer
+
+    received: list[list[str]] = []
+
+    def run_lines(lines: list[str]) -> int:
+        received.append(lines)
+        print(f"ran {len(lines)} commands")
+        return 0 if lines[0] != 'fail' else 1
+
+    server = StorageServer(run_lines, tmp_path.joinpath('storage.sock'))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    yield server, received
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_commands_are_run_by_the_daemon(server):
+    server, received = server
+    response = send_lines(['get container a', 'get container b'], server.socket_path, timeout=5)
+
+    assert received == [['get container a', 'get container b']]
+    assert response == {'stdout': "ran 2 commands\n", 'stderr': "", 'code': 0}
+
+
+def test_failed_command_sets_exit_code(server):
+    server, _ = server
+    assert send_lines(['fail'], server.socket_path, timeout=5)['code'] == 1
+
+
+def test_no_response_without_daemon(tmp_path):
+    assert send_lines(['get container a'], tmp_path.joinpath('storage.sock')) is None
+
+
+def test_socket_is_removed_on_close(server):
+    server, _ = server
+    server.server_close()
+
+    assert server.socket_path.exists() is False
+
+
+def test_no_response_from_stale_socket(tmp_path):
+    socket_path = tmp_path.joinpath('storage.sock')
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(socket_path))
+
+    assert send_lines(['get container a'], socket_path) is None
+
+
+def test_hanging_daemon_is_reported(tmp_path):
+    socket_path = tmp_path.joinpath('storage.sock')
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(socket_path))
+        listener.listen()
+
+        response = send_lines(['get container a'], socket_path, timeout=0.1)
+
+    assert response['code'] == 1 and 'did not answer within 0.1s' in response['stderr']
+
+
+def test_daemon_closing_connection_is_reported(tmp_path):
+    socket_path = tmp_path.joinpath('storage.sock')
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(socket_path))
+        listener.listen()
+        thread = threading.Thread(target=lambda: listener.accept()[0].close())
+        thread.start()
+
+        response = send_lines(['get container a'], socket_path, timeout=5)
+        thread.join()
+
+    assert response['code'] == 1 and 'closed the connection' in response['stderr']
+
+
+def test_import_paths_are_made_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    batch_path = tmp_path.joinpath('batch.txt')
+    batch_path.write_text('storage import component --format csv rows.csv\n'
+                          'get container a\n')
+
+    assert get_lines_to_send(['import', 'component', 'rows.csv']) == \
+        [f"import component {tmp_path.joinpath('rows.csv')}"]
+    assert get_lines_to_send(['batch', str(batch_path)]) == \
+        [f"storage import component --format csv {tmp_path.joinpath('rows.csv')}\n", 'get container a\n']
+
+
+def test_command_sent_to_hanging_daemon_is_not_run_locally(tmp_path, monkeypatch, capsys):
+    import storage.__main__
+    import storage.client
+
+    socket_path = tmp_path.joinpath('storage.sock')
+    monkeypatch.setattr(storage.client, 'SOCKET_PATH', socket_path)
+    monkeypatch.setattr(storage.client, 'DAEMON_TIMEOUT', 0.1)
+    monkeypatch.setattr(storage.__main__, 'main', lambda args: pytest.fail("command was run locally"))
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(socket_path))
+        listener.listen()
+
+        assert storage.client.main(['create', 'container', 'box', '1', '1']) == 1
+
+    assert 'did not answer' in capsys.readouterr().err
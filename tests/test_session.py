@@ -1,6 +1,7 @@
 import pytest
 
-from storage.cli.exceptions import ContainerNotFoundError, ItemNotFoundError
+from storage.cli.exceptions import ContainerNotFoundError, ItemNotFoundError, SearchEngineNotAvailableError, \
+    ContainerVersionConflictError
 
 
 def test_create_new_container(session, container_dict):
@@ -27,3 +28,296 @@ def test_raises_drawer_not_found_exception(session, container):
     with pytest.raises(ItemNotFoundError):
         session.containers.append(container)
         session.get_drawer_by_name('InvalidName', container.name)
+
+
+def test_mutation_writes_only_the_changed_container(session, container_dict, drawer_dict, monkeypatch):
+    session.create_container(**container_dict)
+    session.create_container(**{**container_dict, 'name': 'otherContainer'})
+
+    saved: list[str] = []
+    monkeypatch.setattr(session.data_manager, 'save_data_to_file', lambda container: saved.append(container.name))
+    session.create_drawer(**drawer_dict)
+
+    assert saved == [container_dict['name']]
+
+
+def test_mutation_keeps_in_memory_objects(session, container_dict, drawer_dict):
+    container = session.create_container(**container_dict)
+    session.create_drawer(**drawer_dict)
+
+    assert session.get_container_by_name(container_dict['name']) is container
+    assert session.is_container_dirty(container) is False
+
+
+def test_lookup_follows_replaced_containers_list(session, container_dict, container):
+    session.create_container(**container_dict)
+    session.containers = [container]
+
+    assert session.get_container_by_name(container.name) is container
+
+
+def test_lookup_skips_container_removed_from_list(session, container_dict):
+    session.autosave = False
+    container = session.create_container(**container_dict)
+    session.containers.remove(container)
+
+    with pytest.raises(ContainerNotFoundError):
+        session.get_container_by_name(container_dict['name'])
+
+
+def test_find_component_uses_up_to_date_index(session, container_dict, drawer_dict, component_dict, capsys):
+    session.create_container(**container_dict)
+    session.create_drawer(**drawer_dict)
+    session.find_component(tags_positional=[], tags={'name': component_dict['name']}, tags_comparison=[],
+                           mode='any', sort='accuracy')
+    session.create_component(**component_dict, drawer=drawer_dict['name'], container=container_dict['name'])
+    capsys.readouterr()
+
+    session.find_component(tags_positional=[], tags={'name': component_dict['name']}, tags_comparison=[],
+                           mode='any', sort='accuracy')
+
+    assert component_dict['name'] in capsys.readouterr().out
+
+
+def test_item_is_resolved_by_path(session, container_dict, drawer_dict, component_dict):
+    session.create_container(**container_dict)
+    session.create_drawer(**drawer_dict)
+    component = session.create_component(**component_dict, drawer=drawer_dict['name'],
+                                         container=container_dict['name'])
+
+    path = f"{container_dict['name']}/{drawer_dict['name']}/{component_dict['name']}"
+
+    assert session.get_item_by_path(path) is component
+
+
+def test_renamed_drawer_is_found_by_new_name(session, container_dict, drawer_dict):
+    session.create_container(**container_dict)
+    drawer = session.create_drawer(**drawer_dict)
+    session.update_drawer(name=drawer_dict['name'], container=container_dict['name'], values={'name': 'renamed'})
+
+    assert session.get_drawer_by_name('renamed', container_dict['name']) is drawer
+
+
+def test_container_is_loaded_on_first_access(session, container_complete):
+    session.data_manager.save_data_to_file(container_complete)
+
+    session.load_container_manifest()
+    assert session.is_container_loaded(container_complete.name) is False
+
+    container = session.get_container_by_name(container_complete.name)
+    assert session.is_container_loaded(container_complete.name) is True
+    assert container.to_json() == container_complete.to_json()
+
+
+def test_numpy_engine_requires_numpy(session, container_dict, monkeypatch):
+    monkeypatch.setattr('storage.vectorized.np', None)
+    session.create_container(**container_dict)
+
+    with pytest.raises(SearchEngineNotAvailableError):
+        session.find_component(tags_positional=['other'], tags_comparison=[], tags={}, mode='any', engine='numpy')
+
+
+def test_operation_log_is_replayed_and_compacted(make_session, container_dict, drawer_dict, component_dict):
+    session = make_session(use_operation_log=True)
+
+    session.create_container(**container_dict)
+    session.create_drawer(**drawer_dict)
+    session.create_component(**component_dict, container=container_dict['name'], drawer=drawer_dict['name'])
+    session.update_component(name=component_dict['name'], drawer=drawer_dict['name'],
+                             container=container_dict['name'], values={'count': 7})
+
+    assert session.data_manager.container_exists(container_dict['name']) is False
+
+    replayed_session = make_session(use_operation_log=True)
+    replayed_session.load_container_manifest()
+
+    assert replayed_session.replay_operation_log() == 4
+    component = replayed_session.get_item_by_path(f"{container_dict['name']}/{drawer_dict['name']}/"
+                                                  f"{component_dict['name']}")
+    assert component.count == 7
+
+    replayed_session.compact_operation_log()
+
+    assert len(replayed_session.operation_log) == 0
+    assert replayed_session.data_manager.container_exists(container_dict['name']) is True
+
+
+def test_compaction_keeps_operations_logged_by_others(make_session, container_dict, drawer_dict):
+    session = make_session(use_operation_log=True)
+    session.replay_operation_log()
+    session.create_container(**container_dict)
+
+    other_session = make_session(use_operation_log=True)
+    other_session.load_container_manifest()
+    other_session.replay_operation_log()
+    other_session.create_drawer(**drawer_dict)
+
+    session.compact_operation_log()
+
+    assert len(session.operation_log) == 0
+    assert len(session.data_manager.load_container_data(container_dict['name'])['drawers']) == 1
+
+
+def test_transaction_writes_each_touched_container_once(session, container_dict, drawer_dict, component_dict,
+                                                        monkeypatch):
+    session.create_container(**container_dict)
+
+    saved: list[str] = []
+    save_data_to_file = session.data_manager.save_data_to_file
+    monkeypatch.setattr(session.data_manager, 'save_data_to_file',
+                        lambda container: saved.append(container.name) or save_data_to_file(container))
+
+    with session.transaction():
+        session.create_drawer(**drawer_dict)
+
+        for i in range(3):
+            session.create_component(**{**component_dict, 'name': f'component{i}'},
+                                     container=container_dict['name'], drawer=drawer_dict['name'])
+
+        assert saved == []
+
+    assert saved == [container_dict['name']]
+    assert len(session.data_manager.load_container_data(container_dict['name'])['drawers'][0]['components']) == 3
+
+
+def test_failed_transaction_is_rolled_back(session, container_dict, drawer_dict):
+    session.create_container(**container_dict)
+    saved_data = session.data_manager.load_container_data(container_dict['name'])
+
+    with pytest.raises(ContainerNotFoundError):
+        with session.transaction():
+            session.create_drawer(**drawer_dict)
+            session.create_container(**{**container_dict, 'name': 'otherContainer'})
+            session.delete_container('missingContainer')
+
+    assert session.get_container_by_name(container_dict['name']).drawers == []
+    assert session.data_manager.load_container_data(container_dict['name']) == saved_data
+
+    with pytest.raises(ContainerNotFoundError):
+        session.get_container_by_name('otherContainer')
+
+    # session keeps working after a rollback
+    session.create_drawer(**drawer_dict)
+    assert len(session.data_manager.load_container_data(container_dict['name'])['drawers']) == 1
+
+
+def test_failed_transaction_discards_logged_operations(make_session, container_dict, drawer_dict):
+    session = make_session(use_operation_log=True)
+    session.create_container(**container_dict)
+
+    with pytest.raises(ContainerNotFoundError):
+        with session.transaction():
+            session.create_drawer(**drawer_dict)
+            session.delete_container('missingContainer')
+
+    assert len(session.operation_log) == 1
+    assert session.get_container_by_name(container_dict['name']).drawers == []
+
+
+def test_update_container_prints_nothing(session, container_dict, capsys):
+    session.create_container(**container_dict)
+    capsys.readouterr()
+
+    session.update_container(name=container_dict['name'], values={'total_rows': 4})
+
+    assert capsys.readouterr().out == ''
+
+
+def test_updated_slotted_items_are_saved_and_reloaded(session, make_session, container_dict, drawer_dict,
+                                                      component_dict):
+    session.create_container(**container_dict)
+    session.create_drawer(**drawer_dict)
+    session.create_component(**component_dict, container=container_dict['name'], drawer=drawer_dict['name'])
+    session.update_drawer(name=drawer_dict['name'], container=container_dict['name'],
+                          values={'name': 'renamed drawer'})
+    session.update_component(name=component_dict['name'], drawer='renamed drawer', container=container_dict['name'],
+                             values={'name': 'renamed component', 'count': 7})
+
+    reloaded_session = make_session()
+    reloaded_session.load_container_manifest()
+
+    drawer = reloaded_session.get_item_by_path(f"{container_dict['name']}/renamed drawer")
+    component = drawer.get_component_by_name('renamed component')
+
+    assert drawer.location == (drawer_dict['row'], drawer_dict['column'])
+    assert component.count == 7 and component.parent_drawer is drawer
+
+
+def test_numpy_engine_follows_changed_containers(session, container_dict, drawer_dict, component_dict):
+    pytest.importorskip('numpy')
+    session.create_container(**container_dict)
+    session.create_drawer(**drawer_dict)
+    session.create_component(**component_dict, container=container_dict['name'], drawer=drawer_dict['name'])
+    query = {'tags_positional': [], 'tags_comparison': ['count>=1'], 'tags': {}, 'mode': 'all'}
+
+    assert len(session.search_items('component', **query, engine='numpy')) == 1
+
+    session.create_component(**{**component_dict, 'name': 'second', 'count': 5}, container=container_dict['name'],
+                             drawer=drawer_dict['name'])
+
+    expected = session.search_items('component', **query)
+    assert session.search_items('component', **query, engine='numpy') == expected
+    assert len(expected) == 2
+
+
+def test_container_scoped_find_loads_only_that_container(session, container_complete, component_dict):
+    session.data_manager.save_data_to_file(container_complete)
+    session.create_container(name='otherContainer', rows=1, columns=1)
+    session.load_container_manifest()
+
+    query = {'tags_positional': ['other'], 'tags_comparison': [], 'tags': {}, 'mode': 'any'}
+    results = session.search_items('component', **query, container=container_complete.name)
+
+    assert [result.item_ref.name for result in results] == [component_dict['name']]
+    assert session.is_container_loaded('otherContainer') is False
+
+
+def test_single_query_session_scans_items_without_tag_index(session, container_dict, drawer_dict, component_dict):
+    session.use_tag_index = False
+    session.create_container(**container_dict)
+    session.create_drawer(**drawer_dict)
+    session.create_component(**component_dict, container=container_dict['name'], drawer=drawer_dict['name'])
+
+    query = {'tags_positional': ['other'], 'tags_comparison': [], 'tags': {}, 'mode': 'any'}
+
+    assert len(session.search_items('component', **query)) == 1
+    assert len(session.tag_index.get_index('component')) == 0
+
+
+@pytest.mark.parametrize('use_tag_index', [True, False])
+def test_find_keeps_container_order_after_change(session, component_dict, use_tag_index):
+    session.use_tag_index = use_tag_index
+    query = {'tags_positional': ['other'], 'tags_comparison': [], 'tags': {}, 'mode': 'any'}
+
+    for name in ('first', 'second'):
+        session.create_container(name=name, rows=1, columns=2)
+        session.create_drawer(name='drawer', container=name, row=0, column=0)
+        session.create_component(**component_dict, container=name, drawer='drawer')
+
+    session.search_items('component', **query)
+    session.create_component(**{**component_dict, 'name': 'added'}, container='first', drawer='drawer')
+
+    results = session.search_items('component', **query)
+
+    assert [result.item_ref.get_location_readable_format() for result in results] == \
+        [comp.get_location_readable_format() for container in session.containers
+         for comp in container.get_all_components()]
+    assert len(session.tag_index.get_index('component')) == (3 if use_tag_index else 0)
+
+
+def test_conflict_after_delete_rolls_back_cleanly(session, make_session, container_dict):
+    session.create_container(**container_dict)
+    session.create_container(**{**container_dict, 'name': 'otherContainer'})
+
+    other_session = make_session()
+    other_session.load_container_manifest()
+    other_session.update_container(name='otherContainer', values={'total_rows': 4})
+
+    with pytest.raises(ContainerVersionConflictError):
+        with session.transaction():
+            session.delete_container(container_dict['name'])
+            session.update_container(name='otherContainer', values={'total_rows': 2})
+
+    assert session.get_container_by_name(container_dict['name']).name == container_dict['name']
+    assert session.data_manager.container_exists(container_dict['name']) is True
+    assert container_dict['name'] in session.data_manager.manifest.entries
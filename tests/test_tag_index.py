@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from storage.const import SearchMode
+from storage.search import SearchQuery, CompiledQuery, Searcher
+from storage.items.container import Container
+from storage.tag_index import TagIndex, InventoryIndex, NumericTagIndex
+
+
+@pytest.fixture
+def second_component() -> dict:
+    return {'name': 'secondComponent', 'count': 0, 'type': 'other', 'tags': {'color': 'red'}}
+
+
+def compile_query(mode: SearchMode, tags_positionals: list[str], tags_keywords: dict,
+                  tags_comparison: list[str]) -> CompiledQuery:
+    return CompiledQuery.compile(SearchQuery(mode), tags_positionals, tags_keywords, tags_comparison)
+
+
+@pytest.fixture
+def component_index(container_complete, second_component) -> TagIndex:
+    container_complete.drawers[0].add_component(**second_component)
+    index = TagIndex()
+
+    for comp in container_complete.get_all_components():
+        index.add_item(comp, owner=container_complete)
+
+    return index
+
+
+def test_positional_tag_matches_keys_and_values(component_index):
+    assert len(component_index.get_candidates(compile_query(SearchMode.ANY, ['color', 'red'], {}, []))) == 1
+
+
+def test_any_mode_unions_posting_lists(component_index):
+    query = compile_query(SearchMode.ANY, ['red'], {'name': 'testComponent'}, [])
+    candidates = component_index.get_candidates(query)
+    assert len(candidates) == 2
+
+
+def test_all_mode_intersects_posting_lists(component_index):
+    candidates = component_index.get_candidates(compile_query(SearchMode.ALL, ['other'], {'count': '0'}, []))
+    assert [comp.name for comp in candidates] == ['secondComponent']
+
+
+def test_removed_item_is_not_returned(component_index, container_complete):
+    component_index.remove_item(container_complete.get_all_components()[0])
+    assert len(component_index.get_candidates(compile_query(SearchMode.ANY, ['other'], {}, []))) == 1
+
+
+def test_changed_container_is_reindexed(container_complete, second_component):
+    index = InventoryIndex()
+    index.refresh([container_complete])
+
+    container_complete.drawers[0].add_component(**second_component)
+    index.invalidate(container_complete)
+    index.refresh([container_complete])
+
+    assert len(index.get_index('component').get_candidates(compile_query(SearchMode.ANY, ['red'], {}, []))) == 1
+
+
+@pytest.mark.parametrize('tag, expected', [('count<1', 1), ('count<=1', 2), ('count>0', 1), ('count>=0', 2),
+                                           ('count=1-5', 1), ('count=2-5', 0)])
+def test_comparison_uses_numeric_index(component_index, tag, expected):
+    assert len(component_index.get_candidates(compile_query(SearchMode.ANY, [], {}, [tag]))) == expected
+
+
+def test_numeric_index_answers_range_in_order():
+    index = NumericTagIndex()
+    for item_id, value in enumerate([50, 5, 20, 10, 100]):
+        index.add(item_id, value)
+
+    assert index.get_matching('-', 10, 50) == [3, 2, 0]
+
+
+def test_reindexed_container_keeps_its_place(container_complete, second_component):
+    other_container = Container(name='otherContainer', total_rows=1, max_drawers_per_row=1, compartments_per_drawer=3)
+    other_container.add_drawer('otherDrawer').add_component(**second_component)
+    index = InventoryIndex()
+    index.refresh([container_complete, other_container])
+
+    container_complete.drawers[0].add_component(**second_component)
+    index.invalidate(container_complete)
+    index.refresh([container_complete, other_container])
+
+    candidates = index.get_index('component').get_candidates(compile_query(SearchMode.ANY, ['other'], {}, []))
+    assert [comp.parent_drawer.parent_container for comp in candidates] == [container_complete, container_complete,
+                                                                            other_container]
+
+
+def test_index_candidates_match_scan_on_random_tags():
+    rng = random.Random(0)
+    words = ['other', 'red', 'blue', 'smd', '5', '10']
+    container = Container(name='randomContainer', total_rows=4, max_drawers_per_row=4, compartments_per_drawer=4)
+
+    for drawer_n in range(16):
+        drawer = container.add_drawer(f"drawer{drawer_n}")
+
+        for component_n in range(4):
+            tags = {rng.choice(words): rng.choice(words + [rng.randint(0, 20), 2.5]) for _ in range(rng.randint(0, 4))}
+            drawer.add_component(f"component{component_n}", rng.choice(words), tags, count=rng.randint(0, 20))
+
+    index = InventoryIndex()
+    index.refresh([container])
+    components = container.get_all_components()
+
+    for _ in range(200):
+        query = compile_query(rng.choice([SearchMode.ANY, SearchMode.ALL]),
+                              rng.sample(words, rng.randint(0, 2)),
+                              {rng.choice(words): rng.choice(words)} if rng.random() < 0.3 else {},
+                              [f"count{rng.choice(['<', '<=', '>', '>='])}{rng.randint(0, 20)}"]
+                              if rng.random() < 0.5 else [])
+
+        candidates = index.get_index('component').get_candidates(query)
+        scanned = Searcher(query.query, components).run_compiled_query(query)
+        indexed = Searcher(query.query, candidates).run_compiled_query(query)
+
+        assert indexed == scanned
@@ -0,0 +1,27 @@
+import pytest
+
+from storage.session import Session
+from storage.validator import Prompter
+from storage.cli.exceptions import ResizeNotConfirmedError
+
+
+def test_prompt_is_rejected_without_console(monkeypatch):
+    monkeypatch.setattr(Prompter, 'interactive', False)
+    monkeypatch.setattr('builtins.input', lambda *args: pytest.fail("prompt must not read stdin"))
+
+    with pytest.raises(ResizeNotConfirmedError):
+        Prompter(2, 1, 'rows').get_user_input()
+
+
+def test_prompt_is_confirmed_while_replaying(session, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda *args: pytest.fail("prompt must not read stdin"))
+    answers = []
+
+    session.operation_log.append('create_container', '{"name": "replayed", "rows": 2, "columns": 2}')
+    monkeypatch.setattr(Session, 'create_container',
+                        lambda self, **kwargs: answers.append(Prompter(1).get_user_input()))
+
+    session.replay_operation_log()
+
+    assert answers == [True]
+    assert Prompter.assume_yes is False